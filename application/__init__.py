@@ -1,13 +1,23 @@
+import os
+import time
+
 from flask import Flask
 
 
 def create_app(test_config=None):
     """Construct the core app object"""
+    start = time.perf_counter()
+    startup = {}
+
+    def mark(phase):
+        """Account the time elapsed since the previous mark in the given startup phase"""
+        startup[phase] = time.perf_counter() - start - sum(startup.values())
+
     app = Flask(__name__, instance_relative_config=False)
 
     # Config
+    app.config.from_object('config.Config')
     if test_config is None:
-        app.config.from_object('config.Config')
         from flask_cors import CORS
         CORS(app, resources={r'/*': {'origins': '*'}}, support_credentials=True)
     else:
@@ -16,16 +26,68 @@ def create_app(test_config=None):
     from config import Config
     app.logger.info('>>> {}'.format(Config.FLASK_ENV))
 
-    # Config flasgger
-    from flasgger import Swagger
-    app.config['SWAGGER'] = {
-        'title': 'GetGreeks API',
-        'hide_top_bar': True,
-        'version': '0.2.0',
-        'doc_expansion': "list",
-        'uiversion': 3
-    }
-    Swagger(app)
+    # Metrics of the routes
+    from .metrics import Metrics
+    metrics = Metrics()
+    metrics.init_app(app)
+    mark('config')
+
+    # Config flasgger, the UI can be disabled in production
+    if app.config['SWAGGER_UI']:
+        from flasgger import Swagger
+        app.config['SWAGGER'] = {
+            'title': 'GetGreeks API',
+            'hide_top_bar': True,
+            'version': '0.2.0',
+            'doc_expansion': "list",
+            'uiversion': 3
+        }
+        Swagger(app)
+
+    # Prebuilt OpenAPI spec
+    apispec_path = app.config['APISPEC_PATH']
+    if apispec_path:
+        if os.path.exists(apispec_path):
+            from . import apispec
+            apispec.serve(app, apispec_path)
+        else:
+            app.logger.warning('OpenAPI spec {} not found, build it with python -m application.apispec'
+                               .format(apispec_path))
+    mark('swagger')
+
+    # Result cache of the calc routes
+    if app.config['CALC_CACHE_SIZE'] > 0:
+        from .calc.cache import ResultCache
+        app.extensions['calc_cache'] = ResultCache(app.config['CALC_CACHE_SIZE'], app.config['CALC_CACHE_TTL'],
+                                                   app.config['CALC_CACHE_PRECISION'])
+
+    # Interpolated greek tables
+    if app.config['CALC_TABLES']:
+        from .calc.tables import GreekTables
+        path = app.config['CALC_TABLES_PATH']
+        app.extensions['calc_tables'] = GreekTables.from_file(path) if path else GreekTables.build()
+
+    # Coalescing of concurrent option requests
+    if app.config['CALC_COALESCE_WINDOW'] > 0:
+        from .calc.coalescer import Coalescer
+        from .calc.pricing import price_options
+        tables = app.extensions.get('calc_tables')
+        app.extensions['calc_coalescer'] = Coalescer(price_options if tables is None else tables.price_options,
+                                                     app.config['CALC_COALESCE_WINDOW'],
+                                                     app.config['CALC_COALESCE_MAX_BATCH'])
+
+    # Books of positions repriced on spot ticks
+    from .calc.books import BookStore
+    app.extensions['calc_books'] = BookStore(app.config['CALC_BOOKS_PATH'], app.config['CALC_BOOKS_MAX'],
+                                             app.config['CALC_BOOKS_TTL'])
+
+    # Spot feed pushing book values to event stream subscribers
+    if app.config['CALC_FEED']:
+        from threading import BoundedSemaphore
+        from .calc.feeds import SpotBoard, load_feed
+        app.extensions['calc_feed'] = load_feed(app.config['CALC_FEED'], SpotBoard(), app.config)
+        app.extensions['calc_streams'] = BoundedSemaphore(app.config['CALC_EVENTS_MAX_STREAMS'])
+    mark('extensions')
 
     with app.app_context():
         # Include Routes
@@ -33,5 +95,18 @@ def create_app(test_config=None):
         from .calc import calc_views
         app.register_blueprint(main_views.main_bp)
         app.register_blueprint(calc_views.calc_bp)
+    mark('routes')
+
+    # Load scipy now, unless the fast start defers it to the first array request
+    if not app.config['FAST_START']:
+        from .calc import special
+        special.load()
+    mark('warmup')
+
+    startup['total'] = time.perf_counter() - start
+    metrics.startup = startup
+    app.logger.info('>>> started in {:.3f}s ({})'.format(
+        startup['total'], ', '.join('{} {:.3f}s'.format(phase, duration) for phase, duration in startup.items()
+                                    if phase != 'total')))
 
     return app
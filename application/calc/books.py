@@ -0,0 +1,244 @@
+"""Books of positions registered once and repriced on spot ticks.
+
+Between two ticks only the spots move. A book keeps, for every position, the
+terms of the model which do not depend on the spot:
+
+    d1 = log(S) / (drift sqrt(T)) + (r - q + drift^2 / 2) T / (drift sqrt(T)) - log(K) / (drift sqrt(T))
+
+so d1 is one multiply-add of log(S) per position, and the discounts, sqrt(T)
+and K exp(-rT) are reused as they are. Spots are given by underlying, the log
+is taken once per underlying and gathered to the positions. Only the held side
+of each position is valued: with w = 1 for a call and -1 for a put, its terms
+are N(w d1) and N(w d2), half the normal CDFs of pricing both sides.
+
+Books are saved as .npy files in a directory and memory-mapped, so every
+worker process of the server can answer for a book whichever worker
+registered it. A store holds a bounded number of books and removes the ones
+left unused.
+"""
+import json
+import os
+import re
+import time
+import uuid
+from threading import Lock
+
+import numpy as np
+
+from . import special
+
+# Rows of the array of a book
+FIELDS = ('inv_vol_t', 'offset', 'vol_t', 'disc_q', 'strike_r', 'rate_strike_r', 'dividend_disc_q', 'theta_factor',
+          'vega_factor', 'rho_factor', 'side', 'quantity', 'underlying')
+
+BOOK_ID = re.compile('[0-9a-f]{32}')
+
+# Default maximum of books of a store and seconds a book is kept without being used
+MAX_BOOKS = 1000
+TTL = 86400
+
+# Seconds between two scans of a store for expired books, and between two records of the use of a book
+SWEEP_INTERVAL = 60
+TOUCH_INTERVAL = 10
+
+
+class Book:
+    """Invariants of the positions of a book, one row of `values` per name of FIELDS"""
+
+    def __init__(self, values, underlyings):
+        self.values = values
+        self.underlyings = underlyings
+        self._rows = dict(zip(FIELDS, values))
+        self._index = values[FIELDS.index('underlying')].astype(np.intp)
+
+    @classmethod
+    def build(cls, strike, rate, drift, time_exp, dividend, is_call, quantity, underlying):
+        """Precompute the invariants of positions, underlying holds the name of the underlying of each one"""
+        strike, rate, drift, time_exp, dividend, is_call, quantity = np.broadcast_arrays(
+            strike, rate, drift, time_exp, dividend, is_call, quantity)
+        underlyings, index = np.unique(np.asarray(underlying).astype(str), return_inverse=True)
+
+        sqrt_t = np.sqrt(time_exp)
+        vol_t = drift * sqrt_t
+        inv_vol_t = 1 / vol_t
+        offset = ((rate - dividend + 0.5 * drift * drift) * time_exp - np.log(strike)) * inv_vol_t
+        disc_q = np.exp(-dividend * time_exp)
+        strike_r = strike * np.exp(-rate * time_exp)
+        values = np.stack([inv_vol_t, offset, vol_t, disc_q, strike_r, rate * strike_r, dividend * disc_q,
+                           -disc_q * drift / (2 * sqrt_t), disc_q * sqrt_t, strike_r * time_exp,
+                           np.where(is_call, 1.0, -1.0), quantity, np.broadcast_to(index, time_exp.shape)])
+        return cls(values, underlyings.tolist())
+
+    @property
+    def size(self):
+        return self.values.shape[1]
+
+    def reprice(self, spots, greeks):
+        """Values of the held side of every position and the net values of the book.
+
+        :param spots: spot of every underlying, in the order of `underlyings`
+        :return: (dict greek -> values of the positions, dict greek -> net value)
+        """
+        rows = self._rows
+        side = rows['side']
+        spots = np.asarray(spots, dtype=float)
+        spot = spots[self._index]
+        d_1 = np.log(spots)[self._index] * rows['inv_vol_t'] + rows['offset']
+        greeks = set(greeks)
+
+        # N(w d1), N(w d2) and N'(d1) of the held side
+        n_1 = n_2 = np_1 = None
+        if greeks & {'price', 'delta', 'theta'}:
+            n_1 = special.cdf(side * d_1)
+        if greeks & {'price', 'theta', 'rho'}:
+            n_2 = special.cdf(side * (d_1 - rows['vol_t']))
+        if greeks & {'theta', 'gamma', 'vega'}:
+            np_1 = special.pdf(d_1)
+
+        values = {}
+        if 'price' in greeks:
+            values['price'] = side * (spot * rows['disc_q'] * n_1 - rows['strike_r'] * n_2)
+        if 'delta' in greeks:
+            values['delta'] = side * rows['disc_q'] * n_1
+        if 'theta' in greeks:
+            values['theta'] = spot * (rows['theta_factor'] * np_1 + side * rows['dividend_disc_q'] * n_1) \
+                - side * rows['rate_strike_r'] * n_2
+        if 'gamma' in greeks:
+            values['gamma'] = rows['disc_q'] * np_1 / (spot * rows['vol_t'])
+        if 'vega' in greeks:
+            values['vega'] = spot * rows['vega_factor'] * np_1
+        if 'rho' in greeks:
+            values['rho'] = side * rows['rho_factor'] * n_2
+
+        net = {greek: float(np.dot(rows['quantity'], column)) for greek, column in values.items()}
+        return values, net
+
+
+class StoreFull(Exception):
+    """Raised when registering a book in a store holding its maximum of books"""
+
+
+class BookStore:
+    """Books saved in a directory, mapped on first use by each process.
+
+    Without a directory the books only live in the memory of the process. The
+    store holds at most max_books books, and a book unused for ttl seconds is
+    removed. The last use of a saved book is the modification time of its file,
+    so every process sees it, and the books mapped by a process are forgotten
+    once their files are gone.
+    """
+
+    def __init__(self, path='', max_books=MAX_BOOKS, ttl=TTL):
+        self.path = path
+        self.max_books = max_books
+        self.ttl = ttl
+        self._books = {}
+        self._used = {}
+        self._swept = 0.0
+        self._lock = Lock()
+        if path:
+            os.makedirs(path, exist_ok=True)
+
+    def add(self, book):
+        """Register a book, return its id, raise StoreFull when the store holds max_books books"""
+        self.sweep(force=True)
+        if len(self._ids()) >= self.max_books:
+            raise StoreFull('the store holds its maximum of {} books'.format(self.max_books))
+
+        book_id = uuid.uuid4().hex
+        if self.path:
+            temporary = self._file(book_id, '.tmp.npy')
+            np.save(temporary, book.values)
+            with open(self._file(book_id, '.json'), 'w') as description:
+                json.dump({'underlyings': book.underlyings}, description)
+            os.replace(temporary, self._file(book_id, '.npy'))
+        with self._lock:
+            self._books[book_id] = book
+            if not self.path:
+                self._used[book_id] = time.time()
+        return book_id
+
+    def get(self, book_id):
+        """Book of an id, None when it does not exist or expired"""
+        if not BOOK_ID.fullmatch(book_id):
+            return None
+        self.sweep()
+        used = self._last_use(book_id)
+        if used is None or time.time() - used > self.ttl:
+            self._remove(book_id)
+            return None
+        self._touch(book_id, used)
+
+        book = self._books.get(book_id)
+        if book is None and self.path:
+            with open(self._file(book_id, '.json')) as description:
+                underlyings = json.load(description)['underlyings']
+            book = Book(np.load(self._file(book_id, '.npy'), mmap_mode='r'), underlyings)
+            with self._lock:
+                self._books[book_id] = book
+        return book
+
+    def delete(self, book_id):
+        """Remove a book, return whether it existed"""
+        if self.get(book_id) is None:
+            return False
+        self._remove(book_id)
+        return True
+
+    def sweep(self, force=False):
+        """Remove the expired books, at most once per SWEEP_INTERVAL seconds unless forced"""
+        now = time.time()
+        if not force and now - self._swept < SWEEP_INTERVAL:
+            return
+        self._swept = now
+        ids = set(self._ids())
+        for book_id in ids:
+            used = self._last_use(book_id)
+            if used is not None and now - used > self.ttl:
+                self._remove(book_id)
+        # Books removed by another process
+        for book_id in set(self._books) - ids:
+            self._remove(book_id)
+
+    def _ids(self):
+        """Ids of the registered books"""
+        if not self.path:
+            return list(self._used)
+        return [name[:-4] for name in os.listdir(self.path) if name.endswith('.npy') and BOOK_ID.fullmatch(name[:-4])]
+
+    def _last_use(self, book_id):
+        """Time of the last use of a book, None when it does not exist"""
+        if not self.path:
+            return self._used.get(book_id)
+        try:
+            return os.stat(self._file(book_id, '.npy')).st_mtime
+        except FileNotFoundError:
+            return None
+
+    def _touch(self, book_id, used):
+        """Record a use of a book, at most once per TOUCH_INTERVAL seconds"""
+        now = time.time()
+        if now - used < TOUCH_INTERVAL:
+            return
+        if self.path:
+            try:
+                os.utime(self._file(book_id, '.npy'))
+            except FileNotFoundError:
+                pass
+        else:
+            self._used[book_id] = now
+
+    def _remove(self, book_id):
+        """Forget a book in this process and remove its files"""
+        with self._lock:
+            self._books.pop(book_id, None)
+            self._used.pop(book_id, None)
+        if self.path:
+            for extension in ('.npy', '.json'):
+                try:
+                    os.remove(self._file(book_id, extension))
+                except FileNotFoundError:
+                    pass
+
+    def _file(self, book_id, extension):
+        return os.path.join(self.path, book_id + extension)
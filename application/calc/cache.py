@@ -0,0 +1,69 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+
+
+class ResultCache:
+    """Bounded LRU cache of route results whose entries expire after `ttl` seconds.
+
+    Keys are built with `key`, which rounds every number to `precision` decimals so
+    that requests differing only by float noise share the same entry.
+    """
+
+    def __init__(self, maxsize=4096, ttl=5.0, precision=8, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.precision = precision
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def key(self, *parts):
+        """Canonical key of the given route name, strings and numbers"""
+        return tuple(part if isinstance(part, str) else round(float(part), self.precision) + 0.0 for part in parts)
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value of key, computing and storing it on a miss"""
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+
+        value = compute()
+
+        with self._lock:
+            self._entries[key] = (now + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        """Drop every entry, counters are kept"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Counters and settings of the cache"""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
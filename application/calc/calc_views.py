@@ -1,6 +1,22 @@
-from flask import Blueprint, jsonify, make_response, request
-from math import log, sqrt, exp
-from scipy import stats
+import numpy as np
+from flask import Blueprint, Response, current_app, jsonify, make_response, request, stream_with_context
+
+from ..metrics import add_points
+from . import pde
+from .books import Book, StoreFull
+from .feeds import RETRY_MS, book_events
+from .formats import precision, respond, rounded
+from .implied_vol import implied_volatility
+from .lattice import price_american
+from .montecarlo import price_path_dependent
+from .parallel import get_pool, price_parallel
+from .portfolio import aggregate, bucket, labels, position_values
+from .scenarios import full_revaluation, taylor_revaluation
+from .pricing import ALL_GREEKS, GREEKS, TIME_UNITS, carry, price_options, year_fraction
+from .streaming import FORMATS, read_positions, stream_values
+from .validation import (BATCH, BOOK_POSITION, CONTRACT, CURVE, GREEK_CURVE, IMPLIED_VOL, MAX_LATTICE_NODES,
+                         MONTE_CARLO, OPTION, PORTFOLIO, POSITION, SCENARIOS, SURFACE, TICK, ValidationError,
+                         contract_inputs, time_and_carry)
 
 calc_bp = Blueprint('calc_bp', __name__,
                     url_prefix='/calc',
@@ -37,34 +53,37 @@ def calc_option(type_option):
                     - drift
                     - expiration
                     - time
-                    - dividend
                 properties:
                     spot:
                         description: Underlying spot of the option
                         type: number
-                        min: 1
+                        minimum: 0
+                        exclusiveMinimum: true
                         example: 50
                     strike:
                         description: Strike of the option
                         type: number
-                        min: 1
+                        minimum: 0
+                        exclusiveMinimum: true
                         example: 51
                     rate:
                         description: Rate risk free of the option
                         type: number
-                        min: 0.05
-                        max: 1
+                        minimum: -1
+                        maximum: 1
                         example: 0.1
                     drift:
                         description: Drift of the option
                         type: number
-                        min: 0.05
-                        max: 1
+                        minimum: 0
+                        exclusiveMinimum: true
+                        maximum: 5
                         example: 0.3
                     expiration:
                         description: Expiration time of the option
                         type: number
-                        min: 1
+                        minimum: 0
+                        exclusiveMinimum: true
                         example: 15
                     time:
                         description: Time unity for the Expiration
@@ -75,9 +94,30 @@ def calc_option(type_option):
                         description: Dividend of the option if it is an option with dividend. If it's not you can put
                             value but void.
                         type: number
-                        min: 1
-                        max: 25
-                        example: 3
+                        minimum: 0
+                        maximum: 1
+                        example: 0.03
+                    exercise:
+                        description: Exercise style, an american option is priced on a binomial lattice
+                        type: string
+                        enum: ['european', 'american']
+                        example: 'european'
+                    steps:
+                        description: Steps of the lattice of an american option
+                        type: integer
+                        minimum: 10
+                        maximum: 5000
+                        example: 200
+                    greeks:
+                        description: Values to compute, price, delta, theta, gamma, vega and rho by default. The
+                            higher order greeks are only computed for european options and are rounded to 6
+                            decimals
+                        type: array
+                        items:
+                            type: string
+                            enum: ['price', 'delta', 'theta', 'gamma', 'vega', 'rho', 'vanna', 'volga', 'charm',
+                                'speed', 'color', 'zomma']
+                        example: ['price', 'delta', 'gamma', 'vanna', 'volga']
     responses:
         200:
             description: List of values associated to the input
@@ -86,116 +126,23 @@ def calc_option(type_option):
         400:
             description: Invalid arguments
     """
-    input_json = request.get_json()
-    strike = float(input_json["strike"])
-    spot = float(input_json["spot"])
-    rate = float(input_json["rate"])
-    drift = float(input_json["drift"])
-    expiration = float(input_json["expiration"])
-    dividend = float(input_json["dividend"])
-    time = str(input_json["time"])
-
-    if not strike or not spot or not rate or not drift or not expiration or not time:
-        message = jsonify(message='invalid arguments')
-        return make_response(message, 400)
-
-    if time == "days":
-        time_u = 365
-    elif time == "months":
-        time_u = 12
-    elif time == "years":
-        time_u = 1
-    else:
-        message = jsonify(message='invalid arguments')
-        return make_response(message, 400)
+    try:
+        values = OPTION.validate(request.get_json(silent=True), type_option=type_option)
+    except ValidationError as error:
+        return _invalid(error)
 
-    time_exp = expiration / time_u
+    spot, strike, rate, drift = values['spot'], values['strike'], values['rate'], values['drift']
+    time_exp = values['expiration'] / TIME_UNITS[values['time']]
+    dividend = carry(type_option, values['dividend'])
 
-    # D1 and D2
-    if type_option == "Vanilla":
-        d_1 = (log(spot / strike) + (rate + pow(drift, 2) * 0.5) * time_exp) / (drift * sqrt(time_exp))
-    else:
-        d_1 = (log(spot / strike) + (rate - dividend + pow(drift, 2) * 0.5) * time_exp) / (drift * sqrt(time_exp))
-
-    d_2 = d_1 - (drift * sqrt(time_exp))
-
-    # CDF
-    n_d_1 = stats.norm.cdf(d_1)
-    n_d_2 = stats.norm.cdf(d_2)
-    n_d_n_1 = stats.norm.cdf(-d_1)
-    n_d_n_2 = stats.norm.cdf(-d_2)
-
-    # PDF
-    np_d_1 = stats.norm.pdf(d_1)
-    np_d_n_1 = stats.norm.pdf(-d_1)
-
-    if type_option == "Vanilla":
-        # Price
-        price_call = spot * n_d_1 - strike * exp(-1 * rate * time_exp) * n_d_2
-        price_put = strike * exp(-1 * rate * time_exp) * n_d_n_2 - spot * n_d_n_1
-
-        # Greeks
-        delta_call = n_d_1
-        delta_put = -delta_call
-
-        theta_call = -1 * ((spot * np_d_1 * drift) / (2 * sqrt(time_exp))) - rate * strike * exp(
-            -rate * time_exp) * n_d_2
-        theta_put = -1 * ((spot * np_d_1 * drift) / (2 * sqrt(time_exp))) + rate * strike * exp(
-            -rate * time_exp) * n_d_n_2
-
-        gamma_call = np_d_1 / (spot * drift * sqrt(time_exp))
-        gamma_put = np_d_n_1 / (spot * drift * sqrt(time_exp))
-
-        vega_call = spot * sqrt(time_exp) * np_d_1
-        vega_put = spot * sqrt(time_exp) * np_d_n_1
-
-        rho_call = strike * time_exp * exp(-rate * time_exp) * n_d_2
-        rho_put = -strike * time_exp * exp(-rate * time_exp) * n_d_n_2
-    elif type_option == 'Dividend':
-        # Price
-        price_call = spot * exp(-dividend * time_exp) * n_d_1 - strike * exp(-rate * time_exp) * n_d_2
-        price_put = strike * exp(-rate * time_exp) * n_d_n_2 - spot * exp(-dividend * time_exp) * n_d_n_1
-
-        # Greeks
-        delta_call = exp(-1 * dividend * time_exp) * n_d_1
-        delta_put = exp(-1 * dividend * time_exp) * (delta_call - 1)
-
-        theta_call = -1 * ((spot * np_d_1 * drift * exp(-1 * dividend * time_exp)) / (
-                2 * sqrt(time_exp))) + dividend * spot * n_d_1 * exp(
-            -1 * dividend * time_exp) - rate * strike * exp(-rate * time_exp) * n_d_2
-        theta_put = -1 * ((spot * np_d_1 * drift * exp(-1 * dividend * time_exp)) /
-                          (2 * sqrt(time_exp))) - dividend * spot * n_d_1 * exp(
-            -1 * dividend * time_exp) + rate * strike * exp(-rate * time_exp) * n_d_n_2
-
-        gamma_call = (np_d_1 * exp(-1 * dividend * time_exp)) / (spot * drift * sqrt(time_exp))
-        gamma_put = (np_d_n_1 * exp(-1 * dividend * time_exp)) / (spot * drift * sqrt(time_exp))
-
-        vega_call = spot * sqrt(time_exp) * np_d_1 * exp(-1 * dividend * time_exp)
-        vega_put = spot * sqrt(time_exp) * np_d_n_1 * exp(-1 * dividend * time_exp)
-
-        rho_call = strike * time_exp * exp(-rate * time_exp) * n_d_2
-        rho_put = -strike * time_exp * exp(-rate * time_exp) * n_d_n_2
-
-    return jsonify([
-        {
-            "name": "Call",
-            "price": round(price_call, 3),
-            "delta": round(delta_call, 3),
-            "theta": round(theta_call, 3),
-            "gamma": round(gamma_call, 3),
-            "rho": round(rho_call, 3),
-            "vega": round(vega_call, 3),
-        },
-        {
-            "name": "Put",
-            "price": round(price_put, 3),
-            "delta": round(delta_put, 3),
-            "theta": round(theta_put, 3),
-            "gamma": round(gamma_put, 3),
-            "rho": round(rho_put, 3),
-            "vega": round(vega_put, 3),
-        }
-    ])
+    greeks = [greek for greek in ALL_GREEKS if greek in values['greeks']]
+
+    if values['exercise'] == 'american':
+        steps = values['steps']
+        return jsonify(_cached(('american', spot, strike, rate, drift, time_exp, dividend, steps, *greeks),
+                               lambda: _option_values(spot, strike, rate, drift, time_exp, dividend, greeks, steps)))
+    return jsonify(_cached(('option', spot, strike, rate, drift, time_exp, dividend, *greeks),
+                           lambda: _option_values(spot, strike, rate, drift, time_exp, dividend, greeks)))
 
 
 @calc_bp.route('/delta/<type_option>/', methods=['POST'])
@@ -209,6 +156,9 @@ def calc_delta(type_option):
         -   "application/json"
     produces :
         -   "application/json"
+        -   "application/vnd.getgreeks.columnar+json"
+        -   "application/octet-stream"
+        -   "application/vnd.apache.arrow.stream"
     parameters:
         -   name: type_option
             in: path
@@ -228,50 +178,71 @@ def calc_delta(type_option):
                     - rate
                     - drift
                     - expiration
-                    - time
-                    - dividend
                 properties:
                     spot_b:
                         description: First value of the spot interval
                         type: number
-                        min: 1
-                        max: 99
+                        minimum: 1
                         example: 40
                     spot_e:
                         description: Last value of the spot interval
                         type: number
-                        min: 2
-                        max: 100
+                        minimum: 1
                         example: 60
                     strike:
                         description: Strike of the option
                         type: number
-                        min: 1
+                        minimum: 0
+                        exclusiveMinimum: true
                         example: 50
                     rate:
                         description: Rate risk free of the option
                         type: number
-                        min: 0.05
-                        max: 1
+                        minimum: -1
+                        maximum: 1
                         example: 0.1
                     drift:
                         description: Drift of the option
                         type: number
-                        min: 0.05
-                        max: 1
+                        minimum: 0
+                        exclusiveMinimum: true
+                        maximum: 5
                         example: 0.3
                     expiration:
-                        description: Expiration time of the option
+                        description: Expiration time of the option in days
                         type: number
-                        min: 1
+                        minimum: 0
+                        exclusiveMinimum: true
                         example: 15
                     dividend:
                         description: Dividend of the option if it is an option with dividend. If it's not you can put
                             value but void.
                         type: number
-                        min: 1
-                        max: 25
-                        example: 3
+                        minimum: 0
+                        maximum: 1
+                        example: 0.03
+                    method:
+                        description: closed_form, or pde to solve the whole curve on a Crank-Nicolson grid
+                        type: string
+                        enum: ['closed_form', 'pde']
+                        example: 'closed_form'
+                    exercise:
+                        description: Exercise style, american curves need the pde method
+                        type: string
+                        enum: ['european', 'american']
+                        example: 'european'
+                    space_steps:
+                        description: Spot intervals of the grid of the pde method
+                        type: integer
+                        minimum: 10
+                        maximum: 10000
+                        example: 400
+                    time_steps:
+                        description: Time steps of the grid of the pde method
+                        type: integer
+                        minimum: 10
+                        maximum: 10000
+                        example: 200
     responses:
         200:
             description: List of values associated to the input
@@ -280,40 +251,7 @@ def calc_delta(type_option):
         400:
             description: Invalid arguments
     """
-    input_json = request.get_json()
-    strike = float(input_json["strike"])
-    spot_b = float(input_json["spot_b"])
-    spot_e = float(input_json["spot_e"])
-    rate = float(input_json["rate"])
-    drift = float(input_json["drift"])
-    expiration = float(input_json["expiration"])
-    dividend = float(input_json["dividend"])
-
-    count = 0
-    result_tot = {
-        "call": [{'x': 0.0, 'y': 0.0} for i in range(int(spot_e - spot_b))],
-        "put": [{'x': 0.0, 'y': 0.0} for i in range(int(spot_e - spot_b))],
-    }
-    time_exp = expiration / 365
-    if type_option == "Vanilla":
-        for i in range(int(spot_b), int(spot_e), 1):
-            result_tot["put"][count]['x'] = i
-            result_tot["call"][count]['x'] = i
-            result_tot["call"][count]['y'] = round(stats.norm.cdf(
-                (log(i / strike) + (rate + pow(drift, 2) * 0.5) * time_exp) / (drift * sqrt(time_exp))), 3)
-            result_tot["put"][count]['y'] = -1 * result_tot["call"][count]['y']
-            count += 1
-    elif type_option == 'Dividend':
-        for i in range(int(spot_b), int(spot_e), 1):
-            result_tot["put"][count]['x'] = i
-            result_tot["call"][count]['x'] = i
-            result_tot["call"][count]['y'] = round(exp(-1 * dividend * time_exp) * stats.norm.cdf(
-                (log(i / strike) + (rate - dividend + pow(drift, 2) * 0.5) * time_exp) / (drift * sqrt(time_exp))), 3)
-            result_tot["put"][count]['y'] = round(exp(-1 * dividend * time_exp) * (result_tot["call"][count]['y'] - 1),
-                                                  3)
-            count += 1
-
-    return jsonify(result_tot)
+    return _calc_curve(type_option, 'delta')
 
 
 @calc_bp.route('/theta/<type_option>/', methods=['POST'])
@@ -327,6 +265,9 @@ def calc_theta(type_option):
         -   "application/json"
     produces :
         -   "application/json"
+        -   "application/vnd.getgreeks.columnar+json"
+        -   "application/octet-stream"
+        -   "application/vnd.apache.arrow.stream"
     parameters:
         -   name: type_option
             in: path
@@ -346,50 +287,71 @@ def calc_theta(type_option):
                     - rate
                     - drift
                     - expiration
-                    - time
-                    - dividend
                 properties:
                     spot_b:
                         description: First value of the spot interval
                         type: number
-                        min: 1
-                        max: 99
+                        minimum: 1
                         example: 40
                     spot_e:
                         description: Last value of the spot interval
                         type: number
-                        min: 2
-                        max: 100
+                        minimum: 1
                         example: 60
                     strike:
                         description: Strike of the option
                         type: number
-                        min: 1
+                        minimum: 0
+                        exclusiveMinimum: true
                         example: 50
                     rate:
                         description: Rate risk free of the option
                         type: number
-                        min: 0.05
-                        max: 1
+                        minimum: -1
+                        maximum: 1
                         example: 0.1
                     drift:
                         description: Drift of the option
                         type: number
-                        min: 0.05
-                        max: 1
+                        minimum: 0
+                        exclusiveMinimum: true
+                        maximum: 5
                         example: 0.3
                     expiration:
-                        description: Expiration time of the option
+                        description: Expiration time of the option in days
                         type: number
-                        min: 1
+                        minimum: 0
+                        exclusiveMinimum: true
                         example: 15
                     dividend:
                         description: Dividend of the option if it is an option with dividend. If it's not you can put
                             value but void.
                         type: number
-                        min: 1
-                        max: 25
-                        example: 3
+                        minimum: 0
+                        maximum: 1
+                        example: 0.03
+                    method:
+                        description: closed_form, or pde to solve the whole curve on a Crank-Nicolson grid
+                        type: string
+                        enum: ['closed_form', 'pde']
+                        example: 'closed_form'
+                    exercise:
+                        description: Exercise style, american curves need the pde method
+                        type: string
+                        enum: ['european', 'american']
+                        example: 'european'
+                    space_steps:
+                        description: Spot intervals of the grid of the pde method
+                        type: integer
+                        minimum: 10
+                        maximum: 10000
+                        example: 400
+                    time_steps:
+                        description: Time steps of the grid of the pde method
+                        type: integer
+                        minimum: 10
+                        maximum: 10000
+                        example: 200
     responses:
         200:
             description: List of values associated to the input
@@ -398,61 +360,7 @@ def calc_theta(type_option):
         400:
             description: Invalid arguments
     """
-    input_json = request.get_json()
-    strike = float(input_json["strike"])
-    spot_b = float(input_json["spot_b"])
-    spot_e = float(input_json["spot_e"])
-    rate = float(input_json["rate"])
-    drift = float(input_json["drift"])
-    expiration = float(input_json["expiration"])
-    dividend = float(input_json["dividend"])
-
-    count = 0
-    result_tot = {
-        "call": [{'x': 0.0, 'y': 0.0} for i in range(int(spot_e - spot_b))],
-        "put": [{'x': 0.0, 'y': 0.0} for i in range(int(spot_e - spot_b))],
-    }
-    time_exp = expiration / 365
-    if type_option == 'Vanilla':
-        for i in range(int(spot_b), int(spot_e), 1):
-            d_1 = (log(i / strike) + (rate - dividend + pow(drift, 2) / 2) * time_exp) / (drift * sqrt(time_exp))
-            d_2 = d_1 - (drift * sqrt(time_exp))
-            np_d_1 = stats.norm.pdf(d_1)
-            n_d_2 = stats.norm.cdf(d_2)
-            n_d_n_2 = stats.norm.cdf(-d_2)
-
-            result_tot["put"][count]['x'] = i
-            result_tot["call"][count]['x'] = i
-
-            result_tot["call"][count]['y'] = round(
-                -1 * ((i * np_d_1 * drift) / (2 * sqrt(time_exp))) - rate * strike * exp(
-                    -rate * time_exp) * n_d_2, 3)
-            result_tot["put"][count]['y'] = round(
-                -1 * ((i * np_d_1 * drift) / (2 * sqrt(time_exp))) + rate * strike * exp(
-                    -rate * time_exp) * n_d_n_2, 3)
-            count += 1
-    elif type_option == 'Dividend':
-        for i in range(int(spot_b), int(spot_e), 1):
-            d_1 = (log(i / strike) + (rate - dividend + pow(drift, 2) / 2) * time_exp) / (drift * sqrt(time_exp))
-            d_2 = d_1 - (drift * sqrt(time_exp))
-            n_d_1 = stats.norm.cdf(d_1)
-            np_d_1 = stats.norm.pdf(d_1)
-            n_d_2 = stats.norm.cdf(d_2)
-            n_d_n_2 = stats.norm.cdf(-d_2)
-
-            result_tot["put"][count]['x'] = i
-            result_tot["call"][count]['x'] = i
-
-            result_tot["call"][count]['y'] = round(-1 * ((i * np_d_1 * drift * exp(-1 * dividend * time_exp)) /
-                                                         (2 * sqrt(time_exp))) - dividend * i * n_d_1 *
-                                                   exp(-1 * dividend * time_exp) - rate * strike * exp(
-                -rate * time_exp) * n_d_2, 3)
-            result_tot["put"][count]['y'] = round(-1 * ((i * np_d_1 * drift * exp(-1 * dividend * time_exp)) /
-                                                        (2 * sqrt(time_exp))) - dividend * i * n_d_1 * exp(
-                -1 * dividend * time_exp) + rate * strike * exp(-rate * time_exp) * n_d_n_2, 3)
-            count += 1
-
-    return jsonify(result_tot)
+    return _calc_curve(type_option, 'theta')
 
 
 @calc_bp.route('/gamma/<type_option>/', methods=['POST'])
@@ -466,6 +374,9 @@ def calc_gamma(type_option):
         -   "application/json"
     produces :
         -   "application/json"
+        -   "application/vnd.getgreeks.columnar+json"
+        -   "application/octet-stream"
+        -   "application/vnd.apache.arrow.stream"
     parameters:
         -   name: type_option
             in: path
@@ -485,50 +396,71 @@ def calc_gamma(type_option):
                     - rate
                     - drift
                     - expiration
-                    - time
-                    - dividend
                 properties:
                     spot_b:
                         description: First value of the spot interval
                         type: number
-                        min: 1
-                        max: 99
+                        minimum: 1
                         example: 40
                     spot_e:
                         description: Last value of the spot interval
                         type: number
-                        min: 2
-                        max: 100
+                        minimum: 1
                         example: 60
                     strike:
                         description: Strike of the option
                         type: number
-                        min: 1
+                        minimum: 0
+                        exclusiveMinimum: true
                         example: 50
                     rate:
                         description: Rate risk free of the option
                         type: number
-                        min: 0.05
-                        max: 1
+                        minimum: -1
+                        maximum: 1
                         example: 0.1
                     drift:
                         description: Drift of the option
                         type: number
-                        min: 0.05
-                        max: 1
+                        minimum: 0
+                        exclusiveMinimum: true
+                        maximum: 5
                         example: 0.3
                     expiration:
-                        description: Expiration time of the option
+                        description: Expiration time of the option in days
                         type: number
-                        min: 1
+                        minimum: 0
+                        exclusiveMinimum: true
                         example: 15
                     dividend:
                         description: Dividend of the option if it is an option with dividend. If it's not you can put
                             value but void.
                         type: number
-                        min: 1
-                        max: 25
-                        example: 3
+                        minimum: 0
+                        maximum: 1
+                        example: 0.03
+                    method:
+                        description: closed_form, or pde to solve the whole curve on a Crank-Nicolson grid
+                        type: string
+                        enum: ['closed_form', 'pde']
+                        example: 'closed_form'
+                    exercise:
+                        description: Exercise style, american curves need the pde method
+                        type: string
+                        enum: ['european', 'american']
+                        example: 'european'
+                    space_steps:
+                        description: Spot intervals of the grid of the pde method
+                        type: integer
+                        minimum: 10
+                        maximum: 10000
+                        example: 400
+                    time_steps:
+                        description: Time steps of the grid of the pde method
+                        type: integer
+                        minimum: 10
+                        maximum: 10000
+                        example: 200
     responses:
         200:
             description: List of values associated to the input
@@ -537,49 +469,7 @@ def calc_gamma(type_option):
         400:
             description: Invalid arguments
     """
-    input_json = request.get_json()
-    strike = float(input_json["strike"])
-    spot_b = float(input_json["spot_b"])
-    spot_e = float(input_json["spot_e"])
-    rate = float(input_json["rate"])
-    drift = float(input_json["drift"])
-    expiration = float(input_json["expiration"])
-    dividend = float(input_json["dividend"])
-
-    count = 0
-    result_tot = {
-        "call": [{'x': 0.0, 'y': 0.0} for i in range(int(spot_e - spot_b))],
-        "put": [{'x': 0.0, 'y': 0.0} for i in range(int(spot_e - spot_b))],
-    }
-    time_exp = expiration / 365
-    if type_option == 'Vanilla':
-        for i in range(int(spot_b), int(spot_e), 1):
-            d_1 = (log(i / strike) + (rate - dividend + pow(drift, 2) / 2) * time_exp) / (drift * sqrt(time_exp))
-            np_d_1 = stats.norm.pdf(d_1)
-            np_d_n_1 = stats.norm.pdf(-d_1)
-
-            result_tot["put"][count]['x'] = i
-            result_tot["call"][count]['x'] = i
-
-            result_tot["call"][count]['y'] = round(np_d_1 / (i * drift * sqrt(time_exp)), 3)
-            result_tot["put"][count]['y'] = round(np_d_n_1 / (i * drift * sqrt(time_exp)), 3)
-            count += 1
-    elif type_option == 'Dividend':
-        for i in range(int(spot_b), int(spot_e), 1):
-            d_1 = (log(i / strike) + (rate - dividend + pow(drift, 2) / 2) * time_exp) / (drift * sqrt(time_exp))
-            np_d_1 = stats.norm.pdf(d_1)
-            np_d_n_1 = stats.norm.pdf(-d_1)
-
-            result_tot["put"][count]['x'] = i
-            result_tot["call"][count]['x'] = i
-
-            result_tot["call"][count]['y'] = round(
-                (np_d_1 * exp(-1 * dividend * time_exp)) / (i * drift * sqrt(time_exp)), 3)
-            result_tot["put"][count]['y'] = round(
-                (np_d_n_1 * exp(-1 * dividend * time_exp)) / (i * drift * sqrt(time_exp)), 3)
-            count += 1
-
-    return jsonify(result_tot)
+    return _calc_curve(type_option, 'gamma')
 
 
 @calc_bp.route('/vega/<type_option>/', methods=['POST'])
@@ -593,6 +483,9 @@ def calc_vega(type_option):
         -   "application/json"
     produces :
         -   "application/json"
+        -   "application/vnd.getgreeks.columnar+json"
+        -   "application/octet-stream"
+        -   "application/vnd.apache.arrow.stream"
     parameters:
         -   name: type_option
             in: path
@@ -612,50 +505,49 @@ def calc_vega(type_option):
                     - rate
                     - drift
                     - expiration
-                    - time
-                    - dividend
                 properties:
                     spot_b:
                         description: First value of the spot interval
                         type: number
-                        min: 1
-                        max: 99
+                        minimum: 1
                         example: 40
                     spot_e:
                         description: Last value of the spot interval
                         type: number
-                        min: 2
-                        max: 100
+                        minimum: 1
                         example: 60
                     strike:
                         description: Strike of the option
                         type: number
-                        min: 1
+                        minimum: 0
+                        exclusiveMinimum: true
                         example: 50
                     rate:
                         description: Rate risk free of the option
                         type: number
-                        min: 0.05
-                        max: 1
+                        minimum: -1
+                        maximum: 1
                         example: 0.1
                     drift:
                         description: Drift of the option
                         type: number
-                        min: 0.05
-                        max: 1
+                        minimum: 0
+                        exclusiveMinimum: true
+                        maximum: 5
                         example: 0.3
                     expiration:
-                        description: Expiration time of the option
+                        description: Expiration time of the option in days
                         type: number
-                        min: 1
+                        minimum: 0
+                        exclusiveMinimum: true
                         example: 15
                     dividend:
                         description: Dividend of the option if it is an option with dividend. If it's not you can put
                             value but void.
                         type: number
-                        min: 1
-                        max: 25
-                        example: 3
+                        minimum: 0
+                        maximum: 1
+                        example: 0.03
     responses:
         200:
             description: List of values associated to the input
@@ -664,46 +556,7 @@ def calc_vega(type_option):
         400:
             description: Invalid arguments
     """
-    input_json = request.get_json()
-    strike = float(input_json["strike"])
-    spot_b = float(input_json["spot_b"])
-    spot_e = float(input_json["spot_e"])
-    rate = float(input_json["rate"])
-    drift = float(input_json["drift"])
-    expiration = float(input_json["expiration"])
-    dividend = float(input_json["dividend"])
-
-    count = 0
-    result_tot = {
-        "call": [{'x': 0.0, 'y': 0.0} for i in range(int(spot_e - spot_b))],
-        "put": [{'x': 0.0, 'y': 0.0} for i in range(int(spot_e - spot_b))],
-    }
-    time_exp = expiration / 365
-    if type_option == 'Vanilla':
-        for i in range(int(spot_b), int(spot_e), 1):
-            d_1 = (log(i / strike) + (rate - dividend + pow(drift, 2) / 2) * time_exp) / (drift * sqrt(time_exp))
-            np_d_1 = stats.norm.pdf(d_1)
-            np_d_n_1 = stats.norm.pdf(-d_1)
-
-            result_tot["put"][count]['x'] = i
-            result_tot["call"][count]['x'] = i
-
-            result_tot["call"][count]['y'] = round(i * sqrt(time_exp) * np_d_1, 3)
-            result_tot["put"][count]['y'] = round(i * sqrt(time_exp) * np_d_n_1, 3)
-            count += 1
-    elif type_option == 'Dividend':
-        for i in range(int(spot_b), int(spot_e), 1):
-            d_1 = (log(i / strike) + (rate - dividend + pow(drift, 2) / 2) * time_exp) / (drift * sqrt(time_exp))
-            np_d_1 = stats.norm.pdf(d_1)
-
-            result_tot["put"][count]['x'] = i
-            result_tot["call"][count]['x'] = i
-
-            result_tot["call"][count]['y'] = round(i * sqrt(time_exp) * np_d_1 * exp(-1 * dividend * time_exp), 3)
-            result_tot["put"][count]['y'] = round(i * sqrt(time_exp) * np_d_1 * exp(-1 * dividend * time_exp), 3)
-            count += 1
-
-    return jsonify(result_tot)
+    return _calc_curve(type_option, 'vega')
 
 
 @calc_bp.route('/rho/<type_option>/', methods=['POST'])
@@ -717,6 +570,9 @@ def calc_rho(type_option):
         -   "application/json"
     produces :
         -   "application/json"
+        -   "application/vnd.getgreeks.columnar+json"
+        -   "application/octet-stream"
+        -   "application/vnd.apache.arrow.stream"
     parameters:
         -   name: type_option
             in: path
@@ -736,50 +592,49 @@ def calc_rho(type_option):
                     - rate
                     - drift
                     - expiration
-                    - time
-                    - dividend
                 properties:
                     spot_b:
                         description: First value of the spot interval
                         type: number
-                        min: 1
-                        max: 99
+                        minimum: 1
                         example: 40
                     spot_e:
                         description: Last value of the spot interval
                         type: number
-                        min: 2
-                        max: 100
+                        minimum: 1
                         example: 60
                     strike:
                         description: Strike of the option
                         type: number
-                        min: 1
+                        minimum: 0
+                        exclusiveMinimum: true
                         example: 50
                     rate:
                         description: Rate risk free of the option
                         type: number
-                        min: 0.05
-                        max: 1
+                        minimum: -1
+                        maximum: 1
                         example: 0.1
                     drift:
                         description: Drift of the option
                         type: number
-                        min: 0.05
-                        max: 1
+                        minimum: 0
+                        exclusiveMinimum: true
+                        maximum: 5
                         example: 0.3
                     expiration:
-                        description: Expiration time of the option
+                        description: Expiration time of the option in days
                         type: number
-                        min: 1
+                        minimum: 0
+                        exclusiveMinimum: true
                         example: 15
                     dividend:
                         description: Dividend of the option if it is an option with dividend. If it's not you can put
                             value but void.
                         type: number
-                        min: 1
-                        max: 25
-                        example: 3
+                        minimum: 0
+                        maximum: 1
+                        example: 0.03
     responses:
         200:
             description: List of values associated to the input
@@ -788,45 +643,1284 @@ def calc_rho(type_option):
         400:
             description: Invalid arguments
     """
-    input_json = request.get_json()
-    strike = float(input_json["strike"])
-    spot_b = float(input_json["spot_b"])
-    spot_e = float(input_json["spot_e"])
-    rate = float(input_json["rate"])
-    drift = float(input_json["drift"])
-    expiration = float(input_json["expiration"])
-    dividend = float(input_json["dividend"])
-
-    count = 0
-    result_tot = {
-        "call": [{'x': 0.0, 'y': 0.0} for i in range(int(spot_e - spot_b))],
-        "put": [{'x': 0.0, 'y': 0.0} for i in range(int(spot_e - spot_b))],
-    }
-    time_exp = expiration / 365
-    if type_option == "Vanilla":
-        for i in range(int(spot_b), int(spot_e), 1):
-            d_1 = (log(i / strike) + (rate - dividend + pow(drift, 2) / 2) * time_exp) / (drift * sqrt(time_exp))
-            d_2 = d_1 - (drift * sqrt(time_exp))
-            n_d_2 = stats.norm.cdf(d_2)
-            n_d_n_2 = stats.norm.cdf(-d_2)
-
-            result_tot["put"][count]['x'] = i
-            result_tot["call"][count]['x'] = i
-
-            result_tot["call"][count]['y'] = round(strike * time_exp * exp(-rate * time_exp) * n_d_2, 3)
-            result_tot["put"][count]['y'] = round(-strike * time_exp * exp(-rate * time_exp) * n_d_n_2, 3)
-            count += 1
-    elif type_option == "Dividend":
-        for i in range(int(spot_b), int(spot_e), 1):
-            d_1 = (log(i / strike) + (rate - dividend + pow(drift, 2) / 2) * time_exp) / (drift * sqrt(time_exp))
-            n_d_1 = stats.norm.cdf(d_1)
-            n_d_n_1 = stats.norm.cdf(-d_1)
-
-            result_tot["put"][count]['x'] = i
-            result_tot["call"][count]['x'] = i
-
-            result_tot["call"][count]['y'] = round(-time_exp * exp(-rate * time_exp) * i * n_d_1, 3)
-            result_tot["put"][count]['y'] = round(-time_exp * exp(-rate * time_exp) * i * n_d_n_1, 3)
-            count += 1
-
-    return jsonify(result_tot)
+    return _calc_curve(type_option, 'rho')
+
+
+@calc_bp.route('/curve/<type_option>/', methods=['POST'])
+def calc_curve(type_option):
+    """Route for calculate the variation of several greeks at once.
+    ---
+    tags:
+        - Calculate Greek for Graph
+    description: Route for calculate the variation of every requested greek over the spot interval in a single
+        pass. Each series is returned as an array aligned on x.
+    consumes :
+        -   "application/json"
+    produces :
+        -   "application/json"
+        -   "application/vnd.getgreeks.columnar+json"
+        -   "application/octet-stream"
+        -   "application/vnd.apache.arrow.stream"
+    parameters:
+        -   name: type_option
+            in: path
+            type: string
+            enum: ['Vanilla', 'Dividend']
+            required: true
+        -   in : body
+            name : body
+            description:
+                Input
+            required: true
+            schema:
+                required:
+                    - spot_b
+                    - spot_e
+                    - strike
+                    - rate
+                    - drift
+                    - expiration
+                properties:
+                    spot_b:
+                        description: First value of the spot interval
+                        type: number
+                        minimum: 1
+                        example: 40
+                    spot_e:
+                        description: Last value of the spot interval
+                        type: number
+                        minimum: 1
+                        example: 60
+                    strike:
+                        description: Strike of the option
+                        type: number
+                        minimum: 0
+                        exclusiveMinimum: true
+                        example: 50
+                    rate:
+                        description: Rate risk free of the option
+                        type: number
+                        minimum: -1
+                        maximum: 1
+                        example: 0.1
+                    drift:
+                        description: Drift of the option
+                        type: number
+                        minimum: 0
+                        exclusiveMinimum: true
+                        maximum: 5
+                        example: 0.3
+                    expiration:
+                        description: Expiration time of the option in days
+                        type: number
+                        minimum: 0
+                        exclusiveMinimum: true
+                        example: 15
+                    dividend:
+                        description: Dividend of the option if it is an option with dividend. If it's not you can put
+                            value but void.
+                        type: number
+                        minimum: 0
+                        maximum: 1
+                        example: 0.03
+                    greeks:
+                        description: Greeks to compute, delta, theta, gamma, vega and rho by default. The higher
+                            order greeks are rounded to 6 decimals
+                        type: array
+                        items:
+                            type: string
+                            enum: ['price', 'delta', 'theta', 'gamma', 'vega', 'rho', 'vanna', 'volga', 'charm',
+                                'speed', 'color', 'zomma']
+                        example: ['delta', 'gamma', 'vanna']
+                    method:
+                        description: closed_form, or pde to solve the whole curve on a Crank-Nicolson grid, for
+                            price, delta, theta and gamma
+                        type: string
+                        enum: ['closed_form', 'pde']
+                        example: 'closed_form'
+                    exercise:
+                        description: Exercise style, american curves need the pde method
+                        type: string
+                        enum: ['european', 'american']
+                        example: 'european'
+                    space_steps:
+                        description: Spot intervals of the grid of the pde method
+                        type: integer
+                        minimum: 10
+                        maximum: 10000
+                        example: 400
+                    time_steps:
+                        description: Time steps of the grid of the pde method
+                        type: integer
+                        minimum: 10
+                        maximum: 10000
+                        example: 200
+    responses:
+        200:
+            description: Spot axis and one series per requested greek
+        308:
+            description: Redirection
+        400:
+            description: Invalid arguments
+    """
+    try:
+        values = CURVE.validate(request.get_json(silent=True), type_option=type_option)
+    except ValidationError as error:
+        return _invalid(error)
+
+    spot_b, spot_e = int(values['spot_b']), int(values['spot_e'])
+    strike, rate, drift, greeks = values['strike'], values['rate'], values['drift'], values['greeks']
+    time_exp = values['expiration'] / 365
+    dividend = carry(type_option, values['dividend'])
+    grid = _grid(values)
+
+    columns = _cached(('curve', spot_b, spot_e, strike, rate, drift, time_exp, dividend, *greeks, *grid),
+                      lambda: _curve_values(spot_b, spot_e, strike, rate, drift, time_exp, dividend, greeks, grid))
+
+    return respond(columns, columns['x'].shape, lambda: {
+        "x": columns['x'].tolist(),
+        "call": {greek: rounded(columns['call.' + greek], precision(greek)) for greek in greeks},
+        "put": {greek: rounded(columns['put.' + greek], precision(greek)) for greek in greeks},
+    })
+
+
+@calc_bp.route('/cache/', methods=['GET'])
+def calc_cache():
+    """Route for the counters of the result cache.
+    ---
+    tags:
+        - Cache
+    description: Route for the size, settings and hit/miss/eviction/expiration counters of the result cache shared
+        by the option and curve routes.
+    produces :
+        -   "application/json"
+    responses:
+        200:
+            description: Counters of the cache, enabled false when the cache is disabled
+    """
+    cache = current_app.extensions.get('calc_cache')
+    if cache is None:
+        return jsonify(enabled=False)
+    return jsonify(enabled=True, **cache.stats())
+
+
+@calc_bp.route('/tables/', methods=['GET'])
+def calc_tables():
+    """Route for the description of the interpolated greek tables.
+    ---
+    tags:
+        - Cache
+    description: Route for the grid, size and guaranteed error bound of the interpolated greek tables answering the
+        option routes when they are enabled. The bound applies to N(d1), N(d2) and phi(d1), a price is accurate
+        within (spot + strike) times the bound.
+    produces :
+        -   "application/json"
+    responses:
+        200:
+            description: Description of the tables, enabled false when the tables are disabled
+    """
+    tables = current_app.extensions.get('calc_tables')
+    if tables is None:
+        return jsonify(enabled=False)
+    return jsonify(enabled=True, **tables.describe())
+
+
+@calc_bp.route('/coalescer/', methods=['GET'])
+def calc_coalescer():
+    """Route for the counters of the request coalescer.
+    ---
+    tags:
+        - Cache
+    description: Route for the settings, batch size histogram and queueing latency histogram (milliseconds) of the
+        coalescer grouping concurrent option requests into one pricing call.
+    produces :
+        -   "application/json"
+    responses:
+        200:
+            description: Counters of the coalescer, enabled false when the coalescer is disabled
+    """
+    coalescer = current_app.extensions.get('calc_coalescer')
+    if coalescer is None:
+        return jsonify(enabled=False)
+    return jsonify(enabled=True, **coalescer.stats())
+
+
+@calc_bp.route('/options/batch/', methods=['POST'])
+def calc_options_batch():
+    """Route for calculate all greek values plus the price of many contracts at once.
+    ---
+    tags:
+        - Calculate Option
+    description: Route for calculate all greek values plus the price of an array of contracts in one call. The
+        result is columnar, one array per value, aligned on the input contracts. Invalid contracts are reported in
+        errors and get null values, the others are still priced. Contracts can also be sent as an object of
+        columns, each one an array or a value shared by every contract.
+    consumes :
+        -   "application/json"
+    produces :
+        -   "application/json"
+    parameters:
+        -   in : body
+            name : body
+            description:
+                Input
+            required: true
+            schema:
+                required:
+                    - contracts
+                properties:
+                    contracts:
+                        description: Contracts to price
+                        type: array
+                        items:
+                            type: object
+                            required:
+                                - type_option
+                                - spot
+                                - strike
+                                - rate
+                                - drift
+                                - expiration
+                                - time
+                            properties:
+                                type_option:
+                                    type: string
+                                    enum: ['Vanilla', 'Dividend']
+                                    example: 'Vanilla'
+                                spot:
+                                    type: number
+                                    example: 50
+                                strike:
+                                    type: number
+                                    example: 51
+                                rate:
+                                    type: number
+                                    example: 0.1
+                                drift:
+                                    type: number
+                                    example: 0.3
+                                expiration:
+                                    type: number
+                                    example: 15
+                                time:
+                                    type: string
+                                    enum: ['days', 'months', 'years']
+                                    example: 'days'
+                                dividend:
+                                    type: number
+                                    example: 0
+                    exercise:
+                        description: Exercise style of every contract, american ones are priced together on a
+                            binomial lattice
+                        type: string
+                        enum: ['european', 'american']
+                        example: 'european'
+                    steps:
+                        description: Steps of the lattice of american contracts
+                        type: integer
+                        minimum: 10
+                        maximum: 5000
+                        example: 200
+    responses:
+        200:
+            description: Columnar values associated to the input and the list of invalid contracts
+        308:
+            description: Redirection
+        400:
+            description: Invalid arguments
+    """
+    input_json = request.get_json(silent=True)
+    contracts = input_json.get("contracts") if isinstance(input_json, dict) else input_json
+
+    try:
+        settings = BATCH.validate(input_json if isinstance(input_json, dict) else {})
+        columns, valid, errors = CONTRACT.validate_rows(contracts)
+        if settings['exercise'] == 'american' and valid.sum() * settings['steps'] ** 2 > MAX_LATTICE_NODES:
+            raise ValidationError([{'field': 'steps', 'message': 'american contracts have at most {} lattice nodes'
+                                    .format(MAX_LATTICE_NODES)}])
+    except ValidationError as error:
+        return _invalid(error)
+
+    size = valid.size
+    add_points(valid.sum())
+    if settings['exercise'] == 'american':
+        result = price_american(*contract_inputs(columns, valid), steps=settings['steps'])
+    else:
+        result = _price_many(*contract_inputs(columns, valid), pricer=_pricer())
+
+    return jsonify({
+        "size": size,
+        "call": {greek: _column(values, valid) for greek, values in result['call'].items()},
+        "put": {greek: _column(values, valid) for greek, values in result['put'].items()},
+        "errors": errors,
+    })
+
+
+@calc_bp.route('/options/stream/', methods=['POST'])
+def calc_options_stream():
+    """Route for calculate the values of a book of positions streamed in and out.
+    ---
+    tags:
+        - Calculate Option
+    description: Route for calculate the values of a large book of positions. The body is read incrementally as
+        NDJSON, one contract object per line, or as CSV, a header line with the contract fields then one contract
+        per line. Positions are priced by chunks and the values are streamed back in a chunked response, one line
+        per position in input order, in the format of the body unless the Accept header asks for the other one.
+        An invalid position gets a line with its error instead of its values.
+    consumes :
+        -   "application/x-ndjson"
+        -   "text/csv"
+    produces :
+        -   "application/x-ndjson"
+        -   "text/csv"
+    parameters:
+        -   name: greeks
+            in: query
+            type: string
+            description: Comma separated values to compute, all of them by default
+            example: 'price,delta'
+        -   in : body
+            name : body
+            description:
+                Positions, with the fields of a contract of /calc/options/batch/
+            required: true
+            schema:
+                type: string
+                example: '{"type_option": "Vanilla", "spot": 50, "strike": 51, "rate": 0.1, "drift": 0.3,
+                    "expiration": 15, "time": "days", "dividend": 0}'
+    responses:
+        200:
+            description: One line per position with its index and its values or its error
+        400:
+            description: Invalid arguments
+    """
+    mimetype = request.mimetype
+    greeks = [greek for greek in request.args.get('greeks', ','.join(GREEKS)).split(',') if greek]
+    errors = []
+    if mimetype not in FORMATS:
+        errors.append({'field': 'Content-Type', 'message': 'must be one of {}'.format(', '.join(FORMATS))})
+    if not greeks or not set(greeks) <= set(GREEKS):
+        errors.append({'field': 'greeks', 'message': 'must be one of {}'.format(', '.join(GREEKS))})
+    if errors:
+        return _invalid(ValidationError(errors))
+
+    output = mimetype
+    if request.accept_mimetypes:
+        output = request.accept_mimetypes.best_match(sorted(FORMATS, key=lambda name: name != mimetype),
+                                                     default=mimetype)
+    chunks = read_positions(request.stream, mimetype, current_app.config['CALC_STREAM_CHUNK_SIZE'])
+    values = stream_values(chunks, [greek for greek in GREEKS if greek in greeks], _pricer(), output)
+    return Response(stream_with_context(values), mimetype=output)
+
+
+@calc_bp.route('/portfolio/', methods=['POST'])
+def calc_portfolio():
+    """Route for calculate the net values of a portfolio and their breakdown by bucket.
+    ---
+    tags:
+        - Calculate Option
+    description: Route for calculate the net price and greeks of a portfolio of positions, each one a signed
+        quantity of a call or a put, and their breakdown by expiry bucket, by moneyness band (spot / strike) and by
+        underlying. Only the aggregates are returned. Positions can also be sent as an object of columns. A
+        portfolio with an invalid position is rejected with the errors of every invalid position.
+    consumes :
+        -   "application/json"
+    produces :
+        -   "application/json"
+    parameters:
+        -   in : body
+            name : body
+            description:
+                Input
+            required: true
+            schema:
+                required:
+                    - positions
+                properties:
+                    positions:
+                        description: Positions, with the fields of a contract of /calc/options/batch/
+                        type: array
+                        items:
+                            type: object
+                            required:
+                                - type_option
+                                - spot
+                                - strike
+                                - rate
+                                - drift
+                                - expiration
+                                - time
+                                - is_call
+                            properties:
+                                is_call:
+                                    type: boolean
+                                    example: true
+                                quantity:
+                                    description: Signed number of contracts held, 1 by default
+                                    type: number
+                                    example: -10
+                                underlying:
+                                    type: string
+                                    example: 'ABC'
+                    expiry_buckets:
+                        description: Increasing upper bounds in days of the expiry buckets
+                        type: array
+                        items:
+                            type: number
+                        example: [7, 30, 90, 180, 365, 730]
+                    moneyness_bands:
+                        description: Increasing bounds of the spot / strike bands
+                        type: array
+                        items:
+                            type: number
+                        example: [0.8, 0.95, 1.05, 1.2]
+    responses:
+        200:
+            description: Net values and their breakdown by expiry, moneyness and underlying
+        400:
+            description: Invalid arguments
+    """
+    input_json = request.get_json(silent=True)
+    try:
+        settings = PORTFOLIO.validate(input_json)
+        columns, valid, errors = POSITION.validate_rows(input_json.get("positions"), 'positions')
+    except ValidationError as error:
+        return _invalid(error)
+    if errors:
+        return _invalid(ValidationError(errors))
+
+    inputs = contract_inputs(columns, valid)
+    add_points(valid.size)
+    values = position_values(_price_many(*inputs, pricer=_pricer()), columns['is_call'], columns['quantity'])
+
+    expiry_buckets = np.asarray(settings['expiry_buckets'], dtype=float)
+    moneyness_bands = np.asarray(settings['moneyness_bands'], dtype=float)
+    underlyings, underlying = np.unique(columns['underlying'].astype(str), return_inverse=True)
+    report = aggregate(values, {
+        'expiry': (bucket(inputs[4] * 365, expiry_buckets), labels(expiry_buckets, 'd')),
+        'moneyness': (bucket(inputs[0] / inputs[1], moneyness_bands), labels(moneyness_bands)),
+        'underlying': (underlying, underlyings.tolist()),
+    })
+    return jsonify(dict(report, positions=valid.size))
+
+
+@calc_bp.route('/scenarios/', methods=['POST'])
+def calc_scenarios():
+    """Route for calculate the P&L of a portfolio under a grid of spot and volatility shocks.
+    ---
+    tags:
+        - Calculate Option
+    description: Route for calculate the profit and loss of a portfolio of positions, as sent to /calc/portfolio/,
+        for every cell of a grid of shocks. A cell shifts every spot by a relative spot shock and every drift by an
+        absolute vol shock. The book is either fully revalued in every cell or approximated from its delta, gamma
+        and vega (taylor), which is much cheaper for large books but loses accuracy for large shocks.
+    consumes :
+        -   "application/json"
+    produces :
+        -   "application/json"
+    parameters:
+        -   in : body
+            name : body
+            description:
+                Input
+            required: true
+            schema:
+                required:
+                    - positions
+                properties:
+                    positions:
+                        description: Positions, as sent to /calc/portfolio/
+                        type: array
+                        items:
+                            type: object
+                    spot_shocks:
+                        description: Relative shocks of the spot, columns of the grid
+                        type: array
+                        items:
+                            type: number
+                            exclusiveMinimum: true
+                            minimum: -1
+                        example: [-0.2, -0.1, 0, 0.1, 0.2]
+                    vol_shocks:
+                        description: Absolute shocks of the drift, rows of the grid
+                        type: array
+                        items:
+                            type: number
+                            minimum: -1
+                            maximum: 1
+                        example: [-0.1, 0, 0.1]
+                    method:
+                        description: Full revaluation or delta-gamma-vega approximation, full by default
+                        type: string
+                        enum: ['full', 'taylor']
+                        example: 'full'
+    responses:
+        200:
+            description: P&L of every cell, one row per vol shock and one column per spot shock
+        400:
+            description: Invalid arguments
+    """
+    input_json = request.get_json(silent=True)
+    try:
+        settings = SCENARIOS.validate(input_json)
+        columns, valid, errors = POSITION.validate_rows(input_json.get("positions"), 'positions')
+    except ValidationError as error:
+        return _invalid(error)
+    if errors:
+        return _invalid(ValidationError(errors))
+
+    spot_shocks = np.atleast_1d(np.asarray(settings['spot_shocks'], dtype=float))
+    vol_shocks = np.atleast_1d(np.asarray(settings['vol_shocks'], dtype=float))
+    full = settings['method'] == 'full'
+    add_points(valid.size * (spot_shocks.size * vol_shocks.size + 1 if full else 1))
+    revaluation = full_revaluation if full else taylor_revaluation
+    pnl = revaluation(contract_inputs(columns, valid), columns['is_call'], columns['quantity'], spot_shocks,
+                      vol_shocks, _pricer())
+
+    return jsonify({
+        "method": settings['method'],
+        "positions": valid.size,
+        "spot_shocks": spot_shocks.tolist(),
+        "vol_shocks": vol_shocks.tolist(),
+        "pnl": np.round(pnl, 3).tolist(),
+    })
+
+
+@calc_bp.route('/books/', methods=['POST'])
+def calc_books():
+    """Route for register a book of positions repriced on spot ticks.
+    ---
+    tags:
+        - Books
+    description: Route for register a book of positions, as sent to /calc/portfolio/ but without spot. Everything
+        which does not depend on the spot is computed once here, pushing spots to /calc/books/{book_id}/spot/ then
+        only reprices what depends on them. The server keeps at most CALC_BOOKS_MAX books and removes a book
+        left unused for CALC_BOOKS_TTL seconds.
+    consumes :
+        -   "application/json"
+    produces :
+        -   "application/json"
+    parameters:
+        -   in : body
+            name : body
+            description:
+                Input
+            required: true
+            schema:
+                required:
+                    - positions
+                properties:
+                    positions:
+                        description: Positions, as sent to /calc/portfolio/ without spot
+                        type: array
+                        items:
+                            type: object
+    responses:
+        201:
+            description: Id, size and underlyings of the book
+        400:
+            description: Invalid arguments
+        409:
+            description: The server holds its maximum of books
+    """
+    input_json = request.get_json(silent=True)
+    try:
+        positions = input_json.get("positions") if isinstance(input_json, dict) else None
+        columns, valid, errors = BOOK_POSITION.validate_rows(positions, 'positions')
+    except ValidationError as error:
+        return _invalid(error)
+    if errors:
+        return _invalid(ValidationError(errors))
+    if not valid.size:
+        return _invalid(ValidationError([{'field': 'positions', 'message': 'a book has at least one position'}]))
+
+    time_exp, dividend = time_and_carry(columns, valid)
+    add_points(valid.size)
+    book = Book.build(columns['strike'], columns['rate'], columns['drift'], time_exp, dividend, columns['is_call'],
+                      columns['quantity'], columns['underlying'].astype(str))
+    try:
+        book_id = current_app.extensions['calc_books'].add(book)
+    except StoreFull as error:
+        return make_response(jsonify(message=str(error)), 409)
+    return make_response(jsonify(id=book_id, size=book.size, underlyings=book.underlyings), 201)
+
+
+@calc_bp.route('/books/<book_id>/', methods=['GET', 'DELETE'])
+def calc_book(book_id):
+    """Route for describe or delete a book.
+    ---
+    tags:
+        - Books
+    description: Route for the size and the underlyings of a book (GET) or for delete it (DELETE).
+    produces :
+        -   "application/json"
+    parameters:
+        -   name: book_id
+            in: path
+            type: string
+            required: true
+    responses:
+        200:
+            description: Id, size and underlyings of the book
+        204:
+            description: Book deleted
+        404:
+            description: Unknown book
+    """
+    books = current_app.extensions['calc_books']
+    if request.method == 'DELETE':
+        return make_response('', 204) if books.delete(book_id) else _unknown_book()
+
+    book = books.get(book_id)
+    if book is None:
+        return _unknown_book()
+    return jsonify(id=book_id, size=book.size, underlyings=book.underlyings)
+
+
+@calc_bp.route('/books/<book_id>/spot/', methods=['POST'])
+def calc_book_spot(book_id):
+    """Route for reprice a book on new spots.
+    ---
+    tags:
+        - Books
+    description: Route for reprice every position of a book on new spots, given as one spot for a book on a single
+        underlying or as an object underlying -> spot. The net values of the book are returned as JSON, the values
+        of the held side of every position are added by the columnar, binary and Arrow formats.
+    consumes :
+        -   "application/json"
+    produces :
+        -   "application/json"
+        -   "application/vnd.getgreeks.columnar+json"
+        -   "application/octet-stream"
+        -   "application/vnd.apache.arrow.stream"
+    parameters:
+        -   name: book_id
+            in: path
+            type: string
+            required: true
+        -   in : body
+            name : body
+            description:
+                Input
+            required: true
+            schema:
+                properties:
+                    spot:
+                        description: Spot of the underlying of a book on a single underlying
+                        type: number
+                        example: 50
+                    spots:
+                        description: Spot of every underlying of the book
+                        type: object
+                        example: {"ABC": 50, "XYZ": 70}
+                    greeks:
+                        description: Values to compute, all of them by default
+                        type: array
+                        items:
+                            type: string
+                            enum: ['price', 'delta', 'theta', 'gamma', 'vega', 'rho']
+    responses:
+        200:
+            description: Net values of the book, and values of every position in the columnar formats
+        400:
+            description: Invalid arguments
+        404:
+            description: Unknown book
+    """
+    book = current_app.extensions['calc_books'].get(book_id)
+    if book is None:
+        return _unknown_book()
+    try:
+        values = TICK.validate(request.get_json(silent=True))
+        spots = values['spots'] or {}
+        if values['spot'] is not None:
+            if len(book.underlyings) > 1:
+                raise ValidationError([{'field': 'spot', 'message': 'the book has several underlyings, give spots'}])
+            spots = {underlying: values['spot'] for underlying in book.underlyings}
+        missing = [underlying for underlying in book.underlyings if underlying not in spots]
+        if missing:
+            raise ValidationError([{'field': 'spots', 'message': 'missing {}'.format(', '.join(missing))}])
+    except ValidationError as error:
+        return _invalid(error)
+
+    greeks = [greek for greek in GREEKS if greek in values['greeks']]
+    add_points(book.size)
+    columns, net = book.reprice([spots[underlying] for underlying in book.underlyings], greeks)
+
+    return respond(columns, (book.size,), lambda: {
+        "size": book.size,
+        "net": {greek: round(value, 3) for greek, value in net.items()},
+    }, lambda: {
+        "size": book.size,
+        "net": {greek: round(value, 3) for greek, value in net.items()},
+        "positions": {greek: rounded(column) for greek, column in columns.items()},
+    })
+
+
+@calc_bp.route('/books/<book_id>/events/', methods=['GET'])
+def calc_book_events(book_id):
+    """Route for subscribe to the values of a book pushed on every spot change.
+    ---
+    tags:
+        - Books
+    description: Route for a Server-Sent Events stream of the values of a book, repriced in one pass over all its
+        positions whenever the spot feed moves. Spots moving faster than the interval are coalesced, an update
+        always carries the latest spots. Each `greeks` event holds the spots, the net values of the book and,
+        unless disabled, the values of the held side of every position. The stream ends after a while and the
+        client reconnects. A stream holds a server thread, so a worker only serves CALC_EVENTS_MAX_STREAMS of
+        them at once.
+    produces :
+        -   "text/event-stream"
+    parameters:
+        -   name: book_id
+            in: path
+            type: string
+            required: true
+        -   name: greeks
+            in: query
+            type: string
+            description: Comma separated values to compute, all of them by default
+            example: 'price,delta'
+        -   name: interval
+            in: query
+            type: number
+            description: Seconds between two updates, at least the configured CALC_EVENTS_INTERVAL
+            example: 1
+        -   name: positions
+            in: query
+            type: boolean
+            description: Send the values of every position, true by default
+    responses:
+        200:
+            description: Stream of greeks events
+        400:
+            description: Invalid arguments
+        404:
+            description: Unknown book
+        503:
+            description: No spot feed is configured, see CALC_FEED, or the worker serves its maximum of streams
+    """
+    feed = current_app.extensions.get('calc_feed')
+    if feed is None:
+        return make_response(jsonify(message='no spot feed'), 503)
+    book = current_app.extensions['calc_books'].get(book_id)
+    if book is None:
+        return _unknown_book()
+
+    config = current_app.config
+    greeks = [greek for greek in request.args.get('greeks', ','.join(GREEKS)).split(',') if greek]
+    interval = request.args.get('interval', config['CALC_EVENTS_INTERVAL'], type=float)
+    errors = []
+    if not greeks or not set(greeks) <= set(GREEKS):
+        errors.append({'field': 'greeks', 'message': 'must be one of {}'.format(', '.join(GREEKS))})
+    if interval is None or not interval >= config['CALC_EVENTS_INTERVAL']:
+        errors.append({'field': 'interval', 'message': 'must be at least {:g}'.format(config['CALC_EVENTS_INTERVAL'])})
+    if errors:
+        return _invalid(ValidationError(errors))
+
+    streams = current_app.extensions['calc_streams']
+    if not streams.acquire(blocking=False):
+        response = make_response(jsonify(message='too many event streams'), 503)
+        response.headers['Retry-After'] = str(max(RETRY_MS // 1000, 1))
+        return response
+
+    feed.track(book.underlyings)
+    events = book_events(book, feed.board, [greek for greek in GREEKS if greek in greeks], interval,
+                         config['CALC_EVENTS_HEARTBEAT'], config['CALC_EVENTS_DURATION'],
+                         request.args.get('positions', 'true').lower() not in ('0', 'false'))
+    response = Response(stream_with_context(events), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+    response.call_on_close(streams.release)
+    return response
+
+
+@calc_bp.route('/montecarlo/<type_option>/', methods=['POST'])
+def calc_montecarlo(type_option):
+    """Route for calculate the Monte Carlo price of a path dependent option.
+    ---
+    tags:
+        - Calculate Option
+    description: Route for calculate the price of an Asian (arithmetic average of the fixings) or barrier option, or
+        of a European one for comparison, by simulating the spot with the model of the closed form routes. The
+        price comes with its standard error and the seed of the draws, the same seed gives the same price.
+        Antithetic variates and a control variate on the vanilla option reduce the error, large pricings are split
+        across the process pool.
+    consumes :
+        -   "application/json"
+    produces :
+        -   "application/json"
+    parameters:
+        -   name: type_option
+            in: path
+            type: string
+            enum: ['Vanilla', 'Dividend']
+            required: true
+        -   in : body
+            name : body
+            description:
+                Input, with the fields of /calc/option/
+            required: true
+            schema:
+                required:
+                    - spot
+                    - strike
+                    - rate
+                    - drift
+                    - expiration
+                    - time
+                    - is_call
+                    - payoff
+                properties:
+                    spot:
+                        type: number
+                        example: 100
+                    strike:
+                        type: number
+                        example: 100
+                    rate:
+                        type: number
+                        example: 0.05
+                    drift:
+                        type: number
+                        example: 0.2
+                    expiration:
+                        type: number
+                        example: 1
+                    time:
+                        type: string
+                        enum: ['days', 'months', 'years']
+                        example: 'years'
+                    dividend:
+                        type: number
+                        example: 0
+                    is_call:
+                        type: boolean
+                        example: true
+                    payoff:
+                        type: string
+                        enum: ['european', 'asian', 'barrier']
+                        example: 'asian'
+                    barrier:
+                        description: Level of the barrier, required by a barrier payoff
+                        type: number
+                        example: 120
+                    barrier_type:
+                        type: string
+                        enum: ['up-and-out', 'up-and-in', 'down-and-out', 'down-and-in']
+                        example: 'up-and-out'
+                    continuous:
+                        description: Price a continuously monitored barrier instead of one checked on the fixings
+                        type: boolean
+                        example: false
+                    fixings:
+                        description: Number of observation dates evenly spaced up to the expiry
+                        type: integer
+                        minimum: 1
+                        maximum: 10000
+                        example: 100
+                    paths:
+                        type: integer
+                        minimum: 2
+                        maximum: 10000000
+                        example: 100000
+                    antithetic:
+                        type: boolean
+                        example: true
+                    control_variate:
+                        type: boolean
+                        example: true
+                    seed:
+                        description: Seed of the draws, a random one is used and returned when missing
+                        type: integer
+                        example: 42
+    responses:
+        200:
+            description: Price, standard error, number of paths, seed and closed form vanilla price
+        400:
+            description: Invalid arguments
+    """
+    try:
+        values = MONTE_CARLO.validate(request.get_json(silent=True), type_option=type_option)
+    except ValidationError as error:
+        return _invalid(error)
+
+    option = {name: values[name] for name in ('spot', 'strike', 'rate', 'drift', 'is_call', 'payoff', 'barrier',
+                                              'barrier_type', 'continuous', 'fixings', 'antithetic')}
+    option['time_exp'] = values['expiration'] / TIME_UNITS[values['time']]
+    option['dividend'] = carry(type_option, values['dividend'])
+
+    points = values['paths'] * values['fixings']
+    workers = current_app.config['CALC_PARALLEL_WORKERS']
+    executor = None
+    if workers > 1 and points >= current_app.config['CALC_MC_PARALLEL_THRESHOLD']:
+        executor = get_pool(workers)
+    add_points(points)
+    result = price_path_dependent(option, values['paths'], values['seed'], values['control_variate'], executor,
+                                  workers)
+    return jsonify({name: round(value, 6) if isinstance(value, float) else value for name, value in result.items()})
+
+
+@calc_bp.route('/implied_vol/<type_option>/', methods=['POST'])
+def calc_implied_vol(type_option):
+    """Route for calculate the implied drift of quoted option prices.
+    ---
+    tags:
+        - Calculate Option
+    description: Route for calculate the implied drift (volatility) of a whole chain of quoted prices. The arrays
+        are solved together with a safeguarded Newton iteration, every row reports its status and the number of
+        iterations it took. spot, rate and dividend may be numbers or arrays.
+    consumes :
+        -   "application/json"
+    produces :
+        -   "application/json"
+    parameters:
+        -   name: type_option
+            in: path
+            type: string
+            enum: ['Vanilla', 'Dividend']
+            required: true
+        -   in : body
+            name : body
+            description:
+                Input
+            required: true
+            schema:
+                required:
+                    - price
+                    - spot
+                    - strike
+                    - rate
+                    - expiration
+                    - is_call
+                properties:
+                    price:
+                        description: Quoted prices of the options
+                        type: array
+                        items:
+                            type: number
+                        example: [3.61, 2.376]
+                    spot:
+                        description: Underlying spot of the options
+                        type: number
+                        example: 50
+                    strike:
+                        description: Strikes of the options
+                        type: array
+                        items:
+                            type: number
+                        example: [50, 50]
+                    rate:
+                        description: Rate risk free of the options
+                        type: number
+                        example: 0.1
+                    expiration:
+                        description: Expiration times of the options
+                        type: array
+                        items:
+                            type: number
+                        example: [3, 3]
+                    time:
+                        description: Time unity for the Expiration, days by default
+                        type: string
+                        enum: ['days', 'months', 'years']
+                        example: 'months'
+                    is_call:
+                        description: True for a call, false for a put
+                        type: array
+                        items:
+                            type: boolean
+                        example: [true, false]
+                    dividend:
+                        description: Dividend of the options if they are options with dividend. If it's not you can
+                            put value but void.
+                        type: number
+                        example: 0
+    responses:
+        200:
+            description: Implied drift, status and iterations of every price, the drift is null when not solvable
+        308:
+            description: Redirection
+        400:
+            description: Invalid arguments
+    """
+    try:
+        values = IMPLIED_VOL.validate(request.get_json(silent=True), type_option=type_option)
+    except ValidationError as error:
+        return _invalid(error)
+
+    drift, status, iterations = implied_volatility(
+        values['price'], values['spot'], values['strike'], values['rate'],
+        year_fraction(values['expiration'], values['time']), carry(type_option, values['dividend']),
+        values['is_call'])
+    add_points(drift.size)
+
+    return jsonify({
+        "drift": np.where(np.isnan(drift), None, drift).tolist(),
+        "status": status.tolist(),
+        "iterations": iterations.tolist(),
+    })
+
+
+@calc_bp.route('/surface/<type_option>/', methods=['POST'])
+def calc_surface(type_option):
+    """Route for calculate greek surfaces over spot and expiration.
+    ---
+    tags:
+        - Calculate Greek for Graph
+    description: Route for calculate the requested greeks over a spot x expiration grid. Each surface is returned
+        as a flat row-major array of the given shape, one row per expiration and one column per spot.
+    consumes :
+        -   "application/json"
+    produces :
+        -   "application/json"
+        -   "application/vnd.getgreeks.columnar+json"
+        -   "application/octet-stream"
+        -   "application/vnd.apache.arrow.stream"
+    parameters:
+        -   name: type_option
+            in: path
+            type: string
+            enum: ['Vanilla', 'Dividend']
+            required: true
+        -   in : body
+            name : body
+            description:
+                Input
+            required: true
+            schema:
+                required:
+                    - spot_b
+                    - spot_e
+                    - spot_steps
+                    - expiration_b
+                    - expiration_e
+                    - expiration_steps
+                    - strike
+                    - rate
+                    - drift
+                properties:
+                    spot_b:
+                        description: First value of the spot interval
+                        type: number
+                        minimum: 0
+                        exclusiveMinimum: true
+                        example: 40
+                    spot_e:
+                        description: Last value of the spot interval
+                        type: number
+                        minimum: 0
+                        exclusiveMinimum: true
+                        example: 60
+                    spot_steps:
+                        description: Number of spots in the interval
+                        type: integer
+                        minimum: 1
+                        example: 21
+                    expiration_b:
+                        description: First value of the expiration interval
+                        type: number
+                        minimum: 0
+                        exclusiveMinimum: true
+                        example: 15
+                    expiration_e:
+                        description: Last value of the expiration interval
+                        type: number
+                        minimum: 0
+                        exclusiveMinimum: true
+                        example: 90
+                    expiration_steps:
+                        description: Number of expirations in the interval
+                        type: integer
+                        minimum: 1
+                        example: 6
+                    time:
+                        description: Time unity for the Expiration, days by default
+                        type: string
+                        enum: ['days', 'months', 'years']
+                        example: 'days'
+                    strike:
+                        description: Strike of the option
+                        type: number
+                        minimum: 0
+                        exclusiveMinimum: true
+                        example: 50
+                    rate:
+                        description: Rate risk free of the option
+                        type: number
+                        minimum: -1
+                        maximum: 1
+                        example: 0.1
+                    drift:
+                        description: Drift of the option
+                        type: number
+                        minimum: 0
+                        exclusiveMinimum: true
+                        maximum: 5
+                        example: 0.3
+                    dividend:
+                        description: Dividend of the option if it is an option with dividend. If it's not you can put
+                            value but void.
+                        type: number
+                        minimum: 0
+                        maximum: 1
+                        example: 0.03
+                    greeks:
+                        description: Values to compute, all of them by default
+                        type: array
+                        items:
+                            type: string
+                            enum: ['price', 'delta', 'theta', 'gamma', 'vega', 'rho']
+    responses:
+        200:
+            description: Axes, shape and flat surfaces of the requested values
+        308:
+            description: Redirection
+        400:
+            description: Invalid arguments
+    """
+    try:
+        values = SURFACE.validate(request.get_json(silent=True), type_option=type_option)
+    except ValidationError as error:
+        return _invalid(error)
+
+    spot_steps, expiration_steps, greeks = values['spot_steps'], values['expiration_steps'], values['greeks']
+    spots = np.linspace(values['spot_b'], values['spot_e'], spot_steps)
+    expirations = np.linspace(values['expiration_b'], values['expiration_e'], expiration_steps)
+    time_exp = year_fraction(expirations, values['time'])[:, np.newaxis]
+    shape = (expiration_steps, spot_steps)
+    add_points(expiration_steps * spot_steps)
+    result = _price_many(spots, values['strike'], values['rate'], values['drift'], time_exp,
+                         carry(type_option, values['dividend']), greeks)
+
+    columns = {
+        'spot': np.broadcast_to(spots, shape),
+        'expiration': np.broadcast_to(expirations[:, np.newaxis], shape),
+    }
+    for side in ('call', 'put'):
+        for greek in greeks:
+            columns[side + '.' + greek] = result[side][greek]
+
+    return respond(columns, shape, lambda: {
+        "spot": spots.tolist(),
+        "expiration": expirations.tolist(),
+        "shape": list(shape),
+        "call": {greek: rounded(result['call'][greek]) for greek in greeks},
+        "put": {greek: rounded(result['put'][greek]) for greek in greeks},
+    })
+
+
+def _calc_curve(type_option, greek):
+    """Compute the variation of one greek over the spot interval of the request"""
+    try:
+        values = GREEK_CURVE.validate(request.get_json(silent=True), type_option=type_option)
+    except ValidationError as error:
+        return _invalid(error)
+
+    if values['method'] == 'pde' and greek not in pde.GREEKS:
+        return _invalid(ValidationError([{'field': 'method', 'message': 'the pde method does not compute ' + greek}]))
+
+    spot_b, spot_e = int(values['spot_b']), int(values['spot_e'])
+    strike, rate, drift = values['strike'], values['rate'], values['drift']
+    time_exp = values['expiration'] / 365
+    dividend = carry(type_option, values['dividend'])
+    grid = _grid(values)
+
+    columns = _cached(('curve', spot_b, spot_e, strike, rate, drift, time_exp, dividend, greek, *grid),
+                      lambda: _curve_values(spot_b, spot_e, strike, rate, drift, time_exp, dividend, (greek,), grid))
+    x = columns['x'].tolist()
+    call, put = columns['call.' + greek], columns['put.' + greek]
+
+    return respond({'x': columns['x'], 'call': call, 'put': put}, call.shape, lambda: {
+        "call": [{'x': i, 'y': y} for i, y in zip(x, rounded(call))],
+        "put": [{'x': i, 'y': y} for i, y in zip(x, rounded(put))],
+    }, lambda: {
+        "x": x,
+        "call": rounded(call),
+        "put": rounded(put),
+    })
+
+
+def _invalid(error):
+    """400 response listing the invalid fields of a ValidationError"""
+    message = jsonify(message='invalid arguments', errors=error.errors)
+    return make_response(message, 400)
+
+
+def _unknown_book():
+    """404 response of a book which does not exist"""
+    message = jsonify(message='unknown book')
+    return make_response(message, 404)
+
+
+def _cached(parts, compute):
+    """Result of compute, looked up first in the result cache of the app when there is one"""
+    cache = current_app.extensions.get('calc_cache')
+    if cache is None:
+        return compute()
+    return cache.get_or_compute(cache.key(*parts), compute)
+
+
+def _pricer():
+    """Pricing function of the option routes: the interpolated tables of the app when enabled, else the kernel"""
+    tables = current_app.extensions.get('calc_tables')
+    return price_options if tables is None else tables.price_options
+
+
+def _price_many(spot, strike, rate, drift, time_exp, dividend, greeks=GREEKS, pricer=price_options):
+    """Price with pricer inline, or with the process pool when the request is large enough"""
+    workers = current_app.config['CALC_PARALLEL_WORKERS']
+    size = np.broadcast(spot, strike, rate, drift, time_exp, dividend).size
+    if workers > 1 and size >= current_app.config['CALC_PARALLEL_THRESHOLD']:
+        return price_parallel(spot, strike, rate, drift, time_exp, dividend, greeks, workers)
+    return pricer(spot, strike, rate, drift, time_exp, dividend, greeks)
+
+
+def _option_values(spot, strike, rate, drift, time_exp, dividend, greeks=GREEKS, steps=None):
+    """Price and greeks of the call and the put, rounded as returned by the routes.
+
+    With steps the options are american and priced on a lattice of steps steps. The coalescer prices the
+    GREEKS of a contract, a request asking for another set is priced alone.
+    """
+    add_points(1)
+    coalescer = current_app.extensions.get('calc_coalescer')
+    if steps is not None:
+        result = price_american(spot, strike, rate, drift, time_exp, dividend, greeks, steps=steps)
+    elif coalescer is None or set(greeks) != set(GREEKS):
+        result = _pricer()(spot, strike, rate, drift, time_exp, dividend, greeks)
+    else:
+        result = coalescer.price(spot, strike, rate, drift, time_exp, dividend)
+    return [dict(name=name, **{greek: round(float(result[side][greek]), precision(greek)) for greek in greeks})
+            for side, name in (('call', 'Call'), ('put', 'Put'))]
+
+
+def _grid(values):
+    """(american, space steps, time steps) of a curve solved by the pde method, empty for the closed form"""
+    if values['method'] != 'pde':
+        return ()
+    return values['exercise'] == 'american', values['space_steps'], values['time_steps']
+
+
+def _curve_values(spot_b, spot_e, strike, rate, drift, time_exp, dividend, greeks, grid=()):
+    """Columns x, call.<greek> and put.<greek> of the greeks over the integer spots of [spot_b, spot_e[.
+
+    With a grid, see `_grid`, the greeks are read from one pde solve instead of the closed form.
+    """
+    spots = np.arange(spot_b, spot_e)
+    add_points(spots.size)
+    if grid:
+        american, space_steps, time_steps = grid
+        result = pde.solve(spots, strike, rate, drift, time_exp, dividend, greeks, american, space_steps, time_steps)
+    else:
+        result = price_options(spots, strike, rate, drift, time_exp, dividend, greeks)
+    columns = {'x': spots}
+    for side in ('call', 'put'):
+        for greek in greeks:
+            columns[side + '.' + greek] = result[side][greek]
+    return columns
+
+
+def _column(values, valid):
+    """Spread values computed on the valid rows back on the whole batch, null elsewhere"""
+    column = np.full(valid.shape, None, dtype=object)
+    column[valid] = np.round(values, 3).tolist()
+    return column.tolist()
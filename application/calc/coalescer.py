@@ -0,0 +1,111 @@
+import os
+import queue
+import time
+from bisect import bisect_left
+from concurrent.futures import Future
+from threading import Lock, Thread
+
+import numpy as np
+
+# Upper bounds of the histogram buckets, the last bucket takes everything above
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+WAIT_BUCKETS_MS = (0.25, 0.5, 1, 2, 5, 10, 25, 50, 100)
+
+
+class Coalescer:
+    """Group single option requests arriving together into one vectorized pricing call.
+
+    Callers of `price` are queued. A background thread takes the first waiting
+    request, keeps collecting others for `window` seconds or until `max_batch`
+    are gathered, prices them all at once with `pricer` and hands every caller
+    its own row. The thread is started on first use in each process, so an app
+    preloaded before forking gets one thread per worker.
+    """
+
+    def __init__(self, pricer, window=0.002, max_batch=256):
+        self.pricer = pricer
+        self.window = window
+        self.max_batch = max_batch
+        self.batches = 0
+        self.requests = 0
+        self.batch_sizes = [0] * (len(BATCH_BUCKETS) + 1)
+        self.waits = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self.wait_sum = 0.0
+        self.wait_max = 0.0
+        self._lock = Lock()
+        self._pid = None
+        self._queue = None
+
+    def price(self, spot, strike, rate, drift, time_exp, dividend):
+        """Price and greeks of one contract, as floats in the layout of `pricing.price_options`"""
+        future = Future()
+        self._ensure_started().put((time.perf_counter(), (spot, strike, rate, drift, time_exp, dividend), future))
+        return future.result()
+
+    def _ensure_started(self):
+        """Queue of the worker thread of this process, starting it when needed"""
+        pid = os.getpid()
+        if self._pid != pid:
+            with self._lock:
+                if self._pid != pid:
+                    self._queue = queue.SimpleQueue()
+                    Thread(target=self._run, args=(self._queue,), name='calc-coalescer', daemon=True).start()
+                    self._pid = pid
+        return self._queue
+
+    def _run(self, requests):
+        """Worker loop: collect a batch then price it"""
+        while True:
+            batch = [requests.get()]
+            deadline = time.perf_counter() + self.window
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(requests.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            self._flush(batch)
+
+    def _flush(self, batch):
+        """Price a batch and resolve the future of every request"""
+        try:
+            result = self.pricer(*np.array([inputs for _, inputs, _ in batch], dtype=float).T)
+        except Exception as error:
+            for _, _, future in batch:
+                future.set_exception(error)
+            return
+
+        now = time.perf_counter()
+        waits = []
+        for index, (arrival, _, future) in enumerate(batch):
+            waits.append((now - arrival) * 1000)
+            future.set_result({side: {greek: float(values[index]) for greek, values in result[side].items()}
+                               for side in ('call', 'put')})
+        self._record(len(batch), waits)
+
+    def _record(self, size, waits):
+        """Account a priced batch in the histograms"""
+        with self._lock:
+            self.batches += 1
+            self.requests += size
+            self.batch_sizes[bisect_left(BATCH_BUCKETS, size)] += 1
+            for wait in waits:
+                self.waits[bisect_left(WAIT_BUCKETS_MS, wait)] += 1
+            self.wait_sum += sum(waits)
+            self.wait_max = max(self.wait_max, max(waits))
+
+    def stats(self):
+        """Settings, batch size histogram and queueing latency histogram in milliseconds"""
+        with self._lock:
+            return {
+                "window": self.window,
+                "max_batch": self.max_batch,
+                "batches": self.batches,
+                "requests": self.requests,
+                "batch_size": dict(zip([str(bound) for bound in BATCH_BUCKETS] + ['+Inf'], self.batch_sizes)),
+                "wait_ms": dict(zip([str(bound) for bound in WAIT_BUCKETS_MS] + ['+Inf'], self.waits)),
+                "wait_ms_mean": self.wait_sum / self.requests if self.requests else 0.0,
+                "wait_ms_max": self.wait_max,
+            }
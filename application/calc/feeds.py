@@ -0,0 +1,155 @@
+"""Spot feeds and the events pushed to the subscribers of a book.
+
+A feed publishes spots to a `SpotBoard` from its own thread. The board only
+keeps the last spot of every underlying and a version counter, so ticks
+arriving faster than a subscriber reads are coalesced: a subscriber waiting
+for a version newer than the one it sent gets the latest spots, whatever the
+number of ticks in between. A subscriber also sends at most one update per
+interval, and every update reprices all the positions of its book in one
+vectorized pass.
+
+Feeds are named in FEEDS or given as 'module:Class', and built with the board
+and the app config. Like the coalescer thread, the feed thread is started on
+first use in each process, so an app preloaded before forking gets one feed
+per worker.
+"""
+import importlib
+import json
+import os
+import time
+from threading import Condition, Event, Lock, Thread
+
+import numpy as np
+
+from .formats import rounded
+
+# Delay before an event stream client reconnects, in milliseconds
+RETRY_MS = 1000
+
+
+class SpotBoard:
+    """Last spot of every underlying, with a version bumped on every publication"""
+
+    def __init__(self):
+        self.version = 0
+        self.spots = {}
+        self._condition = Condition()
+
+    def publish(self, spots):
+        """Update the spots of some underlyings"""
+        with self._condition:
+            self.spots = dict(self.spots, **spots)
+            self.version += 1
+            self._condition.notify_all()
+
+    def wait(self, version, timeout):
+        """(version, spots) once newer than version, or None after timeout seconds"""
+        with self._condition:
+            if not self._condition.wait_for(lambda: self.version > version, timeout):
+                return None
+            return self.version, self.spots
+
+
+class Feed:
+    """Source of spots publishing to a board, `run` is called once in a daemon thread"""
+
+    def __init__(self, board, config):
+        self.board = board
+        self.config = config
+        self.underlyings = set()
+        self.stopped = Event()
+        self._lock = Lock()
+        self._pid = None
+
+    def track(self, underlyings):
+        """Ask the feed for the spots of underlyings, starting it when needed"""
+        self.underlyings.update(underlyings)
+        pid = os.getpid()
+        if self._pid != pid:
+            with self._lock:
+                if self._pid != pid:
+                    Thread(target=self.run, name='calc-feed', daemon=True).start()
+                    self._pid = pid
+
+    def run(self):
+        raise NotImplementedError
+
+    def stop(self):
+        self.stopped.set()
+
+
+class RandomWalkFeed(Feed):
+    """Simulated feed: every tracked spot follows a geometric random walk.
+
+    Spots start at CALC_FEED_SPOT and move every CALC_FEED_INTERVAL seconds by a
+    lognormal step of relative deviation CALC_FEED_STEP, seeded by CALC_FEED_SEED.
+    """
+
+    def run(self):
+        config = self.config
+        generator = np.random.default_rng(config['CALC_FEED_SEED'])
+        step = config['CALC_FEED_STEP']
+        spots = {}
+        while not self.stopped.wait(config['CALC_FEED_INTERVAL']):
+            underlyings = sorted(self.underlyings)
+            if not underlyings:
+                continue
+            moves = np.exp(step * generator.standard_normal(len(underlyings)) - 0.5 * step * step)
+            spots = {underlying: spots.get(underlying, config['CALC_FEED_SPOT']) * move
+                     for underlying, move in zip(underlyings, moves.tolist())}
+            self.board.publish(spots)
+
+
+FEEDS = {
+    'random_walk': RandomWalkFeed,
+}
+
+
+def load_feed(name, board, config):
+    """Feed named in FEEDS or given as 'module:Class'"""
+    if name in FEEDS:
+        return FEEDS[name](board, config)
+    module, _, attribute = name.partition(':')
+    return getattr(importlib.import_module(module), attribute)(board, config)
+
+
+def event(name, data):
+    """Text of a Server-Sent Event"""
+    return 'event: {}\ndata: {}\n\n'.format(name, json.dumps(data))
+
+
+def book_events(book, board, greeks, interval, heartbeat, duration, positions=True):
+    """Server-Sent Events of the values of a book, repriced on the spots of the board.
+
+    An update is sent when every underlying of the book has a spot and the spots
+    changed since the previous update, at most once per interval seconds. A
+    comment is sent after heartbeat seconds without update, and the stream ends
+    after duration seconds, the client reconnecting after RETRY_MS milliseconds.
+    """
+    yield 'retry: {}\n\n'.format(RETRY_MS)
+    start = time.monotonic()
+    version, sent = 0, 0.0
+    while True:
+        now = time.monotonic()
+        if now - start >= duration:
+            return
+        if now < sent + interval:
+            time.sleep(sent + interval - now)
+        tick = board.wait(version, min(heartbeat, max(start + duration - time.monotonic(), 0)))
+        if tick is None:
+            yield ': heartbeat\n\n'
+            continue
+
+        version, spots = tick
+        if not all(underlying in spots for underlying in book.underlyings):
+            continue
+        columns, net = book.reprice([spots[underlying] for underlying in book.underlyings], greeks)
+        data = {
+            'version': version,
+            'spots': {underlying: spots[underlying] for underlying in book.underlyings},
+            'net': {greek: round(value, 3) for greek, value in net.items()},
+        }
+        if positions:
+            data['positions'] = {greek: rounded(column) for greek, column in columns.items()}
+        sent = time.monotonic()
+        yield event('greeks', data)
@@ -0,0 +1,78 @@
+import numpy as np
+from flask import jsonify, make_response, request
+
+from ..metrics import phase
+from .pricing import HIGHER_GREEKS
+
+JSON = 'application/json'
+COLUMNAR = 'application/vnd.getgreeks.columnar+json'
+BINARY = 'application/octet-stream'
+ARROW = 'application/vnd.apache.arrow.stream'
+
+# Formats by order of preference when the Accept header allows several
+FORMATS = (JSON, COLUMNAR, BINARY, ARROW)
+
+
+def respond(columns, shape, default, columnar=None):
+    """Response of the columns in the format asked by the Accept header of the request.
+
+    :param columns: dict name -> array, every array has the given shape
+    :param shape: shape shared by the columns
+    :param default: callable building the historical JSON payload, used for application/json
+    :param columnar: callable building the columnar JSON payload, the default payload when missing
+    """
+    mimetype = request.accept_mimetypes.best_match(FORMATS, default=JSON) if request.accept_mimetypes else JSON
+
+    if mimetype == JSON:
+        return jsonify(default())
+    if mimetype == COLUMNAR:
+        response = jsonify((columnar or default)())
+        response.mimetype = COLUMNAR
+        return response
+    with phase('serialize'):
+        if mimetype == BINARY:
+            return binary_response(columns, shape)
+        return arrow_response(columns, shape)
+
+
+def binary_response(columns, shape):
+    """Columns as consecutive little-endian float64 C-ordered buffers.
+
+    The X-Columns header lists the column names in buffer order and the X-Shape
+    header the shape of each column, so column i is bytes [i * size * 8, (i + 1) * size * 8[.
+    """
+    body = b''.join(np.ascontiguousarray(column, dtype='<f8').tobytes() for column in columns.values())
+    response = make_response(body)
+    response.mimetype = BINARY
+    response.headers['X-Columns'] = ','.join(columns)
+    response.headers['X-Shape'] = ','.join(str(length) for length in shape)
+    return response
+
+
+def arrow_response(columns, shape):
+    """Columns as an Arrow IPC stream of one flat table, the shape is stored in the schema metadata"""
+    try:
+        import pyarrow
+    except ImportError:
+        message = jsonify(message='arrow format unavailable')
+        return make_response(message, 406)
+
+    table = pyarrow.table({name: np.asarray(column, dtype=float).ravel() for name, column in columns.items()})
+    table = table.replace_schema_metadata({'shape': ','.join(str(length) for length in shape)})
+    sink = pyarrow.BufferOutputStream()
+    with pyarrow.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+
+    response = make_response(sink.getvalue().to_pybytes())
+    response.mimetype = ARROW
+    return response
+
+
+def rounded(column, decimals=3):
+    """Column rounded as the JSON formats return it"""
+    return np.round(column, decimals).ravel().tolist()
+
+
+def precision(greek):
+    """Decimals of a greek in the JSON formats, the higher order greeks are orders of magnitude smaller"""
+    return 6 if greek in HIGHER_GREEKS else 3
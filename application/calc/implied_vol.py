@@ -0,0 +1,82 @@
+import numpy as np
+
+from .pricing import price_options
+
+# Search interval of the volatility
+DRIFT_MIN = 1e-6
+DRIFT_MAX = 5.0
+
+CONVERGED = 'converged'
+MAX_ITER = 'max_iter'
+OUT_OF_BOUNDS = 'out_of_bounds'
+
+
+def initial_guess(call_price, spot_q, strike_r, time_exp):
+    """Corrado-Miller rational approximation of the volatility from a call price"""
+    half = call_price - 0.5 * (spot_q - strike_r)
+    root = np.sqrt(np.maximum(half * half - (spot_q - strike_r) ** 2 / np.pi, 0.0))
+    guess = np.sqrt(2 * np.pi) / (spot_q + strike_r) * (half + root) / np.sqrt(time_exp)
+    return np.where(np.isfinite(guess) & (guess > 0), guess, 0.2)
+
+
+def implied_volatility(price, spot, strike, rate, time_exp, dividend, is_call, tol=1e-8, max_iter=100):
+    """Solve the Black-Scholes volatility of every quoted price together.
+
+    Each row runs a Newton iteration on the vega of `price_options`, safeguarded by
+    a bisection bracket: a Newton step leaving the bracket is replaced by its middle.
+    Puts are solved on the equivalent call price given by the put-call parity.
+    A row stops once its volatility is known within `tol`, either because the Newton
+    correction or the bracket width fell below it, the others keep iterating.
+
+    :return: tuple (drift, status, iterations) of arrays in the broadcast shape of the
+        inputs, the drift is nan for prices outside the no-arbitrage bounds
+    """
+    inputs = np.broadcast_arrays(
+        np.asarray(price, dtype=float), np.asarray(spot, dtype=float), np.asarray(strike, dtype=float),
+        np.asarray(rate, dtype=float), np.asarray(time_exp, dtype=float), np.asarray(dividend, dtype=float),
+        np.asarray(is_call, dtype=bool))
+    shape = inputs[0].shape
+    price, spot, strike, rate, time_exp, dividend, is_call = (value.ravel() for value in inputs)
+
+    spot_q = spot * np.exp(-dividend * time_exp)
+    strike_r = strike * np.exp(-rate * time_exp)
+    call_price = np.where(is_call, price, price + spot_q - strike_r)
+
+    drift = np.full(price.shape, np.nan)
+    status = np.full(price.shape, MAX_ITER, dtype=object)
+    iterations = np.zeros(price.shape, dtype=int)
+
+    bounded = (call_price > np.maximum(spot_q - strike_r, 0.0)) & (call_price < spot_q) & (time_exp > 0)
+    status[~bounded] = OUT_OF_BOUNDS
+
+    active = np.flatnonzero(bounded)
+    low = np.full(active.shape, DRIFT_MIN)
+    high = np.full(active.shape, DRIFT_MAX)
+    sigma = np.clip(initial_guess(call_price[active], spot_q[active], strike_r[active], time_exp[active]),
+                    DRIFT_MIN, DRIFT_MAX)
+
+    for _ in range(max_iter):
+        if not active.size:
+            break
+        iterations[active] += 1
+        result = price_options(spot[active], strike[active], rate[active], sigma, time_exp[active],
+                               dividend[active], ('price', 'vega'))['call']
+        diff = result['price'] - call_price[active]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            correction = diff / result['vega']
+
+        high = np.where(diff > 0, sigma, high)
+        low = np.where(diff > 0, low, sigma)
+
+        done = (np.abs(correction) < tol) | (high - low < tol)
+        drift[active] = np.where(np.abs(correction) < tol, sigma - correction, sigma)
+        status[active[done]] = CONVERGED
+
+        step = sigma - correction
+        bisect = ~((step > low) & (step < high))
+        sigma = np.where(bisect, 0.5 * (low + high), step)
+
+        keep = ~done
+        active, low, high, sigma = active[keep], low[keep], high[keep], sigma[keep]
+
+    return drift.reshape(shape), status.reshape(shape), iterations.reshape(shape)
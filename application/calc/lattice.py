@@ -0,0 +1,144 @@
+"""American option pricing on a binomial lattice.
+
+The lattice is the Cox-Ross-Rubinstein tree of the closed form model: over a
+step dt the spot moves up by u = exp(drift sqrt(dt)) or down by 1 / u, with
+the risk neutral probability of the rate and the dividend yield. The backward
+induction works on whole time slices: the values of all the nodes of a step,
+for a chunk of contracts of a batch and both sides, are one array, so a step
+is a few numpy operations and the memory is O(steps) per contract.
+
+Accuracy comes from two classic refinements (binomial Black-Scholes with
+Richardson extrapolation):
+
+- on the last step before the expiry the continuation value of a node is the
+  closed form european price, which removes the odd/even oscillation of the
+  tree,
+- the price on steps and steps / 2 are combined as 2 V(steps) - V(steps / 2).
+
+Delta, gamma and theta are read from the nodes of the first two steps of the
+same induction. Vega and rho have no node estimate; they are central
+differences of contracts bumped in volatility and rate, appended to the batch
+so they still take a single induction.
+"""
+import numpy as np
+
+from .pricing import GREEKS, price_options
+
+EXERCISES = ('european', 'american')
+
+# Default number of steps of the lattice
+STEPS = 200
+
+# Contracts of an induction, their nodes stay in the CPU caches
+CHUNK_CONTRACTS = 256
+
+# Bumps of the volatility and the rate for vega and rho
+VOL_BUMP = 1e-3
+RATE_BUMP = 1e-4
+
+
+def price_american(spot, strike, rate, drift, time_exp, dividend=0.0, greeks=GREEKS, steps=STEPS,
+                   richardson=True):
+    """Price and greeks of american calls and puts, in the layout of `pricing.price_options`.
+
+    Every argument may be a scalar or a numpy array, they are broadcast together
+    and every contract is priced in the same induction.
+    """
+    inputs = np.broadcast_arrays(*(np.asarray(value, dtype=float)
+                                   for value in (spot, strike, rate, drift, time_exp, dividend)))
+    shape = inputs[0].shape
+    spot, strike, rate, drift, time_exp, dividend = (value.ravel() for value in inputs)
+    greeks = [greek for greek in GREEKS if greek in greeks]
+    if spot.size == 0:
+        return price_options(*inputs, greeks=greeks)
+
+    # Bumped contracts for vega and rho, stacked after the contracts
+    bumps = [(0.0, 0.0)]
+    if 'vega' in greeks:
+        bumps += [(VOL_BUMP, 0.0), (-VOL_BUMP, 0.0)]
+    if 'rho' in greeks:
+        bumps += [(0.0, RATE_BUMP), (0.0, -RATE_BUMP)]
+    size = spot.size
+    batch = (np.tile(spot, len(bumps)), np.tile(strike, len(bumps)),
+             np.concatenate([rate + rate_bump for _, rate_bump in bumps]),
+             np.concatenate([drift + vol_bump for vol_bump, _ in bumps]),
+             np.tile(time_exp, len(bumps)), np.tile(dividend, len(bumps)))
+
+    values = np.concatenate([_extrapolated([value[start:start + CHUNK_CONTRACTS] for value in batch], steps,
+                                           richardson)
+                             for start in range(0, batch[0].size, CHUNK_CONTRACTS)], axis=-1)
+
+    result = {}
+    for i, side in enumerate(('call', 'put')):
+        price, delta, gamma, theta = values[:, i]
+        side_values = {'price': price[:size], 'delta': delta[:size], 'gamma': gamma[:size], 'theta': theta[:size]}
+        bumped = 1
+        if 'vega' in greeks:
+            side_values['vega'] = (price[size:2 * size] - price[2 * size:3 * size]) / (2 * VOL_BUMP)
+            bumped = 3
+        if 'rho' in greeks:
+            side_values['rho'] = (price[bumped * size:(bumped + 1) * size]
+                                  - price[(bumped + 1) * size:(bumped + 2) * size]) / (2 * RATE_BUMP)
+        result[side] = {greek: _shaped(side_values[greek], shape) for greek in greeks}
+    return result
+
+
+def induction(spot, strike, rate, drift, time_exp, dividend, steps):
+    """Backward induction of a batch of contracts on a lattice of steps steps.
+
+    Nodes are the first axis of the values, so the nodes of a step are one
+    contiguous block, and the values of a step overwrite the first nodes of the
+    next one: the induction only allocates its three arrays of nodes.
+
+    :return: array (4, 2, contracts) of the price, delta, gamma and theta of the call and the put
+    """
+    dt = time_exp / steps
+    up = np.exp(drift * np.sqrt(dt))
+    probability = (np.exp((rate - dividend) * dt) - 1 / up) / (up - 1 / up)
+    discount = np.exp(-rate * dt)
+    weight_up, weight_down = discount * probability, discount * (1 - probability)
+
+    # Step steps - 1: node i has the spot S u^(2i - steps + 1), its continuation value is the european price
+    spots = spot * up ** (2 * np.arange(steps) - steps + 1)[:, np.newaxis]
+    european = price_options(spots, strike, rate, drift, dt, dividend, ('price',))
+    values = np.stack([np.maximum(european['call']['price'], spots - strike),
+                       np.maximum(european['put']['price'], strike - spots)], axis=1)
+    moved = np.empty_like(values)
+    exercise = np.empty_like(spots)
+
+    slices = {}
+    for step in range(steps - 2, -1, -1):
+        nodes = step + 1
+        np.multiply(values[1:nodes + 1], weight_up, out=moved[:nodes])
+        np.multiply(values[:nodes], weight_down, out=values[:nodes])
+        np.add(values[:nodes], moved[:nodes], out=values[:nodes])
+
+        np.multiply(spots[:nodes], up, out=spots[:nodes])
+        np.subtract(spots[:nodes], strike, out=exercise[:nodes])
+        np.maximum(values[:nodes, 0], exercise[:nodes], out=values[:nodes, 0])
+        np.negative(exercise[:nodes], out=exercise[:nodes])
+        np.maximum(values[:nodes, 1], exercise[:nodes], out=values[:nodes, 1])
+        if step <= 2:
+            slices[step] = (spots[:nodes].copy(), values[:nodes].copy())
+
+    spots_1, values_1 = slices[1]
+    spots_2, values_2 = slices[2]
+    price = values[0]
+    delta = (values_1[1] - values_1[0]) / (spots_1[1] - spots_1[0])
+    gamma = ((values_2[2] - values_2[1]) / (spots_2[2] - spots_2[1])
+             - (values_2[1] - values_2[0]) / (spots_2[1] - spots_2[0])) / (0.5 * (spots_2[2] - spots_2[0]))
+    theta = (values_2[1] - price) / (2 * dt)
+    return np.stack([price, delta, gamma, theta])
+
+
+def _extrapolated(batch, steps, richardson):
+    """Values of the induction on steps, extrapolated with the one on steps / 2"""
+    values = induction(*batch, steps)
+    if richardson:
+        values = 2 * values - induction(*batch, max(steps // 2, 3))
+    return values
+
+
+def _shaped(values, shape):
+    """Values in the shape of the inputs, a float for scalar inputs"""
+    return float(values[0]) if shape == () else values.reshape(shape)
@@ -0,0 +1,157 @@
+"""Monte Carlo pricing of path dependent options.
+
+Paths of the spot follow the geometric brownian motion of the closed form
+model, with the same rate, drift (volatility) and dividend yield, observed on
+`fixings` dates evenly spaced up to the expiry. They are simulated in chunks
+of at most CHUNK_POINTS points, and each chunk only adds a few sums to the
+estimate, so the memory of a pricing does not depend on the number of paths.
+
+Variance reduction:
+
+- antithetic variates: every draw of normals is also used negated, the two
+  paths form one sample,
+- control variate: the discounted payoff of the vanilla option of same strike
+  and side, whose expectation is the closed form price, with the optimal
+  coefficient estimated from the same paths.
+
+Chunk i draws its normals from SeedSequence(seed, spawn_key=(i,)), so a seed
+gives the same price whether the chunks are simulated by one process or split
+across a pool.
+"""
+import math
+
+import numpy as np
+
+from .pricing import price_options
+
+PAYOFFS = ('european', 'asian', 'barrier')
+
+BARRIERS = ('up-and-out', 'up-and-in', 'down-and-out', 'down-and-in')
+
+# Points (paths x fixings) simulated at once
+CHUNK_POINTS = 1000000
+
+# Shift of a discretely monitored barrier pricing the continuously monitored one (Broadie, Glasserman, Kou)
+BARRIER_SHIFT = 0.5826
+
+# Sums of a chunk: count, payoff, payoff^2, control, control^2, payoff x control
+SUMS = 6
+
+
+def chunks(paths, fixings, antithetic):
+    """Number of paths of every chunk, even when the paths are antithetic"""
+    size = max(CHUNK_POINTS // fixings, 2)
+    if antithetic:
+        paths += paths % 2
+        size -= size % 2
+    return [min(size, paths - start) for start in range(0, paths, size)]
+
+
+def simulate_chunk(option, size, seed, index):
+    """Sums of the samples of one chunk of size paths, see SUMS.
+
+    :param option: dict of the contract: spot, strike, rate, drift, time_exp, dividend, is_call, payoff, barrier,
+        barrier_type, continuous, fixings, antithetic
+    """
+    fixings = option['fixings']
+    dt = option['time_exp'] / fixings
+    generator = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(index,)))
+    normals = generator.standard_normal((size // 2 if option['antithetic'] else size, fixings))
+    if option['antithetic']:
+        normals = np.concatenate([normals, -normals])
+
+    # Log spots of the paths at every fixing, computed in place
+    log_paths = normals
+    log_paths *= option['drift'] * math.sqrt(dt)
+    log_paths += (option['rate'] - option['dividend'] - 0.5 * option['drift'] ** 2) * dt
+    np.cumsum(log_paths, axis=1, out=log_paths)
+
+    discount = math.exp(-option['rate'] * option['time_exp'])
+    sign = 1.0 if option['is_call'] else -1.0
+    spot, strike = option['spot'], option['strike']
+    terminal = spot * np.exp(log_paths[:, -1])
+    control = discount * np.maximum(sign * (terminal - strike), 0)
+    payoff = _payoff(option, log_paths, terminal, control, dt)
+
+    if option['antithetic']:
+        half = size // 2
+        payoff = 0.5 * (payoff[:half] + payoff[half:])
+        control = 0.5 * (control[:half] + control[half:])
+    return np.array([payoff.size, payoff.sum(), payoff @ payoff, control.sum(), control @ control, payoff @ control])
+
+
+def _payoff(option, log_paths, terminal, vanilla, dt):
+    """Discounted payoffs of the paths"""
+    kind = option['payoff']
+    if kind == 'european':
+        return vanilla
+    discount = math.exp(-option['rate'] * option['time_exp'])
+    sign = 1.0 if option['is_call'] else -1.0
+    if kind == 'asian':
+        average = option['spot'] * np.exp(log_paths).mean(axis=1)
+        return discount * np.maximum(sign * (average - option['strike']), 0)
+
+    # Barrier: the vanilla payoff when the barrier is hit (in) or never hit (out)
+    up = option['barrier_type'].startswith('up')
+    barrier = option['barrier']
+    if option['continuous']:
+        barrier *= math.exp((-1 if up else 1) * BARRIER_SHIFT * option['drift'] * math.sqrt(dt))
+    level = math.log(barrier / option['spot'])
+    if up:
+        hit = (log_paths.max(axis=1) >= level) | (level <= 0)
+    else:
+        hit = (log_paths.min(axis=1) <= level) | (level >= 0)
+    return np.where(hit == option['barrier_type'].endswith('in'), vanilla, 0.0)
+
+
+def estimate(sums, vanilla, control_variate):
+    """Price and standard error from the total SUMS of the samples"""
+    count, total, squares, controls, control_squares, products = sums
+    mean = total / count
+    variance = max(squares / count - mean * mean, 0.0)
+    if control_variate:
+        control_mean = controls / count
+        control_variance = control_squares / count - control_mean * control_mean
+        if control_variance > 0:
+            covariance = products / count - mean * control_mean
+            beta = covariance / control_variance
+            mean -= beta * (control_mean - vanilla)
+            variance = max(variance - covariance * beta, 0.0)
+    return mean, math.sqrt(variance / max(count - 1, 1))
+
+
+def price_path_dependent(option, paths, seed=None, control_variate=True, executor=None, workers=1):
+    """Monte Carlo price of a contract with its standard error.
+
+    :param option: dict of the contract, see `simulate_chunk`
+    :param seed: seed of the draws, a random one is drawn and returned when None
+    :param executor: concurrent.futures executor simulating the chunks in workers groups, in this process when None
+    :return: dict price, std_error, paths, seed and vanilla, the closed form price of the control variate
+    """
+    if seed is None:
+        seed = int(np.random.SeedSequence().generate_state(1)[0])
+    sizes = chunks(paths, option['fixings'], option['antithetic'])
+    if executor is None:
+        sums = _simulate_chunks(option, sizes, seed, range(len(sizes)))
+    else:
+        groups = np.array_split(np.arange(len(sizes)), min(workers, len(sizes)))
+        futures = [executor.submit(_simulate_chunks, option, [sizes[index] for index in group], seed, group.tolist())
+                   for group in groups]
+        sums = np.concatenate([future.result() for future in futures])
+
+    result = price_options(option['spot'], option['strike'], option['rate'], option['drift'], option['time_exp'],
+                           option['dividend'], ('price',))
+    vanilla = result['call' if option['is_call'] else 'put']['price']
+    price, std_error = estimate(sums.sum(axis=0), vanilla, control_variate)
+    return {
+        'price': price,
+        'std_error': std_error,
+        'paths': int(sum(sizes)),
+        'seed': seed,
+        'vanilla': vanilla,
+    }
+
+
+def _simulate_chunks(option, sizes, seed, indices):
+    """Sums of several chunks, one row per chunk, added up by the caller in chunk order"""
+    return np.array([simulate_chunk(option, size, seed, index) for size, index in zip(sizes, indices)])
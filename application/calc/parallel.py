@@ -0,0 +1,92 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from threading import Lock
+
+import numpy as np
+
+from .pricing import ALL_GREEKS, GREEKS, price_options
+
+SIDES = ('call', 'put')
+
+_pool = None
+_pool_key = None
+_pool_lock = Lock()
+
+
+def get_pool(workers):
+    """Process pool of this process, created on first use.
+
+    Workers are started from a fork server so they never inherit the threads of
+    the web worker (coalescer, server threads).
+    """
+    global _pool, _pool_key
+    with _pool_lock:
+        if _pool_key != (os.getpid(), workers):
+            if _pool is not None and _pool_key[0] == os.getpid():
+                _pool.shutdown(wait=False)
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+            _pool = ProcessPoolExecutor(workers, mp_context=context)
+            _pool_key = (os.getpid(), workers)
+        return _pool
+
+
+def price_parallel(spot, strike, rate, drift, time_exp, dividend=0.0, greeks=GREEKS, workers=None, chunks=None):
+    """Same as `pricing.price_options`, split in chunks priced by a process pool.
+
+    Inputs are broadcast together and copied once into a shared memory block,
+    each worker prices a slice of it and writes its values in a shared output
+    block, so no array is pickled between the processes.
+    """
+    workers = workers or os.cpu_count()
+    greeks = [greek for greek in ALL_GREEKS if greek in greeks]
+    inputs = np.broadcast_arrays(*(np.asarray(value, dtype=float)
+                                   for value in (spot, strike, rate, drift, time_exp, dividend)))
+    shape = inputs[0].shape
+    size = inputs[0].size
+    if size == 0:
+        return price_options(*inputs, greeks=greeks)
+
+    input_block = SharedMemory(create=True, size=len(inputs) * size * 8)
+    output_block = SharedMemory(create=True, size=len(SIDES) * len(greeks) * size * 8)
+    try:
+        shared_inputs = np.ndarray((len(inputs), size), dtype=float, buffer=input_block.buf)
+        for row, value in zip(shared_inputs, inputs):
+            row[:] = value.ravel()
+
+        bounds = np.linspace(0, size, (chunks or workers) + 1).astype(int)
+        futures = [get_pool(workers).submit(_price_chunk, input_block.name, output_block.name, size, greeks,
+                                            start, stop)
+                   for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+        for future in futures:
+            future.result()
+
+        outputs = np.ndarray((len(SIDES), len(greeks), size), dtype=float, buffer=output_block.buf)
+        result = {side: {greek: outputs[i, j].reshape(shape).copy() for j, greek in enumerate(greeks)}
+                  for i, side in enumerate(SIDES)}
+        del shared_inputs, outputs
+    finally:
+        input_block.close()
+        input_block.unlink()
+        output_block.close()
+        output_block.unlink()
+    return result
+
+
+def _price_chunk(input_name, output_name, size, greeks, start, stop):
+    """Price the rows [start, stop[ of the shared input block into the shared output block"""
+    input_block = SharedMemory(name=input_name)
+    output_block = SharedMemory(name=output_name)
+    try:
+        inputs = np.ndarray((6, size), dtype=float, buffer=input_block.buf)
+        outputs = np.ndarray((len(SIDES), len(greeks), size), dtype=float, buffer=output_block.buf)
+        result = price_options(*inputs[:, start:stop], greeks=greeks)
+        for i, side in enumerate(SIDES):
+            for j, greek in enumerate(greeks):
+                outputs[i, j, start:stop] = result[side][greek]
+        del inputs, outputs
+    finally:
+        input_block.close()
+        output_block.close()
@@ -0,0 +1,103 @@
+"""Finite difference pricing of calls and puts on a whole spot axis.
+
+The Black-Scholes-Merton equation in time to expiry tau
+
+    dV/dtau = drift^2 S^2 / 2 d2V/dS2 + (rate - dividend) S dV/dS - rate V
+
+is solved on a uniform grid of space_steps intervals of [0, S_max], S_max
+lying some standard deviations above the spots and the strike, with the
+Crank-Nicolson scheme. Its first steps are fully implicit (Rannacher) so the
+kink of the payoff does not make gamma oscillate. The system of a step is
+tridiagonal and the same at every step: it is factored once by LAPACK
+(gttrf) and every step is one banded solve (gttrs), the call and the put
+being its two right hand sides.
+
+One solve gives the price on every node; delta and gamma are the central
+differences of the nodes, theta follows from the equation, and the four are
+interpolated on the requested spots. An american option is exercised
+by projecting the values on the payoff after every step.
+"""
+import numpy as np
+
+METHODS = ('closed_form', 'pde')
+
+GREEKS = ('price', 'delta', 'theta', 'gamma')
+
+# Default sizes of the grid
+SPACE_STEPS = 400
+TIME_STEPS = 200
+
+# Standard deviations of the spot at expiry above the spots and the strike covered by the grid
+STDEVS = 5
+
+# Fully implicit steps starting the scheme
+RANNACHER_STEPS = 2
+
+
+def solve(spots, strike, rate, drift, time_exp, dividend=0.0, greeks=GREEKS, american=False,
+          space_steps=SPACE_STEPS, time_steps=TIME_STEPS):
+    """Price and greeks of calls and puts on the spots, in the layout of `pricing.price_options`.
+
+    :param greeks: values to return among GREEKS
+    """
+    from scipy.linalg import lapack
+
+    spots = np.asarray(spots, dtype=float)
+    spread = STDEVS * drift * np.sqrt(time_exp) + abs(rate - dividend) * time_exp
+    spot_max = float(spots.max(initial=strike)) * np.exp(spread)
+    grid = np.linspace(0, spot_max, space_steps + 1)
+    dt = time_exp / time_steps
+
+    # Coefficients of V[i - 1], V[i], V[i + 1] in dt times the operator on the interior nodes
+    i = np.arange(1, space_steps)
+    variance = drift * drift * i * i
+    carry = (rate - dividend) * i
+    lower = 0.5 * dt * (variance - carry)
+    diagonal = -dt * (variance + rate)
+    upper = 0.5 * dt * (variance + carry)
+
+    payoff = np.stack([np.maximum(grid - strike, 0), np.maximum(strike - grid, 0)], axis=1)
+    values = payoff.copy()
+    factors = {}
+    for step in range(1, time_steps + 1):
+        theta = 1.0 if step <= RANNACHER_STEPS else 0.5
+        if theta not in factors:
+            factors[theta] = lapack.dgttrf(-theta * lower[1:], 1 - theta * diagonal, -theta * upper[:-1])[:5]
+
+        # Explicit part of the step, then the boundary values of the new step moved to the right hand side
+        tau = step * dt
+        explicit = 1 - theta
+        rhs = values[1:-1] + explicit * (diagonal[:, np.newaxis] * values[1:-1] + lower[:, np.newaxis] * values[:-2]
+                                         + upper[:, np.newaxis] * values[2:])
+        boundary = _boundaries(spot_max, strike, rate, dividend, tau, american)
+        rhs[0] += theta * lower[0] * boundary[0]
+        rhs[-1] += theta * upper[-1] * boundary[1]
+
+        values = np.empty_like(values)
+        values[0], values[-1] = boundary
+        values[1:-1] = lapack.dgttrs(*factors[theta], rhs)[0]
+        if american:
+            np.maximum(values, payoff, out=values)
+
+    step = grid[1]
+    delta = np.gradient(values, step, axis=0)
+    gamma = np.empty_like(values)
+    gamma[1:-1] = (values[2:] - 2 * values[1:-1] + values[:-2]) / (step * step)
+    gamma[0], gamma[-1] = gamma[1], gamma[-2]
+
+    # Theta from the equation itself, null where an american option is exercised
+    spot_axis = grid[:, np.newaxis]
+    theta = rate * values - (rate - dividend) * spot_axis * delta - 0.5 * drift * drift * spot_axis ** 2 * gamma
+    if american:
+        theta[values <= payoff] = 0.0
+    columns = {'price': values, 'delta': delta, 'gamma': gamma, 'theta': theta}
+    return {side: {greek: np.interp(spots, grid, columns[greek][:, index]) for greek in GREEKS if greek in greeks}
+            for index, side in enumerate(('call', 'put'))}
+
+
+def _boundaries(spot_max, strike, rate, dividend, tau, american):
+    """Values of the call and the put on the nodes 0 and S_max at time to expiry tau"""
+    forward = spot_max * np.exp(-dividend * tau) - strike * np.exp(-rate * tau)
+    if american:
+        return np.array([[0.0, strike], [max(forward, spot_max - strike), 0.0]])
+    return np.array([[0.0, strike * np.exp(-rate * tau)], [forward, 0.0]])
@@ -0,0 +1,48 @@
+"""Aggregation of the values of a portfolio of positions.
+
+A position holds a signed quantity of a call or a put. Its values are the
+values of its side times its quantity; they are summed over the whole book and
+by bucket with one `np.bincount` per value, so a breakdown costs one pass over
+the positions whatever its number of buckets.
+"""
+import numpy as np
+
+from .pricing import GREEKS
+
+
+def labels(bounds, unit=''):
+    """Names of the buckets delimited by bounds, the first and last ones are open"""
+    names = ['<{:g}{}'.format(bounds[0], unit)]
+    names += ['{:g}-{:g}{}'.format(low, high, unit) for low, high in zip(bounds[:-1], bounds[1:])]
+    names.append('>={:g}{}'.format(bounds[-1], unit))
+    return names
+
+
+def bucket(values, bounds):
+    """Index of the bucket of every value, bucket i holds [bounds[i - 1], bounds[i]["""
+    return np.searchsorted(bounds, values, side='right')
+
+
+def position_values(result, is_call, quantity, greeks=GREEKS):
+    """Values of the positions from the values of their contracts as returned by `pricing.price_options`"""
+    return {greek: quantity * np.where(is_call, result['call'][greek], result['put'][greek]) for greek in greeks}
+
+
+def aggregate(values, groups):
+    """Net values of the book and their breakdown by group.
+
+    :param values: dict greek -> values of the positions
+    :param groups: dict name -> (group index of every position, names of the groups), a group
+        without position is reported with zero values
+    """
+    breakdowns = {}
+    for name, (index, names) in groups.items():
+        counts = np.bincount(index, minlength=len(names))
+        sums = {greek: np.bincount(index, weights=column, minlength=len(names)) for greek, column in values.items()}
+        breakdowns[name] = [dict({'bucket': label, 'positions': int(counts[i])},
+                                 **{greek: round(float(sums[greek][i]), 3) for greek in values})
+                            for i, label in enumerate(names)]
+    return {
+        'net': {greek: round(float(column.sum()), 3) for greek, column in values.items()},
+        'buckets': breakdowns,
+    }
@@ -0,0 +1,154 @@
+import math
+
+import numpy as np
+
+from . import special
+
+# Number of time units in one year
+TIME_UNITS = {
+    'days': 365,
+    'months': 12,
+    'years': 1,
+}
+
+OPTION_TYPES = ('Vanilla', 'Dividend')
+
+GREEKS = ('price', 'delta', 'theta', 'gamma', 'vega', 'rho')
+
+# Second and third order greeks, only computed when asked for
+HIGHER_GREEKS = ('vanna', 'volga', 'charm', 'speed', 'color', 'zomma')
+
+ALL_GREEKS = GREEKS + HIGHER_GREEKS
+
+
+def year_fraction(expiration, time):
+    """Convert an expiration expressed in `time` unity into a fraction of year"""
+    return np.asarray(expiration, dtype=float) / TIME_UNITS[time]
+
+
+def carry(type_option, dividend):
+    """Dividend yield actually used by the model: only a Dividend option has one.
+
+    type_option and dividend are scalars or the columns of a batch, the yield is
+    a float when both are scalars.
+    """
+    dividend = np.where(np.asarray(type_option) == 'Dividend', np.asarray(dividend, dtype=float), 0.0)
+    return float(dividend) if dividend.ndim == 0 else dividend
+
+
+def price_options(spot, strike, rate, drift, time_exp, dividend=0.0, greeks=GREEKS):
+    """Price and greeks of european calls and puts in one broadcasted pass.
+
+    Every argument may be a scalar or a numpy array, they are broadcast together
+    following numpy rules. A null dividend gives the plain Black-Scholes model,
+    otherwise the Black-Scholes-Merton model with a continuous dividend yield.
+    Only the values listed in `greeks` are computed, the intermediates they share
+    (d1, d2, discounts, CDF and PDF) are evaluated once, and the HIGHER_GREEKS
+    are built from the same ones.
+
+    When every argument is a scalar the computation runs on python floats with
+    the math module, which is much cheaper than numpy for a single contract.
+
+    :return: dict {'call': {greek: value}, 'put': {greek: value}}, values are
+        floats for scalar inputs and arrays otherwise
+    """
+    inputs = (spot, strike, rate, drift, time_exp, dividend)
+    if all(np.ndim(value) == 0 for value in inputs):
+        spot, strike, rate, drift, time_exp, dividend = (float(value) for value in inputs)
+        xp, cdf, pdf = math, special.cdf_scalar, special.pdf_scalar
+    else:
+        spot, strike, rate, drift, time_exp, dividend = (np.asarray(value, dtype=float) for value in inputs)
+        xp, cdf, pdf = np, special.cdf, special.pdf
+    greeks = set(greeks)
+
+    # Intermediates shared by every output
+    sqrt_t = xp.sqrt(time_exp)
+    vol_t = drift * sqrt_t
+    disc_r = xp.exp(-rate * time_exp)
+    disc_q = xp.exp(-dividend * time_exp)
+    strike_r = strike * disc_r
+
+    # D1 and D2
+    d_1 = (xp.log(spot / strike) + (rate - dividend + 0.5 * drift * drift) * time_exp) / vol_t
+    d_2 = d_1 - vol_t
+
+    # CDF
+    n_d_1 = n_d_n_1 = n_d_2 = n_d_n_2 = np_d_1 = None
+    if greeks & {'price', 'delta', 'theta', 'charm'}:
+        n_d_1 = cdf(d_1)
+        n_d_n_1 = cdf(-d_1)
+    if greeks & {'price', 'theta', 'rho'}:
+        n_d_2 = cdf(d_2)
+        n_d_n_2 = cdf(-d_2)
+
+    # PDF
+    if greeks & {'theta', 'gamma', 'vega', *HIGHER_GREEKS}:
+        np_d_1 = pdf(d_1)
+
+    result = assemble_greeks(greeks, spot, rate, drift, time_exp, dividend, sqrt_t, disc_q, strike_r,
+                             n_d_1, n_d_n_1, n_d_2, n_d_n_2, np_d_1)
+    if greeks & set(HIGHER_GREEKS):
+        assemble_higher_greeks(result, greeks, spot, rate, drift, time_exp, dividend, sqrt_t, disc_q,
+                               d_1, d_2, n_d_1, n_d_n_1, np_d_1)
+    return result
+
+
+def assemble_greeks(greeks, spot, rate, drift, time_exp, dividend, sqrt_t, disc_q, strike_r,
+                    n_d_1, n_d_n_1, n_d_2, n_d_n_2, np_d_1):
+    """Build the requested prices and greeks from the normal CDF/PDF terms.
+
+    Only the terms needed by `greeks` have to be given, see `price_options`.
+    """
+    spot_q = spot * disc_q
+    vol_t = drift * sqrt_t
+
+    call, put = {}, {}
+    if 'price' in greeks:
+        call['price'] = spot_q * n_d_1 - strike_r * n_d_2
+        put['price'] = strike_r * n_d_n_2 - spot_q * n_d_n_1
+    if 'delta' in greeks:
+        call['delta'] = disc_q * n_d_1
+        put['delta'] = -disc_q * n_d_n_1
+    if 'theta' in greeks:
+        theta = -spot_q * np_d_1 * drift / (2 * sqrt_t)
+        call['theta'] = theta + dividend * spot_q * n_d_1 - rate * strike_r * n_d_2
+        put['theta'] = theta - dividend * spot_q * n_d_n_1 + rate * strike_r * n_d_n_2
+    if 'gamma' in greeks:
+        call['gamma'] = put['gamma'] = disc_q * np_d_1 / (spot * vol_t)
+    if 'vega' in greeks:
+        call['vega'] = put['vega'] = spot_q * sqrt_t * np_d_1
+    if 'rho' in greeks:
+        call['rho'] = strike_r * time_exp * n_d_2
+        put['rho'] = -strike_r * time_exp * n_d_n_2
+
+    return {'call': call, 'put': put}
+
+
+def assemble_higher_greeks(result, greeks, spot, rate, drift, time_exp, dividend, sqrt_t, disc_q,
+                           d_1, d_2, n_d_1, n_d_n_1, np_d_1):
+    """Add the requested HIGHER_GREEKS to a result of `assemble_greeks`.
+
+    Charm and color are the calendar time derivatives of delta and gamma, with
+    the sign convention of theta. n_d_1 and n_d_n_1 are only needed by charm.
+    """
+    call, put = result['call'], result['put']
+    vol_t = drift * sqrt_t
+    phi_q = disc_q * np_d_1
+    gamma = phi_q / (spot * vol_t)
+    # Derivative of d1 with respect to the time to expiry, shared by charm and color
+    d_1_t = (2 * (rate - dividend) * time_exp - d_2 * vol_t) / (2 * time_exp * vol_t)
+
+    if 'vanna' in greeks:
+        call['vanna'] = put['vanna'] = -phi_q * d_2 / drift
+    if 'volga' in greeks:
+        call['volga'] = put['volga'] = spot * phi_q * sqrt_t * d_1 * d_2 / drift
+    if 'charm' in greeks:
+        call['charm'] = dividend * disc_q * n_d_1 - phi_q * d_1_t
+        put['charm'] = -dividend * disc_q * n_d_n_1 - phi_q * d_1_t
+    if 'speed' in greeks:
+        call['speed'] = put['speed'] = -gamma / spot * (d_1 / vol_t + 1)
+    if 'color' in greeks:
+        call['color'] = put['color'] = phi_q / (2 * spot * time_exp * vol_t) \
+            * (2 * dividend * time_exp + 1 + 2 * time_exp * d_1_t * d_1)
+    if 'zomma' in greeks:
+        call['zomma'] = put['zomma'] = gamma * (d_1 * d_2 - 1) / drift
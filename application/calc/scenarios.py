@@ -0,0 +1,59 @@
+"""Revaluation of a book of positions under a grid of spot and volatility shocks.
+
+A scenario shifts the spot of every position by a relative shock and its
+volatility by an absolute shock. The profit and loss of a scenario is the
+value of the book under the shocks minus its current value, either:
+
+- fully revalued: the book is priced once for every cell of the grid, in one
+  broadcasted kernel call per chunk of positions,
+- approximated at second order in spot and first order in volatility from the
+  greeks of the book, so the grid only costs a few array operations:
+  P&L = cash delta * ds + cash gamma * ds^2 / 2 + vega * dv.
+"""
+import numpy as np
+
+from .portfolio import position_values
+from .pricing import price_options
+
+METHODS = ('full', 'taylor')
+
+# Points priced at once by a full revaluation, positions are split in chunks so their grid fits
+CHUNK_POINTS = 1000000
+
+# Smallest volatility of a shocked position
+VOL_FLOOR = 1e-4
+
+
+def full_revaluation(inputs, is_call, quantity, spot_shocks, vol_shocks, pricer=price_options):
+    """P&L of the book for every (vol shock, spot shock) cell, by repricing it under each of them.
+
+    :param inputs: (spot, strike, rate, drift, time_exp, dividend) arrays of the positions
+    :return: array of shape (len(vol_shocks), len(spot_shocks))
+    """
+    spot, strike, rate, drift, time_exp, dividend = (np.broadcast_to(value, is_call.shape) for value in inputs)
+    base = position_values(pricer(spot, strike, rate, drift, time_exp, dividend, ('price',)), is_call, quantity,
+                           ('price',))['price'].sum()
+
+    spot_factors = (1 + spot_shocks)[np.newaxis, :, np.newaxis]
+    vol_shifts = vol_shocks[:, np.newaxis, np.newaxis]
+    step = max(CHUNK_POINTS // (spot_shocks.size * vol_shocks.size), 1)
+    values = np.zeros((vol_shocks.size, spot_shocks.size))
+    for start in range(0, is_call.size, step):
+        chunk = slice(start, start + step)
+        result = pricer(spot[chunk] * spot_factors, strike[chunk], rate[chunk],
+                        np.maximum(drift[chunk] + vol_shifts, VOL_FLOOR), time_exp[chunk], dividend[chunk],
+                        ('price',))
+        values += position_values(result, is_call[chunk], quantity[chunk], ('price',))['price'].sum(axis=-1)
+    return values - base
+
+
+def taylor_revaluation(inputs, is_call, quantity, spot_shocks, vol_shocks, pricer=price_options):
+    """P&L of the book for every (vol shock, spot shock) cell, from its delta, gamma and vega"""
+    spot = inputs[0]
+    values = position_values(pricer(*inputs, ('delta', 'gamma', 'vega')), is_call, quantity,
+                             ('delta', 'gamma', 'vega'))
+    cash_delta = (values['delta'] * spot).sum()
+    cash_gamma = (values['gamma'] * spot ** 2).sum()
+    vega = values['vega'].sum()
+    return (cash_delta * spot_shocks + 0.5 * cash_gamma * spot_shocks ** 2)[np.newaxis, :] \
+        + vega * vol_shocks[:, np.newaxis]
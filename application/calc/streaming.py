@@ -0,0 +1,141 @@
+"""Pricing of a book of positions streamed in and out.
+
+Positions are read incrementally from the request body, as NDJSON (one JSON
+object per line) or CSV (a header line then one position per line). They are
+priced by chunks of a fixed number of rows and the values of each chunk are
+written out before the next one is read, so the memory used by a request
+depends on the chunk size and not on the size of the book.
+"""
+import csv
+import itertools
+import json
+
+import numpy as np
+
+from .validation import CONTRACT, REQUIRED, contract_inputs
+
+NDJSON = 'application/x-ndjson'
+CSV = 'text/csv'
+
+FORMATS = (NDJSON, CSV)
+
+
+def read_positions(stream, mimetype, chunk_size):
+    """Chunks of at most chunk_size positions read from a binary stream.
+
+    A position is a dict, or None for an NDJSON line which is not a JSON object
+    and for a line which is not UTF-8.
+    """
+    invalid = set()
+    text = _lines(stream, invalid)
+    if mimetype == CSV:
+        rows = _csv_positions(text, invalid)
+    else:
+        rows = (None if number in invalid else _decode(line) for number, line in enumerate(text, 1) if line.strip())
+    while True:
+        chunk = list(itertools.islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _lines(stream, invalid, block_size=65536):
+    """Decoded lines of a binary stream read by blocks.
+
+    A line which is not UTF-8 is decoded with replacement characters and its
+    number, counted from 1, is added to the set invalid.
+
+    Only `read` is used: a chunked request body is a bare file-like object, and
+    reading a werkzeug stream line by line costs one call per byte.
+    """
+    number = 0
+    pending = b''
+    while True:
+        block = stream.read(block_size)
+        if not block:
+            break
+        lines = (pending + block).split(b'\n')
+        pending = lines.pop()
+        for line in lines:
+            number += 1
+            yield _text(line, number, invalid) + '\n'
+    if pending:
+        yield _text(pending, number + 1, invalid)
+
+
+def _text(line, number, invalid):
+    """Text of a line, added to invalid when it is not UTF-8"""
+    try:
+        return line.decode('utf-8')
+    except UnicodeDecodeError:
+        invalid.add(number)
+        return line.decode('utf-8', 'replace')
+
+
+def _csv_positions(lines, invalid):
+    """Positions of CSV lines, None for a row spanning an invalid line"""
+    reader = csv.DictReader(lines)
+    last = 0
+    for row in reader:
+        if any(number in invalid for number in range(last + 1, reader.line_num + 1)):
+            yield None
+        else:
+            yield _position(row)
+        last = reader.line_num
+
+
+def _position(row):
+    """Position of a CSV row: numbers are parsed, an empty or missing cell of an optional field takes its default"""
+    for name, field in CONTRACT.fields:
+        if field.default is not REQUIRED and row.get(name) in ('', None):
+            row[name] = field.default
+        elif field.kind == 'number' and isinstance(row.get(name), str):
+            try:
+                row[name] = float(row[name])
+            except ValueError:
+                pass
+    return row
+
+
+def _decode(line):
+    """Position of an NDJSON line"""
+    try:
+        position = json.loads(line)
+    except ValueError:
+        return None
+    return position if isinstance(position, dict) else None
+
+
+def price_positions(positions, greeks, pricer):
+    """Mask of the valid positions, their values by side and greek, and the errors of the others"""
+    columns, valid, errors = CONTRACT.validate_rows(positions)
+    for error in errors:
+        if positions[error['index']] is None:
+            error['message'] = 'invalid line'
+
+    result = pricer(*contract_inputs(columns, valid), greeks)
+    return valid, result, errors
+
+
+def stream_values(chunks, greeks, pricer, mimetype):
+    """Text of the values of every position, one chunk at a time, in the given output format"""
+    names = ['{}.{}'.format(side, greek) for side in ('call', 'put') for greek in greeks]
+    if mimetype == CSV:
+        yield ','.join(['index'] + names + ['error']) + '\n'
+        row = '{},' + ','.join(['{!r}'] * len(names)) + ',\n'
+        error = '{}' + ',' * len(names) + ',{}\n'
+    else:
+        row = '{{"index": {}, ' + ', '.join('"' + name + '": {!r}' for name in names) + '}}\n'
+        error = '{{"index": {}, "error": "{}"}}\n'
+
+    offset = 0
+    for positions in chunks:
+        valid, result, errors = price_positions(positions, greeks, pricer)
+        values = np.round(np.array([result[side][greek] for side in ('call', 'put') for greek in greeks]), 3)
+        lines = [''] * len(positions)
+        for index, line in zip(np.flatnonzero(valid).tolist(), values.T.tolist()):
+            lines[index] = row.format(offset + index, *line)
+        for failure in errors:
+            lines[failure['index']] = error.format(offset + failure['index'], failure['message'])
+        yield ''.join(lines)
+        offset += len(positions)
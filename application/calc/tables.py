@@ -0,0 +1,135 @@
+"""Precomputed greek tables answering option queries by interpolation.
+
+With the forward moneyness k = log(K / F), F = S exp((r - q) T), and v = drift sqrt(T),
+d1 = -z + v / 2 and d2 = -z - v / 2 only depend on the standardized moneyness
+z = k / v and on v. The carry is absorbed by the forward, so three 2-D tables over
+(z, v) of N(d1), N(d2) and phi(d1) are enough to rebuild every price and greek.
+
+Tables are bilinear interpolated on a uniform grid. Every tabulated function f
+has |f_zz| and 4 |f_vv| bounded by max |phi''| = phi(0), so the interpolation error
+on each normal term is at most (hz^2 + hv^2 / 4) / 8 * phi(0), see `error_bound`.
+A price is then accurate within (S exp(-qT) + K exp(-rT)) * error_bound.
+Contracts outside the table domain are priced with the exact kernel.
+"""
+import os
+
+import numpy as np
+
+from . import special
+from .pricing import GREEKS, HIGHER_GREEKS, assemble_greeks, assemble_higher_greeks, price_options
+
+# Domain of the tables
+Z_MIN, Z_MAX = -6.0, 6.0
+V_MIN, V_MAX = 0.005, 3.0
+
+
+class GreekTables:
+    """Tables of N(d1), N(d2) and phi(d1) over standardized moneyness and drift sqrt(T)"""
+
+    def __init__(self, values):
+        self.values = values
+        self._flat = [table.ravel() for table in values]
+        self.steps_z, self.steps_v = values.shape[1:]
+        self.h_z = (Z_MAX - Z_MIN) / (self.steps_z - 1)
+        self.h_v = (V_MAX - V_MIN) / (self.steps_v - 1)
+        self.error_bound = (self.h_z ** 2 + self.h_v ** 2 / 4) / 8 * special.INV_SQRT_2PI
+
+    @classmethod
+    def build(cls, steps_z=1201, steps_v=600):
+        """Compute the tables on a grid of steps_z x steps_v points"""
+        z = np.linspace(Z_MIN, Z_MAX, steps_z)[:, np.newaxis]
+        v = np.linspace(V_MIN, V_MAX, steps_v)[np.newaxis, :]
+        d_1 = -z + 0.5 * v
+        return cls(np.stack([special.cdf(d_1), special.cdf(d_1 - v), special.pdf(d_1)]))
+
+    @classmethod
+    def load(cls, path):
+        """Memory-map tables saved by `save`, the pages are shared by every process mapping the file"""
+        return cls(np.load(path, mmap_mode='r'))
+
+    @classmethod
+    def from_file(cls, path, steps_z=1201, steps_v=600):
+        """Load the tables of path, building and saving them first if the file does not exist"""
+        if not os.path.exists(path):
+            cls.build(steps_z, steps_v).save(path)
+        return cls.load(path)
+
+    def save(self, path):
+        """Write the tables as a .npy file of shape (3, steps_z, steps_v): N(d1), N(d2) and phi(d1)"""
+        np.save(path, np.ascontiguousarray(self.values))
+
+    def price_options(self, spot, strike, rate, drift, time_exp, dividend=0.0, greeks=GREEKS):
+        """Same as `pricing.price_options` answered from the tables, exact outside their domain"""
+        spot, strike, rate, drift, time_exp, dividend = np.broadcast_arrays(
+            *(np.asarray(value, dtype=float) for value in (spot, strike, rate, drift, time_exp, dividend)))
+        greeks = set(greeks)
+
+        sqrt_t = np.sqrt(time_exp)
+        vol_t = drift * sqrt_t
+        disc_q = np.exp(-dividend * time_exp)
+        strike_r = strike * np.exp(-rate * time_exp)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z = (np.log(strike / spot) - (rate - dividend) * time_exp) / vol_t
+
+        inside = (z >= Z_MIN) & (z <= Z_MAX) & (vol_t >= V_MIN) & (vol_t <= V_MAX)
+        n_d_1, n_d_2, np_d_1 = self.interpolate(np.where(inside, z, Z_MIN), np.where(inside, vol_t, V_MIN))
+
+        result = assemble_greeks(greeks, spot, rate, drift, time_exp, dividend, sqrt_t, disc_q, strike_r,
+                                 n_d_1, 1.0 - n_d_1, n_d_2, 1.0 - n_d_2, np_d_1)
+        if greeks & set(HIGHER_GREEKS):
+            d_1 = 0.5 * vol_t - z
+            with np.errstate(divide='ignore', invalid='ignore'):
+                assemble_higher_greeks(result, greeks, spot, rate, drift, time_exp, dividend, sqrt_t, disc_q,
+                                       d_1, d_1 - vol_t, n_d_1, 1.0 - n_d_1, np_d_1)
+
+        outside = ~inside
+        if outside.any():
+            exact = price_options(spot[outside], strike[outside], rate[outside], drift[outside], time_exp[outside],
+                                  dividend[outside], greeks)
+            for side in ('call', 'put'):
+                for greek in greeks:
+                    result[side][greek] = np.array(result[side][greek])
+                    result[side][greek][outside] = exact[side][greek]
+        return result
+
+    def interpolate(self, z, v):
+        """Bilinear interpolation of the three tables at (z, v), which must lie in the domain"""
+        f_z = (z - Z_MIN) / self.h_z
+        f_v = (v - V_MIN) / self.h_v
+        i_z = np.minimum(f_z.astype(np.intp), self.steps_z - 2)
+        i_v = np.minimum(f_v.astype(np.intp), self.steps_v - 2)
+        t_z = f_z - i_z
+        t_v = f_v - i_v
+
+        # Flat indices of the four corners of every cell, 1-D takes are the cheapest gathers
+        corner = i_z * self.steps_v + i_v
+        corners = (corner, corner + self.steps_v, corner + 1, corner + self.steps_v + 1)
+        result = []
+        for table in self._flat:
+            low_v, low_v_z, high_v, high_v_z = (table.take(index) for index in corners)
+            low = low_v + t_z * (low_v_z - low_v)
+            high = high_v + t_z * (high_v_z - high_v)
+            result.append(low + t_v * (high - low))
+        return result
+
+    def describe(self):
+        """Grid and accuracy of the tables"""
+        return {
+            "steps_z": self.steps_z,
+            "steps_v": self.steps_v,
+            "z": [Z_MIN, Z_MAX],
+            "v": [V_MIN, V_MAX],
+            "error_bound": self.error_bound,
+            "nbytes": self.values.nbytes,
+            "mmap": isinstance(self.values, np.memmap),
+        }
+
+
+def max_error_check(tables, samples=100000, seed=0):
+    """Largest error of the interpolated normal terms on random points of the domain"""
+    generator = np.random.default_rng(seed)
+    z = generator.uniform(Z_MIN, Z_MAX, samples)
+    v = generator.uniform(V_MIN, V_MAX, samples)
+    d_1 = -z + 0.5 * v
+    exact = np.stack([special.cdf(d_1), special.cdf(d_1 - v), special.pdf(d_1)])
+    return float(np.max(np.abs(np.stack(tables.interpolate(z, v)) - exact)))
@@ -0,0 +1,494 @@
+"""Validation of the calc payloads, one schema per route.
+
+The schemas are built once at import. A single payload is checked field by
+field with plain python, a batch is checked column by column with numpy so the
+bad rows of a large upload are found with a few array comparisons and never
+reach the kernel.
+"""
+import math
+
+import numpy as np
+
+from . import pde
+from .lattice import EXERCISES, STEPS
+from .montecarlo import BARRIERS, PAYOFFS
+from .pricing import ALL_GREEKS, GREEKS, OPTION_TYPES, TIME_UNITS, carry
+from .scenarios import METHODS
+
+# Largest number of points priced by one curve or surface request
+MAX_POINTS = 1000000
+
+# Largest number of nodes (contracts x steps^2) of the lattices of a batch of american contracts
+MAX_LATTICE_NODES = 400000000
+
+# Largest number of cells of a scenario grid
+MAX_SCENARIOS = 10000
+
+# Largest number of points (paths x fixings) of a Monte Carlo pricing
+MAX_PATH_POINTS = 200000000
+
+REQUIRED = object()
+
+
+class ValidationError(ValueError):
+    """Invalid payload, `errors` holds one dict per invalid field"""
+
+    def __init__(self, errors):
+        super().__init__('invalid arguments')
+        self.errors = errors
+
+
+class Field:
+    """Constraint of one field of a payload.
+
+    :param kind: 'number', 'integer', 'string', 'strings' (array of strings), 'numbers' (number or array of
+        numbers), 'boolean', 'booleans' (boolean or array of booleans) or 'mapping' (object of numbers)
+    :param minimum: smallest accepted value, itself excluded when exclusive is true
+    :param maximum: largest accepted value
+    :param enum: accepted values of a string or of the items of strings
+    :param default: value of a missing field, the field is required without it
+    """
+
+    def __init__(self, kind='number', minimum=None, maximum=None, exclusive=False, enum=None, default=REQUIRED):
+        self.kind = kind
+        self.minimum = minimum
+        self.maximum = maximum
+        self.exclusive = exclusive
+        self.enum = enum
+        self.default = default
+        self.message = self._describe()
+
+    def _describe(self):
+        """Message of a value breaking the constraint"""
+        if self.enum is not None:
+            return 'must be one of {}'.format(', '.join(self.enum))
+        if self.kind == 'string':
+            return 'must be a string'
+        if self.minimum is not None and self.maximum is not None:
+            if self.exclusive:
+                return 'must be greater than {} and at most {}'.format(self.minimum, self.maximum)
+            return 'must be between {} and {}'.format(self.minimum, self.maximum)
+        if self.minimum is not None:
+            return 'must be {} {}'.format('greater than' if self.exclusive else 'at least', self.minimum)
+        if self.maximum is not None:
+            return 'must be at most {}'.format(self.maximum)
+        return 'must be a finite number'
+
+    def in_bounds(self, value):
+        """Whether a python float satisfies the bounds"""
+        if not math.isfinite(value):
+            return False
+        if self.minimum is not None and (value <= self.minimum if self.exclusive else value < self.minimum):
+            return False
+        return self.maximum is None or value <= self.maximum
+
+    def in_bounds_column(self, values):
+        """Mask of the values of an array satisfying the bounds"""
+        valid = np.isfinite(values)
+        if self.minimum is not None:
+            valid &= values > self.minimum if self.exclusive else values >= self.minimum
+        if self.maximum is not None:
+            valid &= values <= self.maximum
+        return valid
+
+    def convert(self, value):
+        """Value of the field, raise ValueError(message[, indices]) when invalid"""
+        if self.kind in ('number', 'integer'):
+            if not _is_number(value):
+                raise ValueError('must be a number')
+            number = float(value)
+            if not self.in_bounds(number):
+                raise ValueError(self.message)
+            if self.kind == 'integer':
+                if number != int(number):
+                    raise ValueError('must be an integer')
+                return int(number)
+            return number
+        if self.kind == 'string':
+            if not isinstance(value, str) or (self.enum is not None and value not in self.enum):
+                raise ValueError(self.message)
+            return value
+        if self.kind == 'strings':
+            if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+                raise ValueError('must be an array of strings')
+            if not set(value) <= set(self.enum):
+                raise ValueError(self.message)
+            return value
+        if self.kind == 'mapping':
+            if not isinstance(value, dict):
+                raise ValueError('must be an object of numbers')
+            numbers = {}
+            for name, number in value.items():
+                if not _is_number(number):
+                    raise ValueError('must be an object of numbers')
+                numbers[name] = float(number)
+                if not self.in_bounds(numbers[name]):
+                    raise ValueError(self.message)
+            return numbers
+        if self.kind == 'boolean':
+            if not isinstance(value, bool):
+                raise ValueError('must be a boolean')
+            return value
+        if self.kind == 'booleans':
+            array = np.asarray(value)
+            if array.ndim > 1 or array.size and array.dtype != bool:
+                raise ValueError('must be a boolean or an array of booleans')
+            return array.astype(bool)
+        if not (_is_number(value) or isinstance(value, list) and _are_numbers(value)):
+            raise ValueError('must be a number or an array of numbers')
+        array = np.asarray(value, dtype=float)
+        invalid = ~self.in_bounds_column(array)
+        if invalid.any():
+            raise ValueError(self.message, np.flatnonzero(invalid).tolist())
+        return array
+
+    def column(self, raw, size):
+        """Column of a batch and the mask of its invalid rows, raw is a list or a value shared by every row"""
+        if self.kind in ('string', 'booleans'):
+            column = np.empty(size, dtype=object)
+            column[:] = raw if isinstance(raw, list) else [raw] * size
+            if self.kind == 'booleans':
+                true = np.equal(column, True)
+                return true, ~(true | np.equal(column, False))
+            if self.enum is None:
+                return column, ~np.fromiter((isinstance(value, str) for value in column), dtype=bool, count=size)
+            valid = np.zeros(size, dtype=bool)
+            for value in self.enum:
+                valid |= column == value
+            return column, ~valid
+        if isinstance(raw, list) and _are_numbers(raw):
+            column = np.array(raw, dtype=float)
+        else:
+            column = np.array([_to_float(value) for value in raw] if isinstance(raw, list) else _to_float(raw))
+        column = np.broadcast_to(column, (size,))
+        return column, ~self.in_bounds_column(column)
+
+
+class Schema:
+    """Fields of a payload, in the order their errors are reported, and checks across fields.
+
+    :param fields: dict name -> Field
+    :param checks: (function of the values, field, message) triples applied once every field is valid
+    :param row_checks: (function of the columns giving the mask of the valid rows, field) pairs of a batch, a
+        failing row is reported as an invalid field
+    """
+
+    def __init__(self, fields, checks=(), row_checks=()):
+        self.fields = tuple(fields.items())
+        self.checks = tuple(checks)
+        self.row_checks = tuple(row_checks)
+
+    def validate(self, payload, **extra):
+        """Values of the fields of a JSON object, raise ValidationError listing every invalid field.
+
+        :param extra: fields taken from the url rather than the body, such as type_option
+        """
+        if not isinstance(payload, dict):
+            raise ValidationError([{'field': None, 'message': 'body must be a JSON object'}])
+        payload = dict(payload, **extra) if extra else payload
+
+        values = {}
+        errors = []
+        for name, field in self.fields:
+            if name not in payload:
+                if field.default is REQUIRED:
+                    errors.append({'field': name, 'message': 'missing'})
+                else:
+                    values[name] = field.default
+                continue
+            try:
+                values[name] = field.convert(payload[name])
+            except ValueError as error:
+                errors.append({'field': name, 'message': error.args[0]})
+                if len(error.args) > 1:
+                    errors[-1]['index'] = error.args[1]
+
+        if not errors:
+            errors = [{'field': name, 'message': message} for check, name, message in self.checks
+                      if not check(values)]
+        if errors:
+            raise ValidationError(errors)
+        return values
+
+    def validate_rows(self, rows, field='contracts'):
+        """Columns of a batch, mask of its valid rows and the first error of every invalid row.
+
+        Rows are either a list of JSON objects or a JSON object of columns, each
+        column being a list of values or a value shared by every row. Errors are
+        dicts {index, message} where the message is 'missing <field>' or
+        'invalid <field>'. A malformed batch raises ValidationError, reported on field.
+        """
+        if isinstance(rows, list):
+            size = len(rows)
+            raw, missing = self._split_rows(rows)
+        elif isinstance(rows, dict):
+            size, raw = self._columns(rows, field)
+            missing = {}
+        else:
+            raise ValidationError([{'field': field, 'message': 'must be an array of objects or an object of arrays'}])
+
+        # Code of the first error of every row: 2 * field index, plus 1 when the field is invalid, size when none
+        codes = np.full(size, 2 * len(self.fields))
+        columns = {}
+        for index in reversed(range(len(self.fields))):
+            name, field = self.fields[index]
+            column, invalid = field.column(raw[name], size)
+            columns[name] = column
+            codes[invalid] = 2 * index + 1
+            if name in missing:
+                codes[missing[name]] = 2 * index
+        names = [name for name, _ in self.fields]
+        for check, name in self.row_checks:
+            failed = ~check(columns)
+            codes[failed] = np.minimum(codes[failed], 2 * names.index(name) + 1)
+
+        messages = [template.format(name) for name, _ in self.fields for template in ('missing {}', 'invalid {}')]
+        rejected = np.flatnonzero(codes < 2 * len(self.fields))
+        errors = [{'index': int(index), 'message': messages[code]} for index, code in zip(rejected, codes[rejected])]
+        return columns, codes == 2 * len(self.fields), errors
+
+    def _split_rows(self, rows):
+        """Raw columns of a list of objects and the masks of their missing values"""
+        objects = [row if isinstance(row, dict) else {} for row in rows]
+        raw = {}
+        missing = {}
+        for name, field in self.fields:
+            default = None if field.default is REQUIRED else field.default
+            raw[name] = [row.get(name, default) for row in objects]
+            if field.default is REQUIRED:
+                missing[name] = np.fromiter((name not in row for row in objects), dtype=bool, count=len(objects))
+        return raw, missing
+
+    def _columns(self, columns, field):
+        """Size and raw columns of an object of columns"""
+        sizes = {len(value) for value in columns.values() if isinstance(value, list)}
+        if len(sizes) != 1:
+            raise ValidationError([{'field': field, 'message': 'columns must be arrays of the same length'}])
+
+        raw = {}
+        errors = []
+        for name, constraint in self.fields:
+            if name in columns:
+                raw[name] = columns[name]
+            elif constraint.default is REQUIRED:
+                errors.append({'field': name, 'message': 'missing'})
+            else:
+                raw[name] = constraint.default
+        if errors:
+            raise ValidationError(errors)
+        return sizes.pop(), raw
+
+
+def _is_number(value):
+    """Whether a JSON value is a number, booleans and numeric strings are not"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _are_numbers(values):
+    """Whether every item of a list is a number"""
+    return set(map(type, values)) <= {int, float}
+
+
+def _to_float(value):
+    """Float of a JSON value, NaN when it is not a number"""
+    return float(value) if _is_number(value) else math.nan
+
+
+def contract_inputs(columns, valid):
+    """Kernel inputs (spot, strike, rate, drift, time_exp, dividend) of the valid rows of CONTRACT columns"""
+    return (columns['spot'][valid], columns['strike'][valid], columns['rate'][valid], columns['drift'][valid],
+            *time_and_carry(columns, valid))
+
+
+def time_and_carry(columns, valid):
+    """Fraction of year to expiry and dividend yield used by the model of the valid rows of columns"""
+    years = np.select([columns['time'][valid] == time for time in TIME_UNITS], list(TIME_UNITS.values()))
+    return columns['expiration'][valid] / years, carry(columns['type_option'][valid], columns['dividend'][valid])
+
+
+def _broadcastable(*names):
+    """Check of the values of names having compatible shapes"""
+    def check(values):
+        try:
+            np.broadcast_shapes(*(np.shape(values[name]) for name in names))
+        except ValueError:
+            return False
+        return True
+    return check
+
+
+def _increasing(name):
+    """Check of the value of name being a non empty increasing array"""
+    def check(values):
+        bounds = np.asarray(values[name])
+        return bounds.ndim == 1 and bounds.size > 0 and bool(np.all(np.diff(bounds) > 0))
+    return check
+
+
+# Constraints shared by the schemas
+TYPE_OPTION = Field('string', enum=OPTION_TYPES)
+TIME = Field('string', enum=tuple(TIME_UNITS))
+SPOT = Field(minimum=0, exclusive=True)
+STRIKE = Field(minimum=0, exclusive=True)
+RATE = Field(minimum=-1, maximum=1)
+DRIFT = Field(minimum=0, maximum=5, exclusive=True)
+EXPIRATION = Field(minimum=0, exclusive=True)
+# The bounds of the dividend yield only apply to Dividend options, the Vanilla ones ignore it
+DIVIDEND = Field(default=0.0)
+DIVIDEND_YIELD = Field(minimum=0, maximum=1)
+CURVE_SPOT = Field(minimum=1)
+
+
+def _dividend_in_bounds(values):
+    """Mask of the dividends within DIVIDEND_YIELD or ignored by a Vanilla option, values may be columns"""
+    dividend = np.asarray(values['dividend'], dtype=float)
+    return (np.asarray(values['type_option']) != 'Dividend') | DIVIDEND_YIELD.in_bounds_column(dividend)
+
+
+DIVIDEND_CHECK = (lambda values: bool(np.all(_dividend_in_bounds(values))), 'dividend', DIVIDEND_YIELD.message)
+
+OPTION_FIELDS = {
+    'type_option': TYPE_OPTION,
+    'spot': SPOT,
+    'strike': STRIKE,
+    'rate': RATE,
+    'drift': DRIFT,
+    'expiration': EXPIRATION,
+    'time': TIME,
+    'dividend': DIVIDEND,
+}
+
+# Exercise of the contracts and steps of the lattice pricing the american ones
+EXERCISE_FIELDS = {
+    'exercise': Field('string', enum=EXERCISES, default='european'),
+    'steps': Field('integer', minimum=10, maximum=5000, default=STEPS),
+}
+
+OPTION = Schema(dict(OPTION_FIELDS, greeks=Field('strings', enum=ALL_GREEKS, default=list(GREEKS)),
+                     **EXERCISE_FIELDS), [
+    DIVIDEND_CHECK,
+    (lambda values: values['exercise'] == 'european' or set(values['greeks']) <= set(GREEKS), 'greeks',
+     'an american option computes {}'.format(', '.join(GREEKS)))])
+
+CURVE_FIELDS = {
+    'type_option': TYPE_OPTION,
+    'spot_b': CURVE_SPOT,
+    'spot_e': CURVE_SPOT,
+    'strike': STRIKE,
+    'rate': RATE,
+    'drift': DRIFT,
+    'expiration': EXPIRATION,
+    'dividend': DIVIDEND,
+    'method': Field('string', enum=pde.METHODS, default='closed_form'),
+    'exercise': Field('string', enum=EXERCISES, default='european'),
+    'space_steps': Field('integer', minimum=10, maximum=10000, default=pde.SPACE_STEPS),
+    'time_steps': Field('integer', minimum=10, maximum=10000, default=pde.TIME_STEPS),
+}
+CURVE_CHECKS = [DIVIDEND_CHECK,
+                (lambda values: int(values['spot_e']) - int(values['spot_b']) <= MAX_POINTS, 'spot_e',
+                 'a curve has at most {} points'.format(MAX_POINTS)),
+                (lambda values: values['exercise'] == 'european' or values['method'] == 'pde', 'exercise',
+                 'an american curve needs the pde method'),
+                (lambda values: values['space_steps'] * values['time_steps'] <= MAX_POINTS, 'time_steps',
+                 'a grid has at most {} nodes'.format(MAX_POINTS))]
+
+GREEK_CURVE = Schema(CURVE_FIELDS, CURVE_CHECKS)
+
+CURVE = Schema(dict(CURVE_FIELDS, greeks=Field('strings', enum=ALL_GREEKS, default=list(GREEKS[1:]))), CURVE_CHECKS + [
+    (lambda values: values['method'] != 'pde' or set(values['greeks']) <= set(pde.GREEKS), 'greeks',
+     'the pde method computes {}'.format(', '.join(pde.GREEKS)))])
+
+SURFACE = Schema({
+    'type_option': TYPE_OPTION,
+    'spot_b': SPOT,
+    'spot_e': SPOT,
+    'spot_steps': Field('integer', minimum=1),
+    'expiration_b': EXPIRATION,
+    'expiration_e': EXPIRATION,
+    'expiration_steps': Field('integer', minimum=1),
+    'time': Field('string', enum=tuple(TIME_UNITS), default='days'),
+    'strike': STRIKE,
+    'rate': RATE,
+    'drift': DRIFT,
+    'dividend': DIVIDEND,
+    'greeks': Field('strings', enum=GREEKS, default=list(GREEKS)),
+}, [DIVIDEND_CHECK,
+    (lambda values: values['spot_steps'] * values['expiration_steps'] <= MAX_POINTS, 'expiration_steps',
+     'a surface has at most {} points'.format(MAX_POINTS))])
+
+IMPLIED_VOL = Schema({
+    'type_option': TYPE_OPTION,
+    'price': Field('numbers', minimum=0),
+    'spot': Field('numbers', minimum=0, exclusive=True),
+    'strike': Field('numbers', minimum=0, exclusive=True),
+    'rate': Field('numbers', minimum=-1, maximum=1),
+    'expiration': Field('numbers', minimum=0, exclusive=True),
+    'time': Field('string', enum=tuple(TIME_UNITS), default='days'),
+    'is_call': Field('booleans'),
+    'dividend': Field('numbers', default=0.0),
+}, [(_broadcastable('price', 'spot', 'strike', 'rate', 'expiration', 'is_call', 'dividend'), None,
+     'arrays must have the same length'),
+    DIVIDEND_CHECK])
+
+CONTRACT_FIELDS = {
+    'type_option': TYPE_OPTION,
+    'time': TIME,
+    'spot': SPOT,
+    'strike': STRIKE,
+    'rate': RATE,
+    'drift': DRIFT,
+    'expiration': EXPIRATION,
+    'dividend': DIVIDEND,
+}
+
+CONTRACT = Schema(CONTRACT_FIELDS, row_checks=[(_dividend_in_bounds, 'dividend')])
+
+BATCH = Schema(EXERCISE_FIELDS)
+
+POSITION_FIELDS = {
+    'is_call': Field('booleans'),
+    'quantity': Field(default=1.0),
+    'underlying': Field('string', default=''),
+}
+
+POSITION = Schema(dict(CONTRACT_FIELDS, **POSITION_FIELDS), row_checks=CONTRACT.row_checks)
+
+# Positions of a book are registered without spot, it is pushed on each tick
+BOOK_POSITION = Schema(dict({name: field for name, field in CONTRACT_FIELDS.items() if name != 'spot'},
+                            **POSITION_FIELDS), row_checks=CONTRACT.row_checks)
+
+TICK = Schema({
+    'spot': Field(minimum=0, exclusive=True, default=None),
+    'spots': Field('mapping', minimum=0, exclusive=True, default=None),
+    'greeks': Field('strings', enum=GREEKS, default=list(GREEKS)),
+}, [(lambda values: (values['spot'] is None) != (values['spots'] is None), 'spots', 'give either spot or spots')])
+
+PORTFOLIO = Schema({
+    'expiry_buckets': Field('numbers', minimum=0, exclusive=True, default=(7, 30, 90, 180, 365, 730)),
+    'moneyness_bands': Field('numbers', minimum=0, exclusive=True, default=(0.8, 0.95, 1.05, 1.2)),
+}, [(_increasing('expiry_buckets'), 'expiry_buckets', 'must be an increasing array of numbers'),
+    (_increasing('moneyness_bands'), 'moneyness_bands', 'must be an increasing array of numbers')])
+
+SCENARIOS = Schema({
+    'spot_shocks': Field('numbers', minimum=-1, exclusive=True, default=(-0.2, -0.1, 0, 0.1, 0.2)),
+    'vol_shocks': Field('numbers', minimum=-1, maximum=1, default=(-0.1, 0, 0.1)),
+    'method': Field('string', enum=METHODS, default='full'),
+}, [(lambda values: np.size(values['spot_shocks']) * np.size(values['vol_shocks']) <= MAX_SCENARIOS, 'vol_shocks',
+     'a grid has at most {} scenarios'.format(MAX_SCENARIOS))])
+
+MONTE_CARLO = Schema(dict(OPTION_FIELDS, **{
+    'is_call': Field('boolean'),
+    'payoff': Field('string', enum=PAYOFFS),
+    'barrier': Field(minimum=0, exclusive=True, default=None),
+    'barrier_type': Field('string', enum=BARRIERS, default='up-and-out'),
+    'continuous': Field('boolean', default=False),
+    'fixings': Field('integer', minimum=1, maximum=10000, default=100),
+    'paths': Field('integer', minimum=2, maximum=10000000, default=100000),
+    'antithetic': Field('boolean', default=True),
+    'control_variate': Field('boolean', default=True),
+    'seed': Field('integer', minimum=0, maximum=2 ** 53, default=None),
+}), [DIVIDEND_CHECK,
+     (lambda values: values['payoff'] != 'barrier' or values['barrier'] is not None, 'barrier',
+      'missing for a barrier payoff'),
+     (lambda values: values['paths'] * values['fixings'] <= MAX_PATH_POINTS, 'paths',
+      'a pricing has at most {} paths x fixings'.format(MAX_PATH_POINTS))])
@@ -1,4 +1,4 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, Response, current_app, jsonify
 
 main_bp = Blueprint('main_bp', __name__,
                     url_prefix='',
@@ -19,3 +19,9 @@ def index_client():
 def ping():
     """Testing route ping...pong"""
     return jsonify('pong!')
+
+
+@main_bp.route('/metrics')
+def metrics():
+    """Metrics of the routes in the Prometheus text format"""
+    return Response(current_app.extensions['metrics'].render(), mimetype='text/plain; version=0.0.4')
@@ -0,0 +1,181 @@
+"""Per-route request metrics exposed in the Prometheus text format.
+
+Every request is timed from `before_request` to `after_request` and split into
+phases: parse (`request.get_json`), serialize (JSON provider and binary formats)
+and compute (the rest of the view). Views report the number of points they
+priced with `add_points`.
+"""
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from threading import Lock
+
+from flask import Request, g, has_request_context, request
+
+try:
+    from flask.json.provider import DefaultJSONProvider
+except ImportError:  # Flask < 2.2, JSON serialization is accounted in compute
+    DefaultJSONProvider = None
+
+PHASES = ('total', 'parse', 'compute', 'serialize')
+
+# Upper bounds of the histogram buckets
+DURATION_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+POINTS_BUCKETS = (1, 10, 100, 1000, 10000, 100000, 1000000)
+
+
+class Histogram:
+    """Cumulative-ready histogram with a sum and a count"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def lines(self, name, labels):
+        """Prometheus lines of the histogram"""
+        total = 0
+        for bound, count in zip(self.buckets + ('+Inf',), self.counts):
+            total += count
+            yield '{}_bucket{{{},le="{}"}} {}'.format(name, labels, bound, total)
+        yield '{}_sum{{{}}} {}'.format(name, labels, self.sum)
+        yield '{}_count{{{}}} {}'.format(name, labels, total)
+
+
+class RouteMetrics:
+    """Counters and histograms of one route"""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.durations = {phase: Histogram(DURATION_BUCKETS) for phase in PHASES}
+        self.points = Histogram(POINTS_BUCKETS)
+
+
+class Metrics:
+    """Registry of the metrics of every route of an app"""
+
+    def __init__(self):
+        self.routes = {}
+        self.startup = {}
+        self._lock = Lock()
+
+    def init_app(self, app):
+        """Register the request hooks and timed JSON parsing/serialization on app"""
+        app.extensions['metrics'] = self
+        app.request_class = TimedRequest
+        if DefaultJSONProvider is not None:
+            app.json = TimedJSONProvider(app)
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+
+    @staticmethod
+    def _before_request():
+        g.metrics_start = time.perf_counter()
+        g.metrics_phases = {'parse': 0.0, 'serialize': 0.0}
+        g.metrics_points = 0
+
+    def _after_request(self, response):
+        if 'metrics_start' not in g:
+            return response
+        total = time.perf_counter() - g.metrics_start
+        phases = g.metrics_phases
+        durations = {
+            'total': total,
+            'parse': phases['parse'],
+            'serialize': phases['serialize'],
+            'compute': max(total - phases['parse'] - phases['serialize'], 0.0),
+        }
+
+        route = request.endpoint or 'not_found'
+        with self._lock:
+            metrics = self.routes.get(route)
+            if metrics is None:
+                metrics = self.routes[route] = RouteMetrics()
+            metrics.requests += 1
+            if response.status_code >= 400:
+                metrics.errors += 1
+            for phase, duration in durations.items():
+                metrics.durations[phase].observe(duration)
+            if g.metrics_points:
+                metrics.points.observe(g.metrics_points)
+        return response
+
+    def render(self):
+        """Every metric in the Prometheus text format"""
+        lines = [
+            '# HELP getgreeks_requests_total Requests by route.',
+            '# TYPE getgreeks_requests_total counter',
+        ]
+        with self._lock:
+            routes = sorted(self.routes.items())
+            for route, metrics in routes:
+                lines.append('getgreeks_requests_total{{route="{}"}} {}'.format(route, metrics.requests))
+            lines += [
+                '# HELP getgreeks_request_errors_total Requests answered with a 4xx or 5xx status by route.',
+                '# TYPE getgreeks_request_errors_total counter',
+            ]
+            for route, metrics in routes:
+                lines.append('getgreeks_request_errors_total{{route="{}"}} {}'.format(route, metrics.errors))
+            lines += [
+                '# HELP getgreeks_request_duration_seconds Request latency by route and phase.',
+                '# TYPE getgreeks_request_duration_seconds histogram',
+            ]
+            for route, metrics in routes:
+                for phase in PHASES:
+                    lines += metrics.durations[phase].lines('getgreeks_request_duration_seconds',
+                                                            'route="{}",phase="{}"'.format(route, phase))
+            lines += [
+                '# HELP getgreeks_points_computed Points priced per request by route.',
+                '# TYPE getgreeks_points_computed histogram',
+            ]
+            for route, metrics in routes:
+                if metrics.points.sum:
+                    lines += metrics.points.lines('getgreeks_points_computed', 'route="{}"'.format(route))
+        lines += [
+            '# HELP getgreeks_startup_seconds Duration of the app construction by phase.',
+            '# TYPE getgreeks_startup_seconds gauge',
+        ]
+        for name, duration in self.startup.items():
+            lines.append('getgreeks_startup_seconds{{phase="{}"}} {}'.format(name, duration))
+        return '\n'.join(lines) + '\n'
+
+
+class TimedRequest(Request):
+    """Request accounting the JSON parsing in the parse phase"""
+
+    def get_json(self, *args, **kwargs):
+        with phase('parse'):
+            return super().get_json(*args, **kwargs)
+
+
+if DefaultJSONProvider is not None:
+    class TimedJSONProvider(DefaultJSONProvider):
+        """JSON provider accounting the building of JSON responses in the serialize phase"""
+
+        def response(self, *args, **kwargs):
+            with phase('serialize'):
+                return super().response(*args, **kwargs)
+
+
+@contextmanager
+def phase(name):
+    """Account the time spent in the block in the given phase of the current request"""
+    if not has_request_context() or 'metrics_phases' not in g:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        g.metrics_phases[name] += time.perf_counter() - start
+
+
+def add_points(count):
+    """Account points priced by the current request"""
+    if has_request_context() and 'metrics_points' in g:
+        g.metrics_points += int(count)
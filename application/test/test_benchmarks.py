@@ -0,0 +1,63 @@
+import os
+import runpy
+from threading import Thread
+
+from werkzeug.serving import make_server
+
+from application import create_app
+from benchmarks.load import run
+from benchmarks.run import compare, summarize
+
+
+def test_benchmark_compare_flags_regressions():
+    """
+    GIVEN a baseline and new results, one of them slower than the tolerance
+    WHEN compare them
+    THEN Only the slower benchmark is flagged
+    """
+    baseline = {"results": [summarize('kernel', 'a', 10, [1.0] * 5), summarize('kernel', 'b', 10, [1.0] * 5)]}
+    results = [summarize('kernel', 'a', 10, [1.1] * 5), summarize('kernel', 'b', 10, [2.0] * 5),
+               summarize('kernel', 'c', 10, [9.0] * 5)]
+
+    regressions = compare(results, baseline, 0.25)
+
+    assert [regression["name"] for regression in regressions] == ['b']
+    assert regressions[0]["ratio"] == 2.0
+    assert results[0]["throughput"] == 10 / 1.1 * 1000
+
+
+def test_load_test_reports_requests_per_route():
+    """
+    GIVEN the app served on a local port
+    WHEN load it for a short while
+    THEN Every route answers without error and the total adds the routes up
+    """
+    server = make_server('127.0.0.1', 0, create_app({"TESTING": True}), threaded=True)
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        report = run('http://127.0.0.1:{}'.format(server.server_port), ['option', 'curve'], 0.5, 2)
+    finally:
+        server.shutdown()
+
+    assert report['total']['errors'] == 0
+    assert report['option']['requests'] > 0 and report['curve']['requests'] > 0
+    assert report['total']['requests'] == report['option']['requests'] + report['curve']['requests']
+
+
+def test_gunicorn_config_preloads_the_app(monkeypatch):
+    """
+    GIVEN the gunicorn settings shipped with the app
+    WHEN read them
+    THEN The app is preloaded, workers are sized from the CPUs and share them between their pricing pools
+    """
+    # Set then deleted, so the value written by the settings is removed after the test
+    monkeypatch.setenv('CALC_PARALLEL_WORKERS', '1')
+    monkeypatch.delenv('CALC_PARALLEL_WORKERS')
+    monkeypatch.setenv('WEB_CONCURRENCY', '2')
+    settings = runpy.run_path(os.path.join(os.path.dirname(__file__), '..', '..', 'gunicorn.conf.py'))
+
+    assert settings['preload_app'] is True
+    assert settings['workers'] == 2 and settings['threads'] >= 1
+    assert settings['max_requests'] > settings['max_requests_jitter'] > 0
+    assert int(os.environ['CALC_PARALLEL_WORKERS']) == max((os.cpu_count() or 1) // 2, 1)
@@ -0,0 +1,129 @@
+import numpy as np
+import pytest
+
+from application import create_app
+from application.calc.books import Book, BookStore, StoreFull
+from application.calc.pricing import GREEKS, price_options
+
+HULL = {"type_option": "Vanilla", "strike": 50, "rate": 0.1, "drift": 0.3, "time": "days"}
+
+
+def test_book_reprices_the_held_side():
+    """
+    GIVEN a book of calls and puts on two underlyings
+    WHEN reprice it on new spots
+    THEN Every position is valued as by the kernel and the net values are weighted by the quantities
+    """
+    generator = np.random.default_rng(0)
+    strike, drift, time_exp = generator.uniform(40, 60, 1000), generator.uniform(0.15, 0.4, 1000), \
+        generator.uniform(0.1, 2, 1000)
+    is_call = generator.random(1000) < 0.5
+    quantity = generator.integers(-10, 10, 1000).astype(float)
+    underlying = np.where(generator.random(1000) < 0.5, "ABC", "XYZ")
+    book = Book.build(strike, 0.05, drift, time_exp, 0.02, is_call, quantity, underlying)
+
+    values, net = book.reprice([50, 70], GREEKS)
+
+    result = price_options(np.where(underlying == "ABC", 50, 70), strike, 0.05, drift, time_exp, 0.02)
+    for greek in GREEKS:
+        expected = np.where(is_call, result['call'][greek], result['put'][greek])
+        assert np.allclose(values[greek], expected, rtol=1e-10, atol=1e-10)
+        assert np.isclose(net[greek], (quantity * expected).sum())
+    assert list(book.reprice([50, 70], ['delta'])[0]) == ['delta']
+
+
+def test_book_store_is_shared_through_its_directory(tmp_path):
+    """
+    GIVEN a book registered in a store with a directory
+    WHEN read it from another store on the same directory, then delete it
+    THEN The second store maps the same book, and neither finds it once deleted
+    """
+    book = Book.build([50, 60], 0.1, 0.3, 0.5, 0.0, [True, False], [1, -2], ["ABC", "ABC"])
+    first, second = BookStore(str(tmp_path)), BookStore(str(tmp_path))
+    book_id = first.add(book)
+
+    mapped = second.get(book_id)
+    assert mapped.underlyings == ["ABC"]
+    assert mapped.reprice([55], GREEKS)[1] == book.reprice([55], GREEKS)[1]
+
+    assert second.delete(book_id)
+    assert first.get(book_id) is None
+    assert second.get("not-an-id") is None
+
+
+def test_book_store_limits(tmp_path):
+    """
+    GIVEN stores holding at most two books for a short time, with and without a directory
+    WHEN register books, then leave them unused
+    THEN A third book is refused, and expired books are removed from the directory and from every process
+    """
+    book = Book.build([50], 0.1, 0.3, 0.5, 0.0, [True], [1], ["ABC"])
+    for path in (str(tmp_path), ''):
+        store = BookStore(path, max_books=2, ttl=3600)
+        book_ids = [store.add(book), store.add(book)]
+        with pytest.raises(StoreFull):
+            store.add(book)
+
+        assert store.get(book_ids[0]) is not None
+        store.ttl = 0
+        store.sweep(force=True)
+        assert store.get(book_ids[0]) is None and store.get(book_ids[1]) is None
+        assert not store._books and not store._ids()
+        store.ttl = 3600
+        assert store.get(store.add(book)) is not None
+
+    first, second = BookStore(str(tmp_path)), BookStore(str(tmp_path))
+    book_id = first.add(book)
+    assert second.get(book_id) is not None
+    first.delete(book_id)
+    second.sweep(force=True)
+    assert not second._books
+
+
+def test_calc_books(tmp_path):
+    """
+    GIVEN a book registered by one app
+    WHEN push spots to another app sharing the books directory
+    THEN It is repriced, invalid ticks are rejected and a deleted book is unknown
+    """
+    clients = [create_app({"TESTING": True, "CALC_BOOKS_PATH": str(tmp_path)}).test_client() for _ in range(2)]
+    positions = [dict(HULL, is_call=True, quantity=10, expiration=15, underlying="ABC"),
+                 dict(HULL, is_call=False, quantity=-5, expiration=90, underlying="XYZ")]
+    res = clients[0].post("/calc/books/", json={"positions": positions})
+    assert res.status_code == 201
+    book_id = res.get_json()["id"]
+    assert res.get_json()["underlyings"] == ["ABC", "XYZ"]
+
+    tick = {"spots": {"ABC": 50, "XYZ": 55}, "greeks": ["price", "delta"]}
+    res = clients[1].post("/calc/books/{}/spot/".format(book_id), json=tick)
+    assert res.status_code == 200
+    result = price_options(np.array([50, 55]), 50, 0.1, 0.3, np.array([15, 90]) / 365)
+    expected = 10 * result['call']['price'][0] - 5 * result['put']['price'][1]
+    assert abs(res.get_json()["net"]["price"] - expected) < 1e-3
+    assert set(res.get_json()["net"]) == {"price", "delta"}
+
+    res = clients[1].post("/calc/books/{}/spot/".format(book_id), json={"spot": 50})
+    assert res.status_code == 400
+    res = clients[1].post("/calc/books/{}/spot/".format(book_id), json={"spots": {"ABC": 50}})
+    assert res.get_json()["errors"] == [{"field": "spots", "message": "missing XYZ"}]
+
+    res = clients[0].post("/calc/books/", json={"positions": [dict(HULL, expiration=10, is_call=True)]})
+    assert res.status_code == 201
+    res = clients[0].post("/calc/books/{}/spot/".format(res.get_json()["id"]), json={"spot": 50},
+                          headers={"Accept": "application/vnd.getgreeks.columnar+json"})
+    assert res.status_code == 200
+    assert len(res.get_json()["positions"]["price"]) == 1
+
+    res = clients[0].post("/calc/books/", json={"positions": [dict(positions[0], underlying={"a": 1})]})
+    assert res.status_code == 400
+    assert res.get_json()["errors"] == [{"index": 0, "message": "invalid underlying"}]
+    res = clients[0].post("/calc/books/", json={"positions": []})
+    assert res.get_json()["errors"] == [{"field": "positions", "message": "a book has at least one position"}]
+    client = create_app({"TESTING": True, "CALC_BOOKS_PATH": str(tmp_path), "CALC_BOOKS_MAX": 2}).test_client()
+    res = client.post("/calc/books/", json={"positions": positions})
+    assert res.status_code == 409
+    assert res.get_json() == {"message": "the store holds its maximum of 2 books"}
+
+    assert clients[1].delete("/calc/books/{}/".format(book_id)).status_code == 204
+    assert clients[0].get("/calc/books/{}/".format(book_id)).status_code == 404
+    assert clients[0].post("/calc/books/{}/spot/".format(book_id), json={"spot": 50}).status_code == 404
@@ -0,0 +1,48 @@
+from application.calc.cache import ResultCache
+
+
+class FakeClock:
+    """Clock moved by hand"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_cache_lru_eviction():
+    """
+    GIVEN a cache of two entries
+    WHEN store a third one
+    THEN The least recently used entry is evicted
+    """
+    cache = ResultCache(maxsize=2, ttl=10)
+    cache.get_or_compute(cache.key('a'), lambda: 1)
+    cache.get_or_compute(cache.key('b'), lambda: 2)
+    cache.get_or_compute(cache.key('a'), lambda: -1)
+    cache.get_or_compute(cache.key('c'), lambda: 3)
+
+    assert cache.get_or_compute(cache.key('a'), lambda: -1) == 1
+    assert cache.get_or_compute(cache.key('b'), lambda: 4) == 4
+    assert cache.stats()["evictions"] == 2
+    assert cache.stats()["size"] == 2
+
+
+def test_cache_ttl_and_rounding():
+    """
+    GIVEN a cache with a ttl
+    WHEN ask for keys differing by float noise, then wait past the ttl
+    THEN The first hits and the second recomputes
+    """
+    clock = FakeClock()
+    cache = ResultCache(maxsize=8, ttl=5, precision=8, clock=clock)
+
+    assert cache.get_or_compute(cache.key('option', 0.1 + 0.2), lambda: 'first') == 'first'
+    assert cache.get_or_compute(cache.key('option', 0.3), lambda: 'second') == 'first'
+
+    clock.now = 6
+    assert cache.get_or_compute(cache.key('option', 0.3), lambda: 'third') == 'third'
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["expirations"]) == (1, 2, 1)
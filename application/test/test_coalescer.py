@@ -0,0 +1,43 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from application import create_app
+from application.calc.coalescer import Coalescer
+from application.calc.pricing import price_options
+
+
+def test_coalescer_batches_concurrent_requests():
+    """
+    GIVEN a coalescer with a large window
+    WHEN price many contracts concurrently
+    THEN Every caller gets its own row and requests are grouped
+    """
+    coalescer = Coalescer(price_options, window=0.05, max_batch=8)
+    spots = list(range(40, 60))
+
+    with ThreadPoolExecutor(len(spots)) as executor:
+        results = list(executor.map(lambda spot: coalescer.price(spot, 50, 0.1, 0.3, 0.25, 0), spots))
+
+    for spot, result in zip(spots, results):
+        assert result['call']['price'] == float(price_options([spot], 50, 0.1, 0.3, 0.25, 0)['call']['price'][0])
+
+    stats = coalescer.stats()
+    assert stats["requests"] == 20
+    assert 3 <= stats["batches"] < 20
+    assert sum(stats["batch_size"].values()) == stats["batches"]
+
+
+def test_calc_option_coalesced():
+    """
+    GIVEN an app coalescing option requests
+    WHEN ask for the hull exercice
+    THEN Have the right result and the request is accounted
+    """
+    client = create_app({"TESTING": True, "CALC_COALESCE_WINDOW": 0.001}).test_client()
+    res = client.post("/calc/option/Vanilla/", json={
+        "spot": 50, "strike": 50, "rate": 0.1, "drift": 0.3, "expiration": 3, "time": "months", "dividend": 0
+    })
+
+    data = res.get_json()
+
+    assert data[0]["price"] == 3.610
+    assert client.get("/calc/coalescer/").get_json()["requests"] == 1
@@ -0,0 +1,78 @@
+import json
+
+import numpy as np
+
+from application import create_app
+from application.calc.books import Book
+from application.calc.feeds import SpotBoard, book_events
+
+HULL = {"type_option": "Vanilla", "strike": 50, "rate": 0.1, "drift": 0.3, "expiration": 30, "time": "days"}
+
+
+def parse(text):
+    """Data of the greeks events of a stream"""
+    return [json.loads(block.split('data: ', 1)[1]) for block in text.split('\n\n')
+            if block.startswith('event: greeks')]
+
+
+def test_book_events_coalesce_ticks():
+    """
+    GIVEN a book and ticks published faster than the interval of its subscriber
+    WHEN read its events
+    THEN Only the latest spots are sent, and a heartbeat is sent without ticks
+    """
+    book = Book.build([50, 60], 0.1, 0.3, 0.5, 0.0, [True, False], [1, -2], ["ABC", "XYZ"])
+    board = SpotBoard()
+    events = book_events(book, board, ['price', 'delta'], 0.05, 0.01, 10)
+    assert next(events).startswith('retry: ')
+
+    board.publish({"ABC": 50})
+    assert next(events) == ': heartbeat\n\n'
+    for spot in (51, 52, 53):
+        board.publish({"XYZ": 60, "ABC": spot})
+    data, = parse(next(events))
+
+    values, net = book.reprice([53, 60], ['price', 'delta'])
+    assert data["version"] == 4
+    assert data["spots"] == {"ABC": 53, "XYZ": 60}
+    assert data["net"] == {greek: round(value, 3) for greek, value in net.items()}
+    assert np.allclose(data["positions"]["price"], values['price'], atol=1e-3)
+
+
+def test_calc_book_events(tmp_path):
+    """
+    GIVEN a registered book and the simulated feed
+    WHEN subscribe to its events
+    THEN Updates follow the random walk until the stream ends, invalid subscriptions and the ones above the
+        maximum of open streams are rejected
+    """
+    app = create_app({"TESTING": True, "CALC_BOOKS_PATH": str(tmp_path), "CALC_FEED": "random_walk",
+                      "CALC_FEED_INTERVAL": 0.01, "CALC_EVENTS_INTERVAL": 0.02, "CALC_EVENTS_DURATION": 0.3})
+    client = app.test_client()
+    positions = [dict(HULL, is_call=True, underlying="ABC"), dict(HULL, is_call=False, underlying="XYZ")]
+    book_id = client.post("/calc/books/", json={"positions": positions}).get_json()["id"]
+
+    res = client.get("/calc/books/{}/events/?greeks=price&positions=false".format(book_id))
+    assert res.status_code == 200
+    assert res.mimetype == "text/event-stream"
+    updates = parse(res.get_data(as_text=True))
+    res.close()
+    assert len(updates) > 2
+    assert all(set(update) == {"version", "spots", "net"} and set(update["net"]) == {"price"} for update in updates)
+    assert updates[0]["spots"] != updates[-1]["spots"]
+    assert [update["version"] for update in updates] == sorted({update["version"] for update in updates})
+
+    res = client.get("/calc/books/{}/events/?greeks=price&interval=0.001".format(book_id))
+    assert res.status_code == 400
+    assert res.get_json()["errors"][0]["field"] == "interval"
+    assert client.get("/calc/books/{}/events/".format("0" * 32)).status_code == 404
+
+    with client.get("/calc/books/{}/events/".format(book_id)):
+        res = client.get("/calc/books/{}/events/".format(book_id))
+        assert res.status_code == 503
+        assert res.headers["Retry-After"] == "1"
+    with client.get("/calc/books/{}/events/?greeks=price".format(book_id)) as res:
+        assert res.status_code == 200
+
+    client = create_app({"TESTING": True, "CALC_BOOKS_PATH": str(tmp_path)}).test_client()
+    assert client.get("/calc/books/{}/events/".format(book_id)).status_code == 503
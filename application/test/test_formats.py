@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+PARAM = {"spot_b": 85, "spot_e": 115, "strike": 100, "rate": 0.1, "drift": 0.15, "expiration": 60, "dividend": 0}
+
+
+def test_curve_default_json(client):
+    """
+    GIVEN no Accept header
+    WHEN ask for deltas
+    THEN Have the historical list of points
+    :param client:
+    """
+    data = client.post("/calc/delta/Vanilla/", json=PARAM).get_json()
+
+    assert data["call"][0] == {'x': 85, 'y': 0.009}
+
+
+def test_curve_columnar_json(client):
+    """
+    GIVEN the columnar Accept header
+    WHEN ask for deltas
+    THEN Have one array per column
+    :param client:
+    """
+    res = client.post("/calc/delta/Vanilla/", json=PARAM,
+                      headers={"Accept": "application/vnd.getgreeks.columnar+json"})
+    assert res.mimetype == "application/vnd.getgreeks.columnar+json"
+
+    data = res.get_json(force=True)
+
+    assert data["x"] == list(range(85, 115))
+    assert data["call"][0] == 0.009
+    assert len(data["put"]) == 30
+
+
+def test_surface_binary(client):
+    """
+    GIVEN the binary Accept header
+    WHEN ask for a surface
+    THEN Have float64 buffers described by the headers
+    :param client:
+    """
+    res = client.post("/calc/surface/Vanilla/", headers={"Accept": "application/octet-stream"}, json={
+        "spot_b": 40, "spot_e": 60, "spot_steps": 21, "expiration_b": 1, "expiration_e": 3, "expiration_steps": 3,
+        "time": "months", "strike": 50, "rate": 0.1, "drift": 0.3, "dividend": 0, "greeks": ["price"]
+    })
+    assert res.status_code == 200
+
+    columns = res.headers["X-Columns"].split(",")
+    shape = tuple(int(length) for length in res.headers["X-Shape"].split(","))
+    values = np.frombuffer(res.data, dtype='<f8').reshape((len(columns),) + shape)
+
+    assert columns == ["spot", "expiration", "call.price", "put.price"]
+    assert shape == (3, 21)
+    assert values[0, 2, 10] == 50
+    assert round(values[2, 2, 10], 3) == 3.610
+
+
+def test_curve_arrow(client):
+    """
+    GIVEN the arrow Accept header
+    WHEN ask for several greeks
+    THEN Have an arrow stream of the columns
+    :param client:
+    """
+    pyarrow = pytest.importorskip("pyarrow")
+    res = client.post("/calc/curve/Vanilla/", json=dict(PARAM, greeks=["delta", "gamma"]),
+                      headers={"Accept": "application/vnd.apache.arrow.stream"})
+    assert res.status_code == 200
+
+    table = pyarrow.ipc.open_stream(res.data).read_all()
+
+    assert table.column_names == ["x", "call.delta", "call.gamma", "put.delta", "put.gamma"]
+    assert table.num_rows == 30
+    assert round(table.column("call.delta")[0].as_py(), 3) == 0.009
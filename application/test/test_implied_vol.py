@@ -0,0 +1,54 @@
+import numpy as np
+
+from application.calc.implied_vol import CONVERGED, implied_volatility
+from application.calc.pricing import price_options
+
+
+def test_implied_volatility_round_trip():
+    """
+    GIVEN call and put prices of a chain with various drifts
+    WHEN solve the implied drift
+    THEN Find back the drifts used to price them
+    """
+    strike = np.linspace(80, 120, 41)
+    time_exp = np.linspace(0.1, 2, 41)
+    drift = np.linspace(0.15, 0.8, 41)
+    result = price_options(100, strike, 0.05, drift, time_exp, 0.02)
+
+    for side in ('call', 'put'):
+        solved, status, iterations = implied_volatility(result[side]['price'], 100, strike, 0.05, time_exp, 0.02,
+                                                        side == 'call')
+
+        assert np.all(status == CONVERGED)
+        assert np.allclose(solved, drift, atol=1e-7)
+        assert iterations.max() < 20
+
+
+def test_implied_volatility_scalar(client):
+    """
+    GIVEN the price of one call, every input a scalar
+    WHEN solve the implied drift, directly and through the route
+    THEN Find back the drift, as scalars
+    """
+    price = price_options(50, 50, 0.1, 0.3, 0.25)['call']['price']
+    solved, status, iterations = implied_volatility(price, 50, 50, 0.1, 0.25, 0.0, True)
+    assert solved.shape == status.shape == iterations.shape == ()
+    assert status == CONVERGED and abs(solved - 0.3) < 1e-7
+
+    res = client.post("/calc/implied_vol/Vanilla/", json={"price": price, "spot": 50, "strike": 50, "rate": 0.1,
+                                                          "expiration": 3, "time": "months", "is_call": True})
+    assert res.status_code == 200
+    assert res.get_json()["status"] == CONVERGED
+    assert abs(res.get_json()["drift"] - 0.3) < 1e-7
+
+
+def test_calc_implied_vol_empty_chain(client):
+    """
+    GIVEN an empty chain
+    WHEN solve its implied drifts
+    THEN The result is empty
+    """
+    res = client.post("/calc/implied_vol/Vanilla/", json={"price": [], "spot": 50, "strike": [], "rate": 0.1,
+                                                          "expiration": [], "is_call": []})
+    assert res.status_code == 200
+    assert res.get_json() == {"drift": [], "status": [], "iterations": []}
@@ -0,0 +1,73 @@
+import numpy as np
+
+from application.calc.lattice import price_american
+from application.calc.pricing import GREEKS, price_options
+
+
+def test_american_call_without_dividend_is_european():
+    """
+    GIVEN a call on an underlying paying no dividend, never exercised early
+    WHEN price it on the lattice
+    THEN Its price and greeks are the closed form ones
+    """
+    american = price_american(50.0, 50.0, 0.1, 0.3, 0.25)
+    european = price_options(50.0, 50.0, 0.1, 0.3, 0.25)
+    for greek in GREEKS:
+        assert abs(american['call'][greek] - european['call'][greek]) < 1e-3 * max(1, abs(european['call'][greek]))
+
+
+def test_american_put():
+    """
+    GIVEN the american put of Hull (S=K=50, r=10%, vol=40%, 5 months)
+    WHEN price it with few steps, with and without extrapolation
+    THEN The extrapolated price is the converged one, above the european price
+    """
+    converged = 4.2842
+    assert abs(price_american(50.0, 50.0, 0.1, 0.4, 5 / 12, steps=50)['put']['price'] - converged) < 2e-3
+    assert abs(price_american(50.0, 50.0, 0.1, 0.4, 5 / 12, steps=50, richardson=False)['put']['price']
+               - converged) > 5e-3
+
+    put = price_american(50.0, 50.0, 0.1, 0.4, 5 / 12)['put']
+    european = price_options(50.0, 50.0, 0.1, 0.4, 5 / 12)['put']
+    assert put['price'] > european['price']
+    assert put['delta'] < european['delta'] < 0
+    assert put['gamma'] > 0 and put['vega'] > 0 and put['rho'] < 0
+
+
+def test_batch_matches_single_contracts():
+    """
+    GIVEN a batch of contracts larger than a chunk
+    WHEN price it at once
+    THEN Every contract has the values of its own pricing
+    """
+    generator = np.random.default_rng(0)
+    spot, drift, dividend = generator.uniform(40, 60, 300), generator.uniform(0.15, 0.4, 300), \
+        generator.uniform(0, 0.05, 300)
+    batch = price_american(spot, 50.0, 0.05, drift, 1.0, dividend, steps=40)
+    for index in (0, 299):
+        single = price_american(spot[index], 50.0, 0.05, drift[index], 1.0, dividend[index], steps=40)
+        for side in ('call', 'put'):
+            for greek in GREEKS:
+                assert np.isclose(batch[side][greek][index], single[side][greek])
+
+
+def test_calc_option_american(client):
+    """
+    GIVEN an option and a batch priced as american
+    WHEN post them
+    THEN The put is worth more than the european one, the batch matches the single contract
+    """
+    payload = {"spot": 50, "strike": 50, "rate": 0.1, "drift": 0.4, "expiration": 5, "time": "months"}
+    european = client.post("/calc/option/Vanilla/", json=payload).get_json()
+    american = client.post("/calc/option/Vanilla/", json=dict(payload, exercise="american")).get_json()
+    assert abs(american[1]["price"] - 4.2842) < 2e-3
+    assert american[1]["price"] > european[1]["price"]
+    assert american[0]["price"] == european[0]["price"]
+
+    res = client.post("/calc/options/batch/", json={"contracts": [dict(payload, type_option="Vanilla")] * 2,
+                                                    "exercise": "american"})
+    assert res.status_code == 200
+    assert res.get_json()["put"]["price"] == [american[1]["price"]] * 2
+
+    res = client.post("/calc/option/Vanilla/", json=dict(payload, exercise="bermudan", steps=5))
+    assert [error["field"] for error in res.get_json()["errors"]] == ["exercise", "steps"]
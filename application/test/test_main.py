@@ -212,3 +212,178 @@ def test_calc_rho(client):
         assert cell['y']
         count += 1
         begin_spot += 1
+
+
+def test_calc_option_post(client):
+    """
+    GIVEN param hull exercice
+    WHEN post for values
+    THEN Have the right result
+    :param client:
+    """
+    res = client.post("/calc/option/Vanilla/", json={
+        "spot": 50, "strike": 50, "rate": 0.1, "drift": 0.3, "expiration": 3, "time": "months", "dividend": 0
+    })
+    assert res.status_code == 200
+
+    data = res.get_json()
+
+    assert data[0]["price"] == 3.610
+    assert data[0]["delta"] == 0.595
+    assert data[1]["price"] == 2.376
+    assert data[1]["delta"] == -0.405
+
+
+def test_calc_delta_post(client):
+    """
+    GIVEN param from partiel2017
+    WHEN post for deltas
+    THEN Have the right result
+    :param client:
+    """
+    res = client.post("/calc/delta/Vanilla/", json={
+        "spot_b": 85, "spot_e": 115, "strike": 100, "rate": 0.1, "drift": 0.15, "expiration": 60, "dividend": 0
+    })
+    assert res.status_code == 200
+
+    data = res.get_json()
+
+    assert len(data["call"]) == 30
+    assert data["call"][0] == {'x': 85, 'y': 0.009}
+    assert data["call"][-1] == {'x': 114, 'y': 0.993}
+
+
+def test_calc_options_batch(client):
+    """
+    GIVEN contracts with different types, time unities and one invalid contract
+    WHEN post the batch
+    THEN Have columnar results and the invalid contract reported
+    :param client:
+    """
+    hull = {"spot": 50, "strike": 50, "rate": 0.1, "drift": 0.3, "dividend": 0}
+    res = client.post("/calc/options/batch/", json={"contracts": [
+        dict(hull, type_option="Vanilla", expiration=3, time="months"),
+        dict(hull, type_option="Vanilla", expiration=91.25, time="days"),
+        dict(hull, type_option="Dividend", expiration=0.25, time="years", dividend=0.05),
+        dict(hull, type_option="Vanilla", expiration=3, time="weeks"),
+        {"type_option": "Vanilla"},
+    ]})
+    assert res.status_code == 200
+
+    data = res.get_json()
+
+    assert data["size"] == 5
+    assert data["call"]["price"][:2] == [3.610, 3.610]
+    assert data["put"]["price"][:2] == [2.376, 2.376]
+    assert data["call"]["price"][2] < 3.610
+    assert data["call"]["price"][3:] == [None, None]
+    assert data["errors"] == [{"index": 3, "message": "invalid time"}, {"index": 4, "message": "missing time"}]
+
+
+def test_calc_surface(client):
+    """
+    GIVEN a spot interval and an expiration interval
+    WHEN ask for the delta surface
+    THEN Have a flat surface of the right shape matching the single option route
+    :param client:
+    """
+    res = client.post("/calc/surface/Vanilla/", json={
+        "spot_b": 40, "spot_e": 60, "spot_steps": 21, "expiration_b": 1, "expiration_e": 3, "expiration_steps": 3,
+        "time": "months", "strike": 50, "rate": 0.1, "drift": 0.3, "dividend": 0, "greeks": ["price", "delta"]
+    })
+    assert res.status_code == 200
+
+    data = res.get_json()
+
+    assert data["shape"] == [3, 21]
+    assert set(data["call"]) == {"price", "delta"}
+    assert len(data["call"]["price"]) == 63
+
+    # Spot 50 with 3 months is the hull exercice
+    assert data["call"]["price"][2 * 21 + 10] == 3.610
+    assert data["put"]["price"][2 * 21 + 10] == 2.376
+
+
+def test_calc_curve(client):
+    """
+    GIVEN param from partiel2017
+    WHEN ask for several greeks at once
+    THEN Have the same series as the single greek routes
+    :param client:
+    """
+    param = {"spot_b": 85, "spot_e": 115, "strike": 100, "rate": 0.1, "drift": 0.15, "expiration": 60, "dividend": 0}
+    res = client.post("/calc/curve/Vanilla/", json=dict(param, greeks=["delta", "gamma"]))
+    assert res.status_code == 200
+
+    data = res.get_json()
+
+    assert data["x"] == list(range(85, 115))
+    assert set(data["call"]) == {"delta", "gamma"}
+    for greek in ("delta", "gamma"):
+        single = client.post("/calc/" + greek + "/Vanilla/", json=param).get_json()
+        assert data["call"][greek] == [cell['y'] for cell in single["call"]]
+        assert data["put"][greek] == [cell['y'] for cell in single["put"]]
+
+
+def test_calc_implied_vol(client):
+    """
+    GIVEN the hull exercice prices and a price above the spot
+    WHEN ask for implied drift
+    THEN Find back the drift and reject the impossible price
+    :param client:
+    """
+    res = client.post("/calc/implied_vol/Vanilla/", json={
+        "price": [3.610, 2.376, 60], "spot": 50, "strike": [50, 50, 50], "rate": 0.1, "expiration": [3, 3, 3],
+        "time": "months", "is_call": [True, False, True], "dividend": 0
+    })
+    assert res.status_code == 200
+
+    data = res.get_json()
+
+    assert [round(drift, 3) for drift in data["drift"][:2]] == [0.3, 0.3]
+    assert data["drift"][2] is None
+    assert data["status"] == ["converged", "converged", "out_of_bounds"]
+    assert data["iterations"][2] == 0
+
+
+def test_calc_cache(client):
+    """
+    GIVEN the same option asked in days then in months
+    WHEN ask for the cache counters
+    THEN The second request is a hit
+    :param client:
+    """
+    hull = {"spot": 50, "strike": 50, "rate": 0.1, "drift": 0.3, "dividend": 0}
+    first = client.post("/calc/option/Vanilla/", json=dict(hull, expiration=91.25, time="days")).get_json()
+    second = client.post("/calc/option/Vanilla/", json=dict(hull, expiration=0.25, time="years")).get_json()
+    assert first == second
+
+    data = client.get("/calc/cache/").get_json()
+
+    assert data["enabled"]
+    assert data["hits"] == 1
+    assert data["misses"] == 1
+
+
+def test_metrics(client):
+    """
+    GIVEN a valid and an invalid curve request
+    WHEN scrape the metrics
+    THEN Have the counts, the phases and the points of the route
+    :param client:
+    """
+    param = {"spot_b": 85, "spot_e": 115, "strike": 100, "rate": 0.1, "drift": 0.15, "expiration": 60, "dividend": 0}
+    client.post("/calc/delta/Vanilla/", json=param)
+    client.post("/calc/delta/Unknown/", json=param)
+
+    res = client.get("/metrics")
+    assert res.status_code == 200
+
+    lines = res.data.decode().splitlines()
+
+    assert 'getgreeks_requests_total{route="calc_bp.calc_delta"} 2' in lines
+    assert 'getgreeks_request_errors_total{route="calc_bp.calc_delta"} 1' in lines
+    for phase in ("total", "parse", "compute", "serialize"):
+        assert ('getgreeks_request_duration_seconds_count{route="calc_bp.calc_delta",phase="' + phase + '"} 2'
+                in lines)
+    assert 'getgreeks_points_computed_sum{route="calc_bp.calc_delta"} 30.0' in lines
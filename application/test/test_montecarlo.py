@@ -0,0 +1,103 @@
+import math
+from concurrent.futures import ThreadPoolExecutor
+
+from application.calc import special
+from application.calc.montecarlo import CHUNK_POINTS, price_path_dependent
+from application.calc.pricing import price_options
+
+OPTION = {"spot": 100.0, "strike": 100.0, "rate": 0.05, "drift": 0.2, "time_exp": 1.0, "dividend": 0.02,
+          "is_call": True, "payoff": "european", "barrier": None, "barrier_type": "up-and-out", "continuous": False,
+          "fixings": 20, "antithetic": True}
+
+
+def test_european_matches_the_closed_form():
+    """
+    GIVEN a european put priced without control variate
+    WHEN simulate it
+    THEN The closed form price is within three standard errors
+    """
+    option = dict(OPTION, is_call=False)
+    result = price_path_dependent(option, 100000, seed=1, control_variate=False)
+
+    expected = price_options(100, 100, 0.05, 0.2, 1, 0.02)['put']['price']
+    assert abs(result['price'] - expected) < 3 * result['std_error']
+    assert result['vanilla'] == expected
+
+
+def test_variance_reduction_and_barrier_parity():
+    """
+    GIVEN an Asian call and up barrier calls
+    WHEN simulate them with and without variance reduction
+    THEN The control variate lowers the error, and the in and out barriers add up to the vanilla
+    """
+    asian = dict(OPTION, payoff="asian")
+    plain = price_path_dependent(dict(asian, antithetic=False), 50000, seed=2, control_variate=False)
+    reduced = price_path_dependent(asian, 50000, seed=2)
+    assert reduced['std_error'] < plain['std_error']
+    assert abs(reduced['price'] - plain['price']) < 3 * plain['std_error']
+    assert reduced['price'] < reduced['vanilla']
+
+    barrier = dict(OPTION, payoff="barrier", barrier=120.0)
+    out = price_path_dependent(barrier, 50000, seed=3, control_variate=False)
+    knock_in = price_path_dependent(dict(barrier, barrier_type="up-and-in"), 50000, seed=3, control_variate=False)
+    assert abs(out['price'] + knock_in['price'] - out['vanilla']) < 3 * out['std_error'] + 3 * knock_in['std_error']
+    assert price_path_dependent(dict(barrier, barrier=90.0), 1000, seed=3)['price'] == 0
+
+
+def test_continuous_barrier_matches_the_closed_form():
+    """
+    GIVEN a down-and-out call monitored on 50 fixings
+    WHEN simulate it with the continuity correction
+    THEN The closed form price of the continuously monitored barrier is within three standard errors
+    """
+    spot, strike, barrier, rate, drift, time_exp, dividend = 100.0, 100.0, 90.0, 0.05, 0.2, 1.0, 0.02
+    vol_t = drift * math.sqrt(time_exp)
+    power = (rate - dividend + 0.5 * drift * drift) / (drift * drift)
+    y = math.log(barrier * barrier / (spot * strike)) / vol_t + power * vol_t
+    down_and_in = spot * math.exp(-dividend * time_exp) * (barrier / spot) ** (2 * power) * special.cdf_scalar(y) \
+        - strike * math.exp(-rate * time_exp) * (barrier / spot) ** (2 * power - 2) * special.cdf_scalar(y - vol_t)
+    expected = price_options(spot, strike, rate, drift, time_exp, dividend)['call']['price'] - down_and_in
+
+    option = dict(OPTION, payoff="barrier", barrier=barrier, barrier_type="down-and-out", fixings=50)
+    continuous = price_path_dependent(dict(option, continuous=True), 100000, seed=5)
+    discrete = price_path_dependent(option, 100000, seed=5)
+    assert abs(continuous['price'] - expected) < 3 * continuous['std_error']
+    assert discrete['price'] - expected > 10 * discrete['std_error']
+
+
+def test_seed_is_reproducible_across_workers():
+    """
+    GIVEN a pricing of several chunks and a seed
+    WHEN simulate it in this process and split across workers
+    THEN The prices are identical
+    """
+    paths = 3 * CHUNK_POINTS // OPTION['fixings']
+    option = dict(OPTION, payoff="asian")
+    alone = price_path_dependent(option, paths, seed=4)
+    with ThreadPoolExecutor(2) as executor:
+        split = price_path_dependent(option, paths, seed=4, executor=executor, workers=2)
+    assert split == alone
+    assert price_path_dependent(option, 1000)['seed'] != price_path_dependent(option, 1000)['seed']
+
+
+def test_calc_montecarlo(client):
+    """
+    GIVEN Monte Carlo pricing requests
+    WHEN post them
+    THEN The price comes with its error, a barrier payoff needs its barrier
+    """
+    payload = {"spot": 100, "strike": 100, "rate": 0.05, "drift": 0.2, "expiration": 1, "time": "years",
+               "is_call": True, "payoff": "asian", "fixings": 12, "paths": 20000, "seed": 7}
+    res = client.post("/calc/montecarlo/Vanilla/", json=payload)
+    assert res.status_code == 200
+    data = res.get_json()
+    assert set(data) == {"price", "std_error", "paths", "seed", "vanilla"}
+    assert data["seed"] == 7 and data["paths"] == 20000
+    assert 0 < data["std_error"] < 0.05 and data["price"] < data["vanilla"]
+    assert client.post("/calc/montecarlo/Vanilla/", json=payload).get_json() == data
+
+    res = client.post("/calc/montecarlo/Vanilla/", json=dict(payload, payoff="barrier"))
+    assert res.status_code == 400
+    assert res.get_json()["errors"] == [{"field": "barrier", "message": "missing for a barrier payoff"}]
+    res = client.post("/calc/montecarlo/Vanilla/", json=dict(payload, is_call="yes"))
+    assert res.get_json()["errors"] == [{"field": "is_call", "message": "must be a boolean"}]
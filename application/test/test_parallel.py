@@ -0,0 +1,40 @@
+import numpy as np
+
+from application import create_app
+from application.calc.parallel import price_parallel
+from application.calc.pricing import price_options
+
+
+def test_price_parallel_matches_kernel():
+    """
+    GIVEN a grid of contracts
+    WHEN price it with two workers in several chunks
+    THEN Have exactly the kernel values in the input shape
+    """
+    spots = np.linspace(40, 60, 50)
+    time_exp = np.linspace(0.1, 1, 7)[:, np.newaxis]
+
+    parallel = price_parallel(spots, 50, 0.1, 0.3, time_exp, 0.02, ('price', 'delta'), workers=2, chunks=5)
+    inline = price_options(spots, 50, 0.1, 0.3, time_exp, 0.02, ('price', 'delta'))
+
+    for side in ('call', 'put'):
+        assert set(parallel[side]) == {'price', 'delta'}
+        assert parallel[side]['price'].shape == (7, 50)
+        assert np.array_equal(parallel[side]['price'], inline[side]['price'])
+
+
+def test_calc_surface_parallel():
+    """
+    GIVEN an app sending every surface to the process pool
+    WHEN ask for a surface
+    THEN Have the hull exercice value
+    """
+    client = create_app({"TESTING": True, "CALC_PARALLEL_WORKERS": 2, "CALC_PARALLEL_THRESHOLD": 1}).test_client()
+    res = client.post("/calc/surface/Vanilla/", json={
+        "spot_b": 40, "spot_e": 60, "spot_steps": 21, "expiration_b": 1, "expiration_e": 3, "expiration_steps": 3,
+        "time": "months", "strike": 50, "rate": 0.1, "drift": 0.3, "dividend": 0, "greeks": ["price"]
+    })
+
+    data = res.get_json()
+
+    assert data["call"]["price"][2 * 21 + 10] == 3.610
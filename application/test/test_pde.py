@@ -0,0 +1,62 @@
+import numpy as np
+
+from application.calc import pde
+from application.calc.lattice import price_american
+from application.calc.pricing import price_options
+
+SPOTS = np.arange(40, 60)
+CURVE = {"spot_b": 40, "spot_e": 60, "strike": 50, "rate": 0.1, "drift": 0.3, "expiration": 91.25, "dividend": 0.03}
+
+
+def test_pde_converges_to_the_closed_form():
+    """
+    GIVEN the european curve of a contract
+    WHEN solve it on grids doubled in space and time
+    THEN Every greek gets close to the closed form, at second order
+    """
+    expected = price_options(SPOTS, 50, 0.1, 0.3, 0.25, 0.03)
+    errors = []
+    for space_steps, time_steps in ((100, 50), (200, 100), (400, 200)):
+        result = pde.solve(SPOTS, 50, 0.1, 0.3, 0.25, 0.03, space_steps=space_steps, time_steps=time_steps)
+        errors.append([np.abs(result[side][greek] - expected[side][greek]).max()
+                       for side in ('call', 'put') for greek in pde.GREEKS])
+    errors = np.array(errors)
+    assert (errors[-1] < np.tile([2e-3, 5e-4, 3e-3, 1e-4], 2)).all()
+    assert (errors[1] < errors[0] / 3).all() and (errors[2] < errors[1] / 3).all()
+
+
+def test_pde_american_put_matches_the_lattice():
+    """
+    GIVEN american puts in and out of the exercise region
+    WHEN solve them on a grid
+    THEN They match the lattice, and are exercised deep in the money
+    """
+    spots = np.array([30.0, 45.0, 50.0, 60.0])
+    result = pde.solve(spots, 50, 0.1, 0.4, 5 / 12, american=True, space_steps=800, time_steps=400)['put']
+    expected = price_american(spots, 50, 0.1, 0.4, 5 / 12)['put']
+    assert np.allclose(result['price'], expected['price'], atol=2e-3)
+    assert np.allclose(result['delta'], expected['delta'], atol=1e-3)
+    assert result['price'][0] == 20 and result['theta'][0] == 0
+
+
+def test_calc_curve_pde(client):
+    """
+    GIVEN curves asked with the pde method
+    WHEN post them
+    THEN They are close to the closed form ones, american ones need the pde method and its greeks
+    """
+    closed_form = client.post("/calc/curve/Dividend/", json=dict(CURVE, greeks=["price", "gamma"])).get_json()
+    res = client.post("/calc/curve/Dividend/", json=dict(CURVE, greeks=["price", "gamma"], method="pde"))
+    assert res.status_code == 200
+    assert res.get_json()["x"] == closed_form["x"]
+    assert np.allclose(res.get_json()["call"]["price"], closed_form["call"]["price"], atol=2e-3)
+
+    res = client.post("/calc/delta/Vanilla/", json=dict(CURVE, method="pde", exercise="american"))
+    assert res.status_code == 200
+    assert len(res.get_json()["put"]) == 20
+
+    res = client.post("/calc/curve/Vanilla/", json=dict(CURVE, exercise="american"))
+    assert res.get_json()["errors"] == [{"field": "exercise", "message": "an american curve needs the pde method"}]
+    res = client.post("/calc/curve/Vanilla/", json=dict(CURVE, method="pde"))
+    assert res.get_json()["errors"][0]["field"] == "greeks"
+    assert client.post("/calc/vega/Vanilla/", json=dict(CURVE, method="pde")).status_code == 400
@@ -0,0 +1,73 @@
+import numpy as np
+
+from application.calc.portfolio import bucket, labels
+from application.calc.pricing import GREEKS, price_options
+
+HULL = {"type_option": "Vanilla", "spot": 50, "strike": 50, "rate": 0.1, "drift": 0.3, "time": "days"}
+
+
+def test_buckets():
+    """
+    GIVEN bucket bounds
+    WHEN name them and bucket values
+    THEN A value equal to a bound goes in the bucket it opens
+    """
+    assert labels([7, 30], 'd') == ['<7d', '7-30d', '>=30d']
+    assert bucket(np.array([1, 7, 29.9, 30, 400]), np.array([7, 30])).tolist() == [0, 1, 1, 2, 2]
+
+
+def test_calc_portfolio(client):
+    """
+    GIVEN long and short calls and puts on two underlyings
+    WHEN post the portfolio
+    THEN The net values are the sums of the values of the positions times their quantity, and every
+        breakdown adds up to them
+    """
+    positions = [
+        dict(HULL, is_call=True, quantity=10, expiration=15, underlying="ABC"),
+        dict(HULL, is_call=False, quantity=-5, expiration=91.25, strike=60, underlying="ABC"),
+        dict(HULL, is_call=True, quantity=3, expiration=400, spot=70, underlying="XYZ"),
+    ]
+    res = client.post("/calc/portfolio/", json={"positions": positions})
+    assert res.status_code == 200
+
+    data = res.get_json()
+    expiration = np.array([15, 91.25, 400]) / 365
+    result = price_options(np.array([50, 50, 70]), np.array([50, 60, 50]), 0.1, 0.3, expiration)
+    quantity = np.array([10, -5, 3])
+    is_call = np.array([True, False, True])
+    for greek in GREEKS:
+        expected = (quantity * np.where(is_call, result['call'][greek], result['put'][greek])).sum()
+        assert abs(data["net"][greek] - expected) < 1e-3
+        for breakdown in data["buckets"].values():
+            assert abs(sum(group[greek] for group in breakdown) - data["net"][greek]) < 1e-2
+
+    assert data["positions"] == 3
+    assert [group["positions"] for group in data["buckets"]["expiry"]] == [0, 1, 0, 1, 0, 1, 0]
+    assert [(group["bucket"], group["positions"]) for group in data["buckets"]["moneyness"]] == [
+        ("<0.8", 0), ("0.8-0.95", 1), ("0.95-1.05", 1), ("1.05-1.2", 0), (">=1.2", 1)]
+    assert [group["bucket"] for group in data["buckets"]["underlying"]] == ["ABC", "XYZ"]
+
+
+def test_calc_portfolio_columns_and_errors(client):
+    """
+    GIVEN a portfolio as columns, custom buckets and an invalid portfolio
+    WHEN post them
+    THEN The columns are aggregated and the invalid positions are reported
+    """
+    columns = dict(HULL, is_call=[True, False], strike=[45, 55], expiration=[10, 100], quantity=2)
+    res = client.post("/calc/portfolio/", json={"positions": columns, "expiry_buckets": [30]})
+    assert res.status_code == 200
+    assert [group["bucket"] for group in res.get_json()["buckets"]["expiry"]] == ["<30d", ">=30d"]
+    assert res.get_json()["buckets"]["underlying"][0]["positions"] == 2
+
+    res = client.post("/calc/portfolio/", json={"positions": [dict(HULL, expiration=10, is_call=True),
+                                                              dict(HULL, expiration=10, is_call="call")]})
+    assert res.status_code == 400
+    assert res.get_json()["errors"] == [{"index": 1, "message": "invalid is_call"}]
+
+    for underlying in ([1], {"a": 1}, None):
+        res = client.post("/calc/portfolio/", json={"positions": [dict(HULL, expiration=10, is_call=True,
+                                                                       underlying=underlying)]})
+        assert res.status_code == 400
+        assert res.get_json()["errors"] == [{"index": 0, "message": "invalid underlying"}]
@@ -0,0 +1,141 @@
+import numpy as np
+
+from application.calc.pricing import ALL_GREEKS, GREEKS, HIGHER_GREEKS, carry, price_options, year_fraction
+
+
+def test_price_options_hull():
+    """
+    GIVEN param hull exercice
+    WHEN price with the kernel
+    THEN Have the right result
+    """
+    result = price_options(50, 50, 0.1, 0.3, year_fraction(3, 'months'))
+
+    assert round(float(result['call']['price']), 3) == 3.610
+    assert round(float(result['call']['delta']), 3) == 0.595
+    assert round(float(result['call']['theta']), 3) == -8.428
+    assert round(float(result['call']['gamma']), 3) == 0.052
+    assert round(float(result['call']['vega']), 3) == 9.687
+    assert round(float(result['call']['rho']), 3) == 6.541
+
+    assert round(float(result['put']['price']), 3) == 2.376
+    assert round(float(result['put']['delta']), 3) == -0.405
+    assert round(float(result['put']['theta']), 3) == -3.552
+    assert round(float(result['put']['rho']), 3) == -5.650
+
+
+def test_price_options_broadcast():
+    """
+    GIVEN an array of spots
+    WHEN price with the kernel
+    THEN Have the same result as scalar calls and put-call parity holds
+    """
+    spots = np.arange(40, 60)
+    result = price_options(spots, 50, 0.1, 0.3, 0.5, 0.03)
+
+    assert result['call']['price'].shape == spots.shape
+    for i, spot in enumerate(spots):
+        scalar = price_options(spot, 50, 0.1, 0.3, 0.5, 0.03)
+        assert np.isclose(result['call']['theta'][i], scalar['call']['theta'])
+
+    parity = spots * np.exp(-0.03 * 0.5) - 50 * np.exp(-0.1 * 0.5)
+    assert np.allclose(result['call']['price'] - result['put']['price'], parity)
+
+
+def test_price_options_scalar_path():
+    """
+    GIVEN scalar inputs
+    WHEN price with the kernel
+    THEN Have python floats equal to the array path
+    """
+    scalar = price_options(50., 45., 0.1, 0.3, 0.25, 0.02)
+    array = price_options(np.array([50.]), 45., 0.1, 0.3, 0.25, 0.02)
+
+    for side in ('call', 'put'):
+        for greek, value in scalar[side].items():
+            assert isinstance(value, float)
+            assert np.isclose(value, array[side][greek][0], rtol=1e-12)
+
+
+def test_price_options_higher_greeks():
+    """
+    GIVEN calls and puts with a dividend
+    WHEN ask for the higher order greeks
+    THEN They match finite differences of the first order greeks, in calendar time for charm and color
+    """
+    spot, strike, rate, drift, time_exp, dividend = np.array([40.0, 50.0, 65.0]), 50, 0.05, 0.3, 0.5, 0.02
+    result = price_options(spot, strike, rate, drift, time_exp, dividend, HIGHER_GREEKS)
+    h = 1e-4
+
+    def bumped(greek, side, d_spot=0.0, d_drift=0.0, d_time=0.0):
+        return price_options(spot + d_spot, strike, rate, drift + d_drift, time_exp + d_time, dividend)[side][greek]
+
+    for side in ('call', 'put'):
+        expected = {
+            'vanna': (bumped('delta', side, d_drift=h) - bumped('delta', side, d_drift=-h)) / (2 * h),
+            'volga': (bumped('vega', side, d_drift=h) - bumped('vega', side, d_drift=-h)) / (2 * h),
+            'charm': (bumped('delta', side, d_time=-h) - bumped('delta', side, d_time=h)) / (2 * h),
+            'speed': (bumped('gamma', side, d_spot=h) - bumped('gamma', side, d_spot=-h)) / (2 * h),
+            'color': (bumped('gamma', side, d_time=-h) - bumped('gamma', side, d_time=h)) / (2 * h),
+            'zomma': (bumped('gamma', side, d_drift=h) - bumped('gamma', side, d_drift=-h)) / (2 * h),
+        }
+        for greek in HIGHER_GREEKS:
+            assert np.allclose(result[side][greek], expected[greek], rtol=1e-5, atol=1e-8), greek
+            scalar = price_options(65.0, strike, rate, drift, time_exp, dividend, (greek,))[side][greek]
+            assert np.isclose(scalar, result[side][greek][2], rtol=1e-12)
+
+
+def test_price_options_greeks_opt_in():
+    """
+    GIVEN a contract
+    WHEN ask for some greeks
+    THEN Only those are computed, the higher order greeks are left out by default
+    """
+    result = price_options(50, 50, 0.05, 0.3, 0.5)
+    assert set(result['call']) == set(GREEKS)
+    result = price_options(50, 50, 0.05, 0.3, 0.5, greeks=('vanna', 'charm'))
+    assert set(result['call']) == set(result['put']) == {'vanna', 'charm'}
+
+
+def test_calc_option_and_curve_higher_greeks(client):
+    """
+    GIVEN an option and a curve asking for higher order greeks
+    WHEN post them
+    THEN The requested greeks are returned with 6 decimals, american options refuse them
+    """
+    option = {"spot": 50, "strike": 50, "rate": 0.05, "drift": 0.3, "expiration": 6, "time": "months",
+              "dividend": 0.02}
+    expected = price_options(50, 50, 0.05, 0.3, 0.5, 0.02, ALL_GREEKS)
+    res = client.post("/calc/option/Dividend/", json=dict(option, greeks=["price", "vanna", "color"]))
+    assert res.status_code == 200
+    call, put = res.get_json()
+    assert call == {"name": "Call", "price": round(expected['call']['price'], 3),
+                    "vanna": round(expected['call']['vanna'], 6), "color": round(expected['call']['color'], 6)}
+    assert put["vanna"] == call["vanna"]
+
+    res = client.post("/calc/option/Dividend/", json=option)
+    assert set(res.get_json()[0]) == {"name", *GREEKS}
+
+    res = client.post("/calc/option/Dividend/", json=dict(option, greeks=["zomma"], exercise="american"))
+    assert res.status_code == 400
+    assert res.get_json()["errors"][0]["field"] == "greeks"
+
+    curve = {"spot_b": 45, "spot_e": 55, "strike": 50, "rate": 0.05, "drift": 0.3, "expiration": 182.5,
+             "dividend": 0.02, "greeks": ["speed", "charm"]}
+    res = client.post("/calc/curve/Dividend/", json=curve)
+    assert res.status_code == 200
+    expected = price_options(np.arange(45, 55), 50, 0.05, 0.3, 0.5, 0.02, ALL_GREEKS)
+    assert res.get_json()["put"]["charm"] == np.round(expected['put']['charm'], 6).tolist()
+    res = client.post("/calc/curve/Dividend/", json=dict(curve, method="pde"))
+    assert res.get_json()["errors"][0]["field"] == "greeks"
+
+
+def test_carry():
+    """
+    GIVEN options of both types
+    WHEN take their dividend yield
+    THEN Only the Dividend ones keep it, as a float for a single option and a column for a batch
+    """
+    assert carry('Dividend', 0.03) == 0.03 and carry('Vanilla', 0.03) == 0.0
+    assert isinstance(carry('Dividend', 0.03), float)
+    assert carry(np.array(['Vanilla', 'Dividend']), np.array([0.02, 0.03])).tolist() == [0.0, 0.03]
@@ -0,0 +1,73 @@
+import numpy as np
+
+from application.calc.pricing import price_options
+from application.calc.scenarios import CHUNK_POINTS, full_revaluation, taylor_revaluation
+
+SPOT_SHOCKS = np.array([-0.2, -0.01, 0, 0.01, 0.2])
+VOL_SHOCKS = np.array([-0.01, 0, 0.01])
+
+
+def book(size, seed=0):
+    """Kernel inputs, sides and quantities of a random book"""
+    generator = np.random.default_rng(seed)
+    inputs = (generator.uniform(40, 60, size), generator.uniform(40, 60, size), 0.05,
+              generator.uniform(0.15, 0.4, size), generator.uniform(0.1, 2, size), 0.0)
+    return inputs, generator.random(size) < 0.5, generator.integers(-10, 10, size).astype(float)
+
+
+def test_full_revaluation_reprices_the_book():
+    """
+    GIVEN a book larger than a chunk of the grid
+    WHEN fully revalue it
+    THEN Every cell is the repriced book minus its value, the unshocked cell is null
+    """
+    size = CHUNK_POINTS // (SPOT_SHOCKS.size * VOL_SHOCKS.size) + 7
+    inputs, is_call, quantity = book(size)
+    spot, strike, rate, drift, time_exp, dividend = inputs
+
+    pnl = full_revaluation(inputs, is_call, quantity, SPOT_SHOCKS, VOL_SHOCKS)
+
+    def value(spot_shock, vol_shock):
+        result = price_options(spot * (1 + spot_shock), strike, rate, drift + vol_shock, time_exp, dividend)
+        return (quantity * np.where(is_call, result['call']['price'], result['put']['price'])).sum()
+
+    assert pnl.shape == (3, 5)
+    assert abs(pnl[1, 2]) < 1e-6
+    assert np.isclose(pnl[0, 4], value(0.2, -0.01) - value(0, 0))
+
+
+def test_taylor_matches_full_for_small_shocks():
+    """
+    GIVEN a book and small shocks
+    WHEN approximate the P&L from the greeks
+    THEN It is close to the full revaluation
+    """
+    inputs, is_call, quantity = book(1000)
+
+    full = full_revaluation(inputs, is_call, quantity, SPOT_SHOCKS[1:4], VOL_SHOCKS)
+    taylor = taylor_revaluation(inputs, is_call, quantity, SPOT_SHOCKS[1:4], VOL_SHOCKS)
+
+    assert np.allclose(taylor, full, atol=1e-2 * np.abs(full).max())
+
+
+def test_calc_scenarios(client):
+    """
+    GIVEN a long call
+    WHEN post a scenario grid, fully revalued and approximated
+    THEN The P&L grows with the spot and the volatility
+    """
+    position = {"type_option": "Vanilla", "spot": 50, "strike": 50, "rate": 0.1, "drift": 0.3, "expiration": 3,
+                "time": "months", "is_call": True, "quantity": 10}
+
+    for method in ('full', 'taylor'):
+        res = client.post("/calc/scenarios/", json={"positions": [position], "method": method,
+                                                    "spot_shocks": [-0.1, 0, 0.1], "vol_shocks": [0, 0.05]})
+        assert res.status_code == 200
+        pnl = np.array(res.get_json()["pnl"])
+        assert pnl.shape == (2, 3)
+        assert pnl[0, 1] == 0
+        assert (np.diff(pnl, axis=1) > 0).all() and (np.diff(pnl, axis=0) > 0).all()
+
+    res = client.post("/calc/scenarios/", json={"positions": [position], "spot_shocks": [-1]})
+    assert res.status_code == 400
+    assert res.get_json()["errors"][0]["field"] == "spot_shocks"
@@ -0,0 +1,20 @@
+import numpy as np
+from scipy import stats
+
+from application.calc import special
+
+
+def test_special_matches_scipy():
+    """
+    GIVEN points from the far left tail to the far right tail
+    WHEN compute the normal CDF and PDF with both paths
+    THEN Have the scipy values within the documented accuracy
+    """
+    xs = np.linspace(-38, 38, 20001)
+    cdf = stats.norm.cdf(xs)
+    pdf = stats.norm.pdf(xs)
+
+    assert np.array_equal(special.cdf(xs), cdf)
+    assert np.allclose(special.pdf(xs), pdf, rtol=1e-15, atol=0)
+    assert np.allclose([special.cdf_scalar(x) for x in xs], cdf, rtol=5e-13, atol=3e-16)
+    assert np.allclose([special.pdf_scalar(x) for x in xs], pdf, rtol=5e-16, atol=6e-17)
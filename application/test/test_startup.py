@@ -0,0 +1,50 @@
+import json
+
+from application import apispec, create_app
+
+
+def test_fast_start_without_swagger_ui():
+    """
+    GIVEN an app in fast start mode with the Swagger UI disabled
+    WHEN request the docs and an option
+    THEN The docs are not served and the option is priced
+    """
+    app = create_app({"TESTING": True, "FAST_START": True, "SWAGGER_UI": False})
+    client = app.test_client()
+
+    assert 'flasgger.apidocs' not in app.view_functions
+    assert client.get('/apidocs/').status_code == 404
+    payload = {"spot": 50, "strike": 51, "rate": 0.1, "drift": 0.3, "expiration": 15, "time": "days", "dividend": 0}
+    response = client.post('/calc/option/Vanilla/', json=payload)
+    assert response.status_code == 200
+
+
+def test_prebuilt_apispec(tmp_path):
+    """
+    GIVEN a spec built with application.apispec
+    WHEN an app without the Swagger UI serves it
+    THEN /apispec_1.json answers the prebuilt spec
+    """
+    path = str(tmp_path / 'apispec.json')
+    apispec.build(path)
+    with open(path) as spec:
+        expected = json.load(spec)
+    assert '/calc/option/{type_option}/' in expected['paths']
+
+    app = create_app({"TESTING": True, "SWAGGER_UI": False, "APISPEC_PATH": path})
+    response = app.test_client().get('/apispec_1.json')
+
+    assert response.status_code == 200
+    assert response.json == expected
+
+
+def test_startup_metrics(client):
+    """
+    GIVEN an app
+    WHEN request /metrics
+    THEN The startup duration of every phase is reported
+    """
+    text = client.get('/metrics').get_data(as_text=True)
+
+    for phase in ('config', 'swagger', 'extensions', 'routes', 'warmup', 'total'):
+        assert 'getgreeks_startup_seconds{{phase="{}"}}'.format(phase) in text
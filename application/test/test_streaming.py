@@ -0,0 +1,100 @@
+import tracemalloc
+
+from application.calc.pricing import GREEKS, price_options
+from application.calc.streaming import NDJSON, read_positions, stream_values
+
+LINE = (b'{"type_option": "Vanilla", "spot": 50, "strike": 50, "rate": 0.1, "drift": 0.3, "expiration": 3, '
+        b'"time": "months"}\n')
+
+
+class Book:
+    """Body of a book of identical NDJSON positions generated while it is read"""
+
+    def __init__(self, size):
+        self.left = size
+
+    def read(self, size):
+        count = min(self.left, max(size // len(LINE), 1))
+        self.left -= count
+        return LINE * count
+
+
+def peak_memory(size):
+    """Peak of the memory allocated while streaming the values of a book"""
+    tracemalloc.start()
+    try:
+        lines = 0
+        for text in stream_values(read_positions(Book(size), NDJSON, 1000), list(GREEKS), price_options, NDJSON):
+            lines += text.count('\n')
+        assert lines == size
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_stream_memory_bounded_by_chunk():
+    """
+    GIVEN books of 3k and 15k positions
+    WHEN stream their values by chunks of 1000 positions
+    THEN The peak memory does not grow with the size of the book
+    """
+    peak_memory(1000)
+
+    assert peak_memory(15000) < 1.5 * peak_memory(3000)
+
+
+def test_calc_options_stream(client):
+    """
+    GIVEN an NDJSON book with an undecodable line, a CSV book with an invalid position and one with empty dividends
+    WHEN stream them
+    THEN Every position gets its values or its error, in the format asked for, an empty dividend being null
+    """
+    body = LINE + b'not json\n\n' + LINE.replace(b'months', b'weeks')
+    res = client.post("/calc/options/stream/?greeks=price,delta", data=body, content_type=NDJSON)
+    assert res.status_code == 200
+    assert res.mimetype == NDJSON
+    assert res.get_data(as_text=True).splitlines() == [
+        '{"index": 0, "call.price": 3.61, "call.delta": 0.595, "put.price": 2.376, "put.delta": -0.405}',
+        '{"index": 1, "error": "invalid line"}',
+        '{"index": 2, "error": "invalid time"}',
+    ]
+
+    body = (b'type_option,spot,strike,rate,drift,expiration,time\n'
+            b'Vanilla,50,50,0.1,0.3,3,months\nVanilla,50,50,0.1,,3,months\n')
+    res = client.post("/calc/options/stream/?greeks=price", data=body, content_type='text/csv')
+    assert res.mimetype == 'text/csv'
+    assert res.get_data(as_text=True) == 'index,call.price,put.price,error\n0,3.61,2.376,\n1,,,invalid drift\n'
+
+    res = client.post("/calc/options/stream/?greeks=price", data=body, content_type='text/csv',
+                      headers={"Accept": NDJSON})
+    assert res.get_data(as_text=True).splitlines()[0] == '{"index": 0, "call.price": 3.61, "put.price": 2.376}'
+
+    body = (b'type_option,spot,strike,rate,drift,expiration,time,dividend\n'
+            b'Vanilla,50,50,0.1,0.3,3,months,\nDividend,50,50,0.1,0.3,3,months\n')
+    res = client.post("/calc/options/stream/?greeks=price", data=body, content_type='text/csv')
+    assert res.get_data(as_text=True) == 'index,call.price,put.price,error\n0,3.61,2.376,\n1,3.61,2.376,\n'
+
+
+def test_calc_options_stream_not_utf8(client):
+    """
+    GIVEN NDJSON and CSV books with a line which is not UTF-8
+    WHEN stream them
+    THEN That line is reported invalid and the others are priced
+    """
+    body = LINE.replace(b'months', b'mo\xffnths') + LINE
+    res = client.post("/calc/options/stream/?greeks=price", data=body, content_type=NDJSON)
+    assert res.status_code == 200
+    assert res.get_data(as_text=True).splitlines() == [
+        '{"index": 0, "error": "invalid line"}',
+        '{"index": 1, "call.price": 3.61, "put.price": 2.376}',
+    ]
+
+    body = (b'type_option,spot,strike,rate,drift,expiration,time\n'
+            b'Vanilla,50,50,0.1,0.3,3,months\nVanilla,50,50,0.1,0.3,3,\xe9months\nVanilla,50,50,0.1,0.3,3,months')
+    res = client.post("/calc/options/stream/?greeks=price", data=body, content_type='text/csv')
+    assert res.get_data(as_text=True) == 'index,call.price,put.price,error\n0,3.61,2.376,\n1,,,invalid line\n' \
+        '2,3.61,2.376,\n'
+
+    res = client.post("/calc/options/stream/?greeks=price,speed", data=body, content_type='application/json')
+    assert res.status_code == 400
+    assert [error["field"] for error in res.get_json()["errors"]] == ["Content-Type", "greeks"]
@@ -0,0 +1,55 @@
+import numpy as np
+
+from application import create_app
+from application.calc.pricing import price_options
+from application.calc.tables import GreekTables, max_error_check
+
+
+def test_tables_error_bound():
+    """
+    GIVEN tables on a coarse grid
+    WHEN interpolate random points of the domain
+    THEN The error stays below the announced bound
+    """
+    tables = GreekTables.build(121, 60)
+
+    assert max_error_check(tables) <= tables.error_bound
+
+
+def test_tables_price_options(tmp_path):
+    """
+    GIVEN tables saved then memory-mapped, contracts inside and outside the domain
+    WHEN price them
+    THEN Have the exact values within the bound, and exactly outside the domain
+    """
+    path = str(tmp_path / "tables.npy")
+    tables = GreekTables.from_file(path, 601, 300)
+    assert isinstance(tables.values, np.memmap)
+
+    spot = np.array([40., 50., 60., 50.])
+    drift = np.array([0.2, 0.3, 0.4, 0.0001])
+    approx = tables.price_options(spot, 50, 0.1, drift, 0.5, 0.02)
+    exact = price_options(spot, 50, 0.1, drift, 0.5, 0.02)
+
+    bound = (spot + 50) * tables.error_bound
+    for side in ('call', 'put'):
+        assert np.all(np.abs(approx[side]['price'] - exact[side]['price']) <= bound)
+    assert approx['call']['price'][3] == exact['call']['price'][3]
+
+
+def test_calc_option_tables():
+    """
+    GIVEN an app answering from the tables
+    WHEN ask for the hull exercice
+    THEN Have the right result
+    """
+    client = create_app({"TESTING": True, "CALC_TABLES": True}).test_client()
+    res = client.post("/calc/option/Vanilla/", json={
+        "spot": 50, "strike": 50, "rate": 0.1, "drift": 0.3, "expiration": 3, "time": "months", "dividend": 0
+    })
+
+    data = res.get_json()
+
+    assert data[0]["price"] == 3.610
+    assert data[1]["price"] == 2.376
+    assert client.get("/calc/tables/").get_json()["enabled"]
@@ -0,0 +1,161 @@
+import numpy as np
+import pytest
+
+from application.calc.validation import CONTRACT, OPTION, ValidationError
+
+HULL = {"spot": 50, "strike": 50, "rate": 0.1, "drift": 0.3, "expiration": 3, "time": "months", "dividend": 0}
+
+
+def test_schema_lists_every_invalid_field():
+    """
+    GIVEN an option payload with a missing, an out of bounds and a non numeric field
+    WHEN validate it
+    THEN Every invalid field is reported
+    """
+    payload = dict(HULL, rate=2, drift="high")
+    del payload["strike"]
+
+    with pytest.raises(ValidationError) as error:
+        OPTION.validate(payload, type_option='Vanilla')
+
+    assert error.value.errors == [
+        {"field": "strike", "message": "missing"},
+        {"field": "rate", "message": "must be between -1 and 1"},
+        {"field": "drift", "message": "must be a number"},
+    ]
+
+
+def test_schema_rows_are_validated_by_column():
+    """
+    GIVEN a large batch with bad rows, given as objects and as columns
+    WHEN validate the rows
+    THEN Both forms find the same first error of every bad row
+    """
+    size = 100000
+    rows = [dict(HULL, type_option="Vanilla", spot=40 + index % 20) for index in range(size)]
+    rows[10]["spot"] = -1
+    rows[20]["time"] = "weeks"
+    del rows[30]["rate"]
+    rows[40]["drift"] = None
+    columns = {name: [row.get(name) for row in rows] for name, _ in CONTRACT.fields}
+    columns["rate"][30] = "missing"
+
+    for batch in (rows, columns):
+        values, valid, errors = CONTRACT.validate_rows(batch)
+        assert valid.sum() == size - 4
+        assert values["spot"].shape == (size,)
+
+    assert CONTRACT.validate_rows(rows)[2] == [
+        {"index": 10, "message": "invalid spot"},
+        {"index": 20, "message": "invalid time"},
+        {"index": 30, "message": "missing rate"},
+        {"index": 40, "message": "invalid drift"},
+    ]
+    assert CONTRACT.validate_rows(columns)[2][2] == {"index": 30, "message": "invalid rate"}
+
+
+def test_numbers_are_not_booleans_or_strings(client):
+    """
+    GIVEN payloads giving numbers as booleans or as numeric strings
+    WHEN validate them and post them
+    THEN They are rejected, one field or one row at a time
+    """
+    with pytest.raises(ValidationError) as error:
+        OPTION.validate(dict(HULL, spot=True, strike="50"), type_option='Vanilla')
+    assert error.value.errors == [{"field": "spot", "message": "must be a number"},
+                                  {"field": "strike", "message": "must be a number"}]
+
+    rows = [dict(HULL, type_option="Vanilla", spot=spot) for spot in (50, True, "50")]
+    assert CONTRACT.validate_rows(rows)[2] == [{"index": 1, "message": "invalid spot"},
+                                               {"index": 2, "message": "invalid spot"}]
+
+    res = client.post("/calc/option/Vanilla/", json=dict(HULL, spot=True))
+    assert res.status_code == 400
+    res = client.post("/calc/implied_vol/Vanilla/", json={"price": [3.61, "3.61"], "spot": 50, "strike": 50,
+                                                          "rate": 0.1, "expiration": 3, "time": "months",
+                                                          "is_call": True})
+    assert res.get_json()["errors"] == [{"field": "price", "message": "must be a number or an array of numbers"}]
+
+
+def test_dividend_bounds_only_apply_to_dividend_options(client):
+    """
+    GIVEN legacy Vanilla payloads with a dividend above 1, and the same Dividend options
+    WHEN post them, alone and in a batch
+    THEN The Vanilla options are priced ignoring it, the Dividend ones are rejected
+    """
+    payload = dict(HULL, dividend=3)
+    assert client.post("/calc/option/Vanilla/", json=payload).status_code == 200
+    curve = {"spot_b": 40, "spot_e": 60, "strike": 50, "rate": 0.1, "drift": 0.3, "expiration": 15, "dividend": 3}
+    assert client.post("/calc/delta/Vanilla/", json=curve).status_code == 200
+
+    for res in (client.post("/calc/option/Dividend/", json=payload), client.post("/calc/delta/Dividend/", json=curve)):
+        assert res.status_code == 400
+        assert res.get_json()["errors"] == [{"field": "dividend", "message": "must be between 0 and 1"}]
+
+    contracts = [dict(payload, type_option="Vanilla"), dict(payload, type_option="Dividend")]
+    res = client.post("/calc/options/batch/", json={"contracts": contracts})
+    assert res.get_json()["errors"] == [{"index": 1, "message": "invalid dividend"}]
+
+
+def test_calc_option_zero_rate(client):
+    """
+    GIVEN a null rate and no dividend
+    WHEN post an option
+    THEN The option is priced
+    """
+    payload = dict(HULL, rate=0)
+    del payload["dividend"]
+
+    res = client.post("/calc/option/Vanilla/", json=payload)
+
+    assert res.status_code == 200
+    assert res.get_json()[0]["rho"] > 0
+
+
+def test_calc_routes_structured_errors(client):
+    """
+    GIVEN payloads with missing or out of bounds fields
+    WHEN post them to the calc routes
+    THEN Every route answers a 400 listing the invalid fields
+    """
+    res = client.post("/calc/option/Vanilla/", json={"spot": 50})
+    assert res.status_code == 400
+    assert res.get_json()["message"] == "invalid arguments"
+    assert {error["field"] for error in res.get_json()["errors"]} == {"strike", "rate", "drift", "expiration", "time"}
+
+    res = client.post("/calc/delta/Exotic/", json={"spot_b": 40, "spot_e": 60, "strike": 50, "rate": 0.1,
+                                                   "drift": -0.3, "expiration": 15})
+    assert res.get_json()["errors"] == [{"field": "type_option", "message": "must be one of Vanilla, Dividend"},
+                                        {"field": "drift", "message": "must be greater than 0 and at most 5"}]
+
+    res = client.post("/calc/surface/Vanilla/", json={"spot_b": 40, "spot_e": 60, "spot_steps": 2000,
+                                                      "expiration_b": 1, "expiration_e": 90,
+                                                      "expiration_steps": 1000, "strike": 50, "rate": 0.1,
+                                                      "drift": 0.3})
+    assert res.status_code == 400
+    assert res.get_json()["errors"][0]["field"] == "expiration_steps"
+
+    res = client.post("/calc/implied_vol/Vanilla/", json={"price": [3.61, -1], "spot": 50, "strike": [50, 50],
+                                                          "rate": 0.1, "expiration": [91.25, 91.25],
+                                                          "is_call": [True, False]})
+    assert res.get_json()["errors"] == [{"field": "price", "message": "must be at least 0", "index": [1]}]
+
+    res = client.post("/calc/options/batch/", data="not json")
+    assert res.status_code == 400
+
+
+def test_calc_options_batch_columns(client):
+    """
+    GIVEN the same contracts as objects and as columns
+    WHEN post both batches
+    THEN The results are the same
+    """
+    rows = [dict(HULL, type_option="Vanilla", strike=strike) for strike in np.linspace(40, 60, 11).tolist()]
+    columns = {name: [row[name] for row in rows] for name in rows[0]}
+    columns["type_option"] = "Vanilla"
+
+    by_rows = client.post("/calc/options/batch/", json={"contracts": rows}).get_json()
+    by_columns = client.post("/calc/options/batch/", json={"contracts": columns}).get_json()
+
+    assert by_rows == by_columns
+    assert by_rows["errors"] == []
@@ -0,0 +1,42 @@
+"""Convergence and cost of the pde curve against the closed form.
+
+Run from the repository root with ``python -m benchmarks.bench_pde``.
+
+Every row solves the curve of the calls and puts of /calc/curve/ on a grid and
+reports the largest absolute error of each greek over the spots of the curve,
+the error dividing by about 4 when both steps double (second order).
+"""
+import timeit
+
+import numpy as np
+
+from application.calc import pde
+from application.calc.pricing import price_options
+
+SPOTS = np.arange(40, 60)
+CONTRACT = (50, 0.1, 0.3, 91.25 / 365, 0.03)
+GRIDS = ((50, 25), (100, 50), (200, 100), (400, 200), (800, 400), (1600, 800))
+
+
+def errors(space_steps, time_steps):
+    """Largest absolute error of every pde greek over SPOTS, calls and puts"""
+    result = pde.solve(SPOTS, *CONTRACT, space_steps=space_steps, time_steps=time_steps)
+    expected = price_options(SPOTS, *CONTRACT)
+    return [max(np.abs(result[side][greek] - expected[side][greek]).max() for side in ('call', 'put'))
+            for greek in pde.GREEKS]
+
+
+def main():
+    pde.solve(SPOTS, *CONTRACT)
+    print('{:>8}{:>8}{:>10}'.format('space', 'time', 'ms') + ''.join('{:>12}'.format(greek) for greek in pde.GREEKS))
+    for space_steps, time_steps in GRIDS:
+        duration = min(timeit.repeat(lambda: pde.solve(SPOTS, *CONTRACT, space_steps=space_steps,
+                                                       time_steps=time_steps), number=3, repeat=3)) / 3
+        print('{:>8}{:>8}{:>10.2f}'.format(space_steps, time_steps, duration * 1000)
+              + ''.join('{:>12.2e}'.format(error) for error in errors(space_steps, time_steps)))
+    closed_form = min(timeit.repeat(lambda: price_options(SPOTS, *CONTRACT), number=100, repeat=3)) / 100
+    print('closed form {:.3f} ms for {} spots'.format(closed_form * 1000, SPOTS.size))
+
+
+if __name__ == '__main__':
+    main()
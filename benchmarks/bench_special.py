@@ -0,0 +1,43 @@
+"""Per-call cost of the normal CDF/PDF paths against scipy.stats.norm.
+
+Run from the repository root with ``python -m benchmarks.bench_special``.
+"""
+import timeit
+
+import numpy as np
+from scipy import stats
+
+from application.calc import special
+from application.calc.pricing import price_options
+
+SIZE = 10000
+
+
+def per_call(statement, number):
+    """Best time of one call of `statement`, in microseconds"""
+    return min(timeit.repeat(statement, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    x = 0.2417
+    xs = np.linspace(-5, 5, SIZE)
+
+    rows = [
+        ('cdf scalar', per_call(lambda: stats.norm.cdf(x), 2000), per_call(lambda: special.cdf_scalar(x), 200000)),
+        ('pdf scalar', per_call(lambda: stats.norm.pdf(x), 2000), per_call(lambda: special.pdf_scalar(x), 200000)),
+        ('cdf array', per_call(lambda: stats.norm.cdf(xs), 200), per_call(lambda: special.cdf(xs), 200)),
+        ('pdf array', per_call(lambda: stats.norm.pdf(xs), 200), per_call(lambda: special.pdf(xs), 200)),
+        ('option scalar', None, per_call(lambda: price_options(50., 50., 0.1, 0.3, 0.25), 20000)),
+    ]
+
+    print('{:<16}{:>14}{:>14}{:>10}'.format('', 'scipy (us)', 'special (us)', 'gain'))
+    for name, reference, fast in rows:
+        if reference is None:
+            print('{:<16}{:>14}{:>14.3f}{:>10}'.format(name, '-', fast, '-'))
+        else:
+            print('{:<16}{:>14.3f}{:>14.3f}{:>9.1f}x'.format(name, reference, fast, reference / fast))
+    print('array rows use {} points'.format(SIZE))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+"""Load test of the calc routes against a running server.
+
+Start the production profile and load it from another shell::
+
+    gunicorn app:app
+    python -m benchmarks.load --url http://127.0.0.1:8000 --duration 30 --concurrency 32
+
+or let the script start gunicorn with gunicorn.conf.py and stop it at the end::
+
+    python -m benchmarks.load --serve --duration 30
+
+Every client thread keeps one HTTP/1.1 connection open and posts the example
+payloads of the benchmark suite in turn, to every route of --routes. The
+report gives, per route and in total, the number of requests, the errors, the
+requests per second and the p50/p99 latency in milliseconds, as JSON.
+"""
+import argparse
+import http.client
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from .run import CURVE, IMPLIED_VOL, OPTION, SURFACE
+
+ROUTES = {
+    'option': ('/calc/option/Dividend/', OPTION),
+    'delta': ('/calc/delta/Dividend/', CURVE),
+    'curve': ('/calc/curve/Dividend/', CURVE),
+    'surface': ('/calc/surface/Dividend/', dict(SURFACE, spot_steps=20, expiration_steps=20)),
+    'batch': ('/calc/options/batch/', {"contracts": [dict(OPTION, type_option='Dividend')] * 100}),
+    'implied_vol': ('/calc/implied_vol/Vanilla/', IMPLIED_VOL),
+}
+
+
+def client(url, routes, deadline):
+    """Post the payloads of routes in turn until deadline, latencies in milliseconds and errors by route"""
+    parts = urlsplit(url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+    bodies = [(name, ROUTES[name][0], json.dumps(ROUTES[name][1])) for name in routes]
+    latencies = {name: [] for name in routes}
+    errors = {name: 0 for name in routes}
+    index = 0
+    while time.perf_counter() < deadline:
+        name, path, body = bodies[index % len(bodies)]
+        index += 1
+        begin = time.perf_counter()
+        status = None
+        # A kept-alive connection is dropped when its worker is recycled, the request is sent again once
+        for _ in range(2):
+            try:
+                connection.request('POST', path, body, {'Content-Type': 'application/json'})
+                response = connection.getresponse()
+                response.read()
+                status = response.status
+                break
+            except (OSError, http.client.HTTPException):
+                connection.close()
+        if status != 200:
+            errors[name] += 1
+            continue
+        latencies[name].append((time.perf_counter() - begin) * 1000)
+    connection.close()
+    return latencies, errors
+
+
+def run(url, routes, duration, concurrency):
+    """Load url with concurrency clients for duration seconds, report of the requests by route"""
+    deadline = time.perf_counter() + duration
+    with ThreadPoolExecutor(concurrency) as executor:
+        results = list(executor.map(lambda _: client(url, routes, deadline), range(concurrency)))
+
+    report = {}
+    for name in routes + ['total']:
+        latencies = [latency for result, _ in results for route, values in result.items()
+                     if name in (route, 'total') for latency in values]
+        errors = sum(count for _, failed in results for route, count in failed.items() if name in (route, 'total'))
+        report[name] = {
+            "requests": len(latencies),
+            "errors": errors,
+            "rps": len(latencies) / duration,
+            "p50_ms": float(np.percentile(latencies, 50)) if latencies else None,
+            "p99_ms": float(np.percentile(latencies, 99)) if latencies else None,
+        }
+    return report
+
+
+def serve(port):
+    """gunicorn started with gunicorn.conf.py on port, once it answers"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, GUNICORN_BIND='127.0.0.1:{}'.format(port))
+    server = subprocess.Popen([sys.executable, '-m', 'gunicorn', '--config', 'gunicorn.conf.py', 'app:app'],
+                              cwd=root, env=env)
+    for _ in range(300):
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            connection.request('GET', '/metrics')
+            connection.getresponse().read()
+            connection.close()
+            return server
+        except OSError:
+            if server.poll() is not None:
+                raise RuntimeError('gunicorn exited with status {}'.format(server.returncode))
+            time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError('gunicorn did not answer on port {}'.format(port))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--url', default='http://127.0.0.1:8000', help='base url of the server')
+    parser.add_argument('--serve', action='store_true', help='start gunicorn on the port of --url for the test')
+    parser.add_argument('--duration', type=float, default=10, help='seconds of load, 10 by default')
+    parser.add_argument('--concurrency', type=int, default=16, help='concurrent clients, 16 by default')
+    parser.add_argument('--routes', default=','.join(ROUTES), help='comma separated routes to load')
+    parser.add_argument('--output', help='file receiving the JSON report, stdout by default')
+    args = parser.parse_args(argv)
+
+    server = serve(urlsplit(args.url).port or 80) if args.serve else None
+    try:
+        report = run(args.url, args.routes.split(','), args.duration, args.concurrency)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    text = json.dumps({"url": args.url, "duration": args.duration, "concurrency": args.concurrency,
+                       "routes": report}, indent=2)
+    if args.output:
+        with open(args.output, 'w') as output:
+            output.write(text)
+    else:
+        print(text)
+    return 1 if report['total']['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
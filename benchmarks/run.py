@@ -0,0 +1,201 @@
+"""Benchmark suite of the calc routes and of the pricing kernels.
+
+Run from the repository root::
+
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --compare bench.json --tolerance 0.25
+
+Three groups are measured:
+
+- route: every /calc route through the Flask test client, cache disabled,
+- kernel: the pricing math alone, HTTP excluded,
+- scaling: the kernel, the curve route and the batch route from 10 points up to --max-size.
+
+Each benchmark reports its number of runs, p50/p99 latency in milliseconds and its
+throughput in points per second, as JSON. With --compare, benchmarks whose p50 grew
+by more than --tolerance against the baseline file are flagged and the exit code is 1.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+
+import numpy as np
+
+from application import create_app
+from application.calc.implied_vol import implied_volatility
+from application.calc.parallel import price_parallel
+from application.calc.pricing import price_options
+
+SIZES = (10, 100, 1000, 10000, 100000, 1000000)
+
+OPTION = {"spot": 50, "strike": 51, "rate": 0.1, "drift": 0.3, "expiration": 15, "time": "days", "dividend": 0.03}
+CURVE = {"spot_b": 40, "spot_e": 60, "strike": 50, "rate": 0.1, "drift": 0.3, "expiration": 15, "dividend": 0.03}
+SURFACE = {"spot_b": 40, "spot_e": 60, "spot_steps": 100, "expiration_b": 1, "expiration_e": 90,
+           "expiration_steps": 100, "strike": 50, "rate": 0.1, "drift": 0.3, "dividend": 0.03}
+
+IMPLIED_VOL = {"price": [3.61] * 100, "spot": 50, "strike": [50] * 100, "rate": 0.1, "expiration": [91.25] * 100,
+               "is_call": [True] * 100, "dividend": 0}
+
+
+def measure(function, min_time=0.2, min_runs=5, max_runs=1000):
+    """Latencies in milliseconds of repeated calls of function"""
+    function()
+    latencies = []
+    start = time.perf_counter()
+    while len(latencies) < min_runs or (time.perf_counter() - start < min_time and len(latencies) < max_runs):
+        begin = time.perf_counter()
+        function()
+        latencies.append((time.perf_counter() - begin) * 1000)
+    return latencies
+
+
+def summarize(group, name, size, latencies):
+    """Result record of a benchmark"""
+    p50 = float(np.percentile(latencies, 50))
+    return {
+        "group": group,
+        "name": name,
+        "size": size,
+        "runs": len(latencies),
+        "p50_ms": p50,
+        "p99_ms": float(np.percentile(latencies, 99)),
+        "throughput": size / p50 * 1000,
+    }
+
+
+def post(client, url, payload):
+    """Request function posting payload and checking the answer"""
+    def request():
+        response = client.post(url, json=payload)
+        assert response.status_code == 200, response.status_code
+    return request
+
+
+def contracts(size, seed=0):
+    """Random contract columns"""
+    generator = np.random.default_rng(seed)
+    return (generator.uniform(40, 60, size), generator.uniform(40, 60, size), 0.05,
+            generator.uniform(0.1, 0.6, size), generator.uniform(0.05, 2, size), 0.02)
+
+
+def bench_routes(client):
+    """Every calc route with its example payload"""
+    results = []
+    for name, url, payload in [
+        ('option', '/calc/option/Dividend/', OPTION),
+        ('delta', '/calc/delta/Dividend/', CURVE),
+        ('theta', '/calc/theta/Dividend/', CURVE),
+        ('gamma', '/calc/gamma/Dividend/', CURVE),
+        ('vega', '/calc/vega/Dividend/', CURVE),
+        ('rho', '/calc/rho/Dividend/', CURVE),
+        ('curve', '/calc/curve/Dividend/', CURVE),
+        ('surface', '/calc/surface/Dividend/', SURFACE),
+        ('batch', '/calc/options/batch/', {"contracts": [dict(OPTION, type_option='Dividend')] * 100}),
+        ('implied_vol', '/calc/implied_vol/Vanilla/', IMPLIED_VOL),
+    ]:
+        size = {'option': 1, 'surface': 10000, 'batch': 100, 'implied_vol': 100}.get(name, 20)
+        results.append(summarize('route', name, size, measure(post(client, url, payload))))
+    return results
+
+
+def bench_kernel():
+    """Pricing functions without HTTP"""
+    results = [summarize('kernel', 'price_options_scalar', 1,
+                         measure(lambda: price_options(50., 51., 0.1, 0.3, 0.04, 0.03)))]
+    spot, strike, rate, drift, time_exp, dividend = contracts(10000)
+    results.append(summarize('kernel', 'price_options', 10000,
+                             measure(lambda: price_options(spot, strike, rate, drift, time_exp, dividend))))
+    results.append(summarize('kernel', 'price_options_delta', 10000,
+                             measure(lambda: price_options(spot, strike, rate, drift, time_exp, dividend,
+                                                           ('delta',)))))
+    prices = price_options(spot, strike, rate, drift, time_exp, dividend, ('price',))['call']['price']
+    results.append(summarize('kernel', 'implied_volatility', 10000,
+                             measure(lambda: implied_volatility(prices, spot, strike, rate, time_exp, dividend,
+                                                                True))))
+    return results
+
+
+def bench_scaling(client, max_size, workers):
+    """Kernel, curve route and batch route over growing sizes"""
+    results = []
+    for size in (size for size in SIZES if size <= max_size):
+        inputs = contracts(size)
+        results.append(summarize('scaling', 'price_options', size, measure(lambda: price_options(*inputs))))
+        if workers > 1:
+            results.append(summarize('scaling', 'price_parallel', size,
+                                     measure(lambda: price_parallel(*inputs, workers=workers), min_runs=3)))
+        results.append(summarize('scaling', 'curve_route', size,
+                                 measure(post(client, '/calc/curve/Dividend/', dict(CURVE, spot_b=1,
+                                                                                    spot_e=size + 1)),
+                                         min_runs=3)))
+        batch = {"contracts": [dict(OPTION, type_option='Dividend', spot=float(spot)) for spot in inputs[0]]}
+        results.append(summarize('scaling', 'batch_route', size,
+                                 measure(post(client, '/calc/options/batch/', batch), min_runs=3)))
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Benchmarks of results whose p50 grew by more than tolerance against baseline"""
+    reference = {(record["group"], record["name"], record["size"]): record for record in baseline["results"]}
+    regressions = []
+    for record in results:
+        before = reference.get((record["group"], record["name"], record["size"]))
+        if before is not None and record["p50_ms"] > before["p50_ms"] * (1 + tolerance):
+            regressions.append({
+                "group": record["group"],
+                "name": record["name"],
+                "size": record["size"],
+                "baseline_p50_ms": before["p50_ms"],
+                "p50_ms": record["p50_ms"],
+                "ratio": record["p50_ms"] / before["p50_ms"],
+            })
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--output', help='file receiving the JSON results, stdout by default')
+    parser.add_argument('--compare', help='baseline JSON results to compare with')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='accepted p50 growth ratio, 0.25 by default')
+    parser.add_argument('--max-size', type=int, default=max(SIZES), help='largest size of the scaling group')
+    parser.add_argument('--workers', type=int, default=0, help='workers of the process pool in the scaling group')
+    parser.add_argument('--groups', default='route,kernel,scaling', help='comma separated groups to run')
+    args = parser.parse_args(argv)
+
+    client = create_app({"TESTING": True, "CALC_CACHE_SIZE": 0}).test_client()
+    groups = args.groups.split(',')
+    results = []
+    if 'route' in groups:
+        results += bench_routes(client)
+    if 'kernel' in groups:
+        results += bench_kernel()
+    if 'scaling' in groups:
+        results += bench_scaling(client, args.max_size, args.workers)
+
+    report = {
+        "meta": {"python": platform.python_version(), "numpy": np.__version__, "machine": platform.machine(),
+                 "time": time.strftime('%Y-%m-%dT%H:%M:%S')},
+        "results": results,
+    }
+    status = 0
+    if args.compare:
+        with open(args.compare) as baseline:
+            report["regressions"] = compare(results, json.load(baseline), args.tolerance)
+        status = 1 if report["regressions"] else 0
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as output:
+            output.write(text)
+    else:
+        print(text)
+    for regression in report.get("regressions", []):
+        print('REGRESSION {group}/{name}[{size}]: {baseline_p50_ms:.3f} -> {p50_ms:.3f} ms ({ratio:.2f}x)'
+              .format(**regression), file=sys.stderr)
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,4 +1,5 @@
 import os
+import tempfile
 
 
 class Config:
@@ -6,3 +7,53 @@ class Config:
 
     FLASK_ENV = os.getenv('FLASK_ENV', 'production')
     SECRET_KEY = os.getenv('FLASK_SECRET', 'Secret')
+
+    # Result cache of the calc routes, a null size disables it
+    CALC_CACHE_SIZE = int(os.getenv('CALC_CACHE_SIZE', 4096))
+    CALC_CACHE_TTL = float(os.getenv('CALC_CACHE_TTL', 5))
+    CALC_CACHE_PRECISION = int(os.getenv('CALC_CACHE_PRECISION', 8))
+
+    # Interpolated greek tables answering the option routes, built at startup or memory-mapped from a file
+    CALC_TABLES = os.getenv('CALC_TABLES', '0') == '1'
+    CALC_TABLES_PATH = os.getenv('CALC_TABLES_PATH', '')
+
+    # Coalescing of concurrent option requests into one pricing call, a null window disables it
+    CALC_COALESCE_WINDOW = float(os.getenv('CALC_COALESCE_WINDOW', 0))
+    CALC_COALESCE_MAX_BATCH = int(os.getenv('CALC_COALESCE_MAX_BATCH', 256))
+
+    # Batch and surface requests of at least this many points are priced by a pool of processes. Each server process
+    # has its own pool: gunicorn.conf.py shares the CPUs between its workers, a single process uses all of them
+    CALC_PARALLEL_THRESHOLD = int(os.getenv('CALC_PARALLEL_THRESHOLD', 500000))
+    CALC_PARALLEL_WORKERS = int(os.getenv('CALC_PARALLEL_WORKERS', os.cpu_count() or 1))
+
+    # Monte Carlo pricings of at least this many points (paths x fixings) are split across the process pool
+    CALC_MC_PARALLEL_THRESHOLD = int(os.getenv('CALC_MC_PARALLEL_THRESHOLD', 10000000))
+
+    # Positions priced at once by the streaming route, bounds the memory of a request
+    CALC_STREAM_CHUNK_SIZE = int(os.getenv('CALC_STREAM_CHUNK_SIZE', 10000))
+
+    # Directory of the registered books, shared by the workers of the server, empty to keep them in memory
+    CALC_BOOKS_PATH = os.getenv('CALC_BOOKS_PATH', os.path.join(tempfile.gettempdir(), 'getgreeks-books'))
+    # Maximum of registered books, and seconds a book is kept without being used
+    CALC_BOOKS_MAX = int(os.getenv('CALC_BOOKS_MAX', 1000))
+    CALC_BOOKS_TTL = float(os.getenv('CALC_BOOKS_TTL', 86400))
+
+    # Spot feed of the book event streams, a name of feeds.FEEDS or 'module:Class', empty to disable the streams.
+    # 'random_walk' simulates spots starting at CALC_FEED_SPOT, for tests and demos only
+    CALC_FEED = os.getenv('CALC_FEED', '')
+    CALC_FEED_INTERVAL = float(os.getenv('CALC_FEED_INTERVAL', 0.1))
+    CALC_FEED_SPOT = float(os.getenv('CALC_FEED_SPOT', 100))
+    CALC_FEED_STEP = float(os.getenv('CALC_FEED_STEP', 0.001))
+    CALC_FEED_SEED = int(os.getenv('CALC_FEED_SEED', 0))
+
+    # Event streams: shortest interval between two updates, heartbeat and duration of a stream, in seconds
+    CALC_EVENTS_INTERVAL = float(os.getenv('CALC_EVENTS_INTERVAL', 0.25))
+    CALC_EVENTS_HEARTBEAT = float(os.getenv('CALC_EVENTS_HEARTBEAT', 15))
+    CALC_EVENTS_DURATION = float(os.getenv('CALC_EVENTS_DURATION', 60))
+    # Open event streams per worker process: each one holds a server thread, keep it below GUNICORN_THREADS
+    CALC_EVENTS_MAX_STREAMS = int(os.getenv('CALC_EVENTS_MAX_STREAMS', 1))
+
+    # Startup: defer scipy to the first array request, serve a prebuilt OpenAPI spec, disable the Swagger UI
+    FAST_START = os.getenv('FAST_START', '0') == '1'
+    APISPEC_PATH = os.getenv('APISPEC_PATH', '')
+    SWAGGER_UI = os.getenv('SWAGGER_UI', '1') == '1'
@@ -0,0 +1,44 @@
+"""Production gunicorn settings, loaded from the working directory by `gunicorn app:app`.
+
+The app is imported once in the master and the workers are forked from it, so
+numpy, scipy and the greek tables are shared copy-on-write between them. The
+pricing kernels are CPU bound and release the GIL inside numpy, so there is one
+worker process per CPU, each running a few threads to overlap request parsing,
+serialization and the coalescing window of the option route.
+
+A book event stream (/calc/books/<id>/events/) holds one of these threads for
+up to CALC_EVENTS_DURATION seconds, so a worker only accepts
+CALC_EVENTS_MAX_STREAMS of them and answers 503 above. To serve many
+subscribers, run a second gunicorn with an async worker class (for instance
+GUNICORN_WORKER_CLASS=gevent) and route /calc/books/*/events/ to it. Restarts
+and max_requests recycling cut the open streams after graceful_timeout, the
+clients reconnect on their own.
+
+Every setting can be overridden from the environment, see the names below.
+"""
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:{}'.format(os.getenv('PORT', '8000')))
+
+preload_app = True
+workers = int(os.getenv('WEB_CONCURRENCY', os.cpu_count() or 1))
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+
+# Every worker starts its own pool of pricing processes for the large requests (CALC_PARALLEL_WORKERS), so the
+# CPUs are split between the workers rather than each pool taking all of them. Read by config.py, which is
+# imported after this file
+os.environ.setdefault('CALC_PARALLEL_WORKERS', str(max((os.cpu_count() or 1) // workers, 1)))
+
+# Connections are kept open between the requests of a client behind a load balancer
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+
+# Workers are recycled after a jittered number of requests, so they never restart all together
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 200))
+
+accesslog = os.getenv('GUNICORN_ACCESSLOG', None)
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOGLEVEL', 'info')